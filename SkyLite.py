@@ -1,18 +1,54 @@
 # Standard imports
+import abc
+import asyncio
+import base64
+import collections
+import concurrent.futures
+import contextlib
 import datetime
+import email.utils
+import functools
+import hashlib
 import json
 import math
 import os
+import random
+import sqlite3
+import tempfile
+import threading
 import time
 
 # Third party imports
 import dash
+import flask
+import numpy as np
 import requests
-import plotly.graph_objects as go
-import pytz
-from dash import Dash, html, dcc
-from dash.dependencies import Input, Output, State
-from timezonefinder import TimezoneFinder
+import plotly.io as pio
+from dash import Dash, DiskcacheManager, html, dcc
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from requests.adapters import HTTPAdapter
+
+# Optional imports
+try:
+    # Only available on Unix - used to coalesce requests across the worker processes
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    # Only needed by the Redis cache backend
+    import redis
+except ImportError:
+    redis = None
+try:
+    # A faster JSON parser for the provider payloads - the standard "json" module is used without it
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    # Only needed to run the searches as background jobs (pip install "dash[diskcache]") - they run in the request without it
+    import diskcache
+except ImportError:
+    diskcache = None
 
 # Initialize the Dash app
 app = Dash(__name__, assets_folder='assets')
@@ -119,6 +155,33 @@ app.layout = html.Div( # Main html.Div
                         'placeholder': 'Please Choose a Weather Source'
                     } # This section styles the dropdown boxes for selecting the weather data source
                 ),
+                html.Div( # Shows that a search is running, with a button to cancel it (see "SEARCH_RUNNING")
+                    style={
+                        'display': 'flex',
+                        'alignItems': 'center',
+                        'justifyContent': 'center',
+                        'minHeight': '30px'
+                    },
+                    children=[
+                        html.Span(
+                            id='search-progress',
+                            style={
+                                'fontSize': '18px',
+                                'color': '#555555'
+                            }
+                        ),
+                        html.Button(
+                            'Cancel',
+                            id='search-cancel',
+                            n_clicks=0,
+                            className='accordion-header',
+                            style={
+                                'display': 'none', # Only displayed while a background search is running
+                                'marginLeft': '10px'
+                            }
+                        ),
+                    ]
+                ),
                 html.Div( # Fifth html.Div
                     id='search-output',
                     style={
@@ -127,6 +190,12 @@ app.layout = html.Div( # Main html.Div
                         'fontSize': '22px'
                     } # This section styles the output - which is controlled by the input in the search box
                 ),
+                html.Div( # The graphs of the search, filled in after the weather cards (see "render_graphs")
+                    id='graph-output',
+                    style={
+                        'width': '100%'
+                    }
+                ),
             ] # Closing the second child
         ), # Closing the second html.Div
         html.Footer(
@@ -168,12 +237,10 @@ app.layout = html.Div( # Main html.Div
                             id='attributions-button',
                             className='accordion-header',
                             style={
+                                'display': 'none', # Hidden until a forecast is displayed (see "reset_attributions")
                                 'cursor': 'pointer',
                                 'textAlign': 'center',
-                                'color': '#000000',
-                                'width': 'auto',
-                                'border': 'none',
-                                'transition': 'background-color 0.3s ease'
+                                'width': 'auto'
                             } # This section styles the header text of the footer's image attribution's button
                         ),
                         html.Div( # For the attribution section
@@ -195,6 +262,15 @@ app.layout = html.Div( # Main html.Div
                             id='attributions-visibility',
                             data={'is_visible': False}
                         ),
+                        dcc.Store( # The image attributions of every weather source, for the accordion (filled in with "ATTRIBUTION_ELEMENTS")
+                            id='attributions-store'
+                        ),
+                        dcc.Store( # Store the forecasts of the last search, to switch sources without fetching them again
+                            id='forecast-store'
+                        ),
+                        dcc.Store( # What the last search displayed (see "display_search")
+                            id='search-status'
+                        ),
                     ],
                 ), # Closing the seventh html.Div
             ], # Closing the fifth child
@@ -275,549 +351,2629 @@ API_AW = API_AW_EF
 API_OW = API_OW_EF
 
 
-def format_time(time_str, output_format):
+def format_timestamp(timestamp, utc_offset, output_format, show_offset=False):
     """
-    Formats a time string into a desired output format.
+    Formats a Unix time into a desired output format, as seen at a given shift from UTC.
 
     Args:
-        time_str (str): The input time string.
+        timestamp (int): The Unix time.
+        utc_offset (int): The shift from UTC in seconds.
         output_format (str): The desired format string for the output time.
+        show_offset (bool): Append the UTC offset (e.g., " (UTC+0100)"), as AccuWeather's times are shown. Defaults to False.
 
     Returns:
-        str: The formatted time string, or 'Not Available' if the formatting fails.
+        str: The formatted time string.
     """
-    # Check if "time_str" is empty
-    if not time_str:
-        return 'Not Available'
-    
-    try:
-        # Check for the letter "T" in the "time_string"
-        # Because AccuWeather's time stirngs use "T" as as separator between the date and the time, and OpenWeather's time strings use a space for this
-        if 'T' in time_str: # AccuWeather format
-            # AccuWeather's time srings use the letter "Z" at the end to indicate that the time is in UTC
-            # Use "time_str.replace('Z', '+00:00')" to replace the "Z" (indicates UTC time) with "+00:00"
-            # Which is equivalent to the UTC offset that the "fromisoformat" expects
-            # UTC offset:
-            #   It is the difference in hours and minutes between a particulat time zone and UTC. It tells how far ahead or behind a  local time is from UTC
-            dt_obj = datetime.datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-            # Then use "dt_obj.strftime(output_format)" to format the 'datetime' object into the desired output format
-            # "f' (UTC{dt_obj.strftime("%z")})'" - Creates a string that adds the UTC offset to the formatted time
-            # The "%z" is a 'strftime' format code, which extracts the UTC offset form the 'datetime' obj (dt_obj) and formats it as either '+HHMM' or '-HHMM'
-            return dt_obj.strftime(output_format) + f' (UTC{dt_obj.strftime("%z")})'
-        
-        else: # OpenWeather format
-            # If "T" is not found, USE "datetime.datetime.strptime(...)" to parse the time string into a 'datetime' object
-            dt_obj = datetime.datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S')
-            # Then format this 'datetime' object using "dt_obj.strftime(output_format)"
-            return dt_obj.strftime(output_format)
-        
-    except ValueError:
-        print('Warning: Invalid date or time format: {time_str}')
-        return 'Not Available'
-
-
-# CATEGORY II - Data Fetching, Formatting, and Displaying AccuWeather Data
+    dt_obj = datetime.datetime.fromtimestamp(int(timestamp), tz=datetime.timezone(datetime.timedelta(seconds=int(utc_offset))))
+    formatted_time = dt_obj.strftime(output_format)
+    if show_offset:
+        formatted_time += f' (UTC{dt_obj.strftime("%z")})'
+    return formatted_time
 
 
-def get_location_key(search_text, max_retries=3, retry_delay=2):
+def create_as_of_label(fetched_at):
     """
-    Fetches location key for AccuWeather based on the search box input.
+    Creates the line telling when the displayed forecast was fetched from the provider.
 
     Args:
-        search_text (str): The "City, Country Code" to search for.
-        max_retries (int): The maximum number of times to retry the API call in case of a failure. Defaults to three.
-        retry_delay (int): The delay in seconds between retries. Defaults to two.
+        fetched_at (float): The Unix time the forecast was fetched at, or None.
 
     Returns:
-        str: The AccuWeather "location_key" or "None" if not found.
+        html.P or None: A Dash html P component, or None if the time is unknown.
     """
-    location_key_url = f'http://dataservice.accuweather.com/locations/v1/cities/search?q={search_text}&apikey={API_AW}'
-    
-    for attempt in range(max_retries):
-        try:
-            # Make a request to AccuWeather API using the 'location_key_url', and asks to find locations matching the '{search_text}'
-            response = requests.get(location_key_url)
-            # Check for HTTP status codes of the response.
-            # If the status code indicates an error:
-            #   It raises an exception
-            #   And forces the code to jump to the 'except requests.exceptions.RequestException as Re' line
-            response.raise_for_status()
-            # If the API request was successful, it parses the JSON data in the response; and stores it in a variable 'locations'
-            locations = response.json()
-            # If everything went correctly, the function returns the 'location_key'
-            return locations
-    
-        # Error handling for network errors, invalid URLs, etc.
-        except requests.exceptions.RequestException as Re:
-            print(f'Error fetching location!\nDetails: {Re}')
-            if response is not None and response.status_code == 503:
-                print(f'Received 503 error!\nRetrying in {retry_delay} seconds...')
-                # The program pauses for the duration specified by the "retry_delay"
-                time.sleep(retry_delay)
-                # In the next step, the "retry_delay" is doubled to avoid overwhelming a temporarily overloaded server
-                # Commonly known as exponential backoff
-                retry_delay *= 2
-            else:
-                # If there was an error or no 'location_key' was found, the block returns 'None' to signal failure
-                return None # Don't retry for other errors
-    
-        # Handle any other general errors
-        except Exception as e:
-            print(f'An unexpected error occured!\nDetails: {e}')
-            # It also returns an empty list
-            return None
-
-    print(f'Max retries ({max_retries}) exceeded!\nUnable to fetch location key.')
-    return None
+    if fetched_at is None:
+        return None
+    as_of = datetime.datetime.fromtimestamp(fetched_at, tz=datetime.timezone.utc).strftime('%B %d, %Y, %I:%M %p UTC')
+    return html.P(
+        f'Forecast as of {as_of}',
+        style={
+            'fontSize': '14px',
+            'color': '#555555',
+            'marginBottom': '5px'
+        }
+    )
 
 
-def get_weather_forecast_aw(location_key, max_retries=3, retry_delay=2):
+def env_int(name, default):
     """
-    Fetches the 12-hour hourly forecast data for the given location key.
+    Reads an integer setting from an environment variable.
 
     Args:
-        location_key (str): The AccuWeather location key.
-        max_retries (int): The maximum number of times to retry the API call in case of a failure. Defaults to three.
-        retry_delay (int): The delay in seconds between retries. Defaults to two.
+        name (str): The name of the environment variable.
+        default (int): The value to use if the variable is missing or invalid.
 
     Returns:
-        list or None: A list of dictionaries containing the 12-hour hourly forecast data, or None if an error occurs or no data is returned.
+        int: The configured value, or the default.
     """
-    # Check if 'location_key' is empty or None, if it is the block return None, and prevents unnecessary API calls and potential errors
-    if not location_key:
-        return None
-    
-    forecast_url_aw = f'http://dataservice.accuweather.com/forecasts/v1/hourly/12hour/{location_key}?apikey={API_AW}'
-    
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(forecast_url_aw)
-            response.raise_for_status()
-            weather_data_aw = response.json()
-            # If 'weather_data_aw' is not empty, the 'return'-block returns a list of dictionaries containing the 72-hour hourly forecast data
-            # But if 'weather_data_aw' is empty, the 'return'-block returns None
-            return weather_data_aw if weather_data_aw else None
-    
-        # Error handling for network errors, invalid URLs, etc.
-        except requests.exceptions.RequestException as Re:
-            print(f'Error fetching the weather data!\nDetails: {Re}')
-            if response is not None and response.status_code == 503:
-                print(f'Received 503 error!\nRetrying in {retry_delay} seconds...')
-                time.sleep(retry_delay)
-                retry_delay *= 2 # Exponential backoff
-            else:
-                return None
-    
-        # Handle any other general errors
-        except Exception as e:
-            print(f'An unexpected error occured!\nDetails: {e}')
-            return None
-
-    print(f'Max retries ({max_retries}) exceeded!\nUnable to fetch weather data from AccuWeather.')
-    return None
-
-
-# Dictionary to associate weather descriptions with the corresponding image file paths - for AccuWeather
-aw_icon_map = {
-    '1': '/assets/AccuWeatherIcons/Sunny_(1).png',
-    '2': '/assets/AccuWeatherIcons/MostlySunny_(2).png',
-    '3': '/assets/AccuWeatherIcons/PartlySunny_(3).png',
-    '4': '/assets/AccuWeatherIcons/IntermittentCloudsAtDay_(4).png',
-    '5': '/assets/AccuWeatherIcons/HazySunshine_(5).png',
-    '6': '/assets/AccuWeatherIcons/MostlyCloudyAtDay_(6).png',
-    '7': '/assets/AccuWeatherIcons/Cloudy_(7).png',
-    '8': '/assets/AccuWeatherIcons/Dreary(Overcast)_(8).png',
-    '11': '/assets/AccuWeatherIcons/Fog_(11).png',
-    '12': '/assets/AccuWeatherIcons/Showers_(12).png',
-    '13': '/assets/AccuWeatherIcons/MostlyCloudyWithShowers_(13).png',
-    '14': '/assets/AccuWeatherIcons/PartlySunnyWithShowers_(14).png',
-    '15': '/assets/AccuWeatherIcons/ThunderStorms_(15).png',
-    '16': '/assets/AccuWeatherIcons/MostlyCloudyWithThunderStorms_(16).png',
-    '17': '/assets/AccuWeatherIcons/PartlySunnyWithThunderStorms_(17).png',
-    '18': '/assets/AccuWeatherIcons/Rain_(18).png',
-    '19': '/assets/AccuWeatherIcons/Flurries_(19).png',
-    '20': '/assets/AccuWeatherIcons/MostlyCloudyWithFlurriesAtDay_(20).png',
-    '21': '/assets/AccuWeatherIcons/PartlySunnyWithFlurries_(21).png',
-    '22': '/assets/AccuWeatherIcons/Snow_(22).png',
-    '23': '/assets/AccuWeatherIcons/MostlyCloudyWithSnowAtDay_(23).png',
-    '24': '/assets/AccuWeatherIcons/Ice_(24).png',
-    '25': '/assets/AccuWeatherIcons/Sleet_(25).png',
-    '26': '/assets/AccuWeatherIcons/FreezingRain_(26).png',
-    '29': '/assets/AccuWeatherIcons/RainAndSnow_(29).png',
-    '30': '/assets/AccuWeatherIcons/Hot_(30).png',
-    '31': '/assets/AccuWeatherIcons/Cold_(31).png',
-    '32': '/assets/AccuWeatherIcons/Windy_(32).png',
-    '33': '/assets/AccuWeatherIcons/Clear_(33).png',
-    '34': '/assets/AccuWeatherIcons/MostlyClear_(34).png',
-    '35': '/assets/AccuWeatherIcons/PartlyCloudy_(35).png',
-    '36': '/assets/AccuWeatherIcons/IntermittentCloudsAtNight_(36).png',
-    '37': '/assets/AccuWeatherIcons/HazyMoonlight_(37).png',
-    '38': '/assets/AccuWeatherIcons/MostlyCloudyAtNight_(38).png',
-    '39': '/assets/AccuWeatherIcons/PartlyCloudyWithShowers_(39).png',
-    '40': '/assets/AccuWeatherIcons/MostlyCloudyWithShowers_(40).png',
-    '41': '/assets/AccuWeatherIcons/PartlyCloudyWithThunderstorms_(41).png',
-    '42': '/assets/AccuWeatherIcons/MostlyCloudyWithThunderstorms_(42).png',
-    '43': '/assets/AccuWeatherIcons/MostlyCloudyWithFlurriesAtNight_(43).png',
-    '44': '/assets/AccuWeatherIcons/MostlyCloudyWithSnowAtNight_(44).png',
-    
-}
+    value = os.getenv(name)
+    if value is None or value.strip() == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f'Warning: Invalid integer for {name}: {value!r}. Using the default ({default}).')
+        return default
 
 
-def extract_aw_icon_id(hour_data):
+def env_float(name, default):
     """
-    Extarcts the weather path from AccuWeather data.
+    Reads a float setting from an environment variable.
 
     Args:
-        hour_data (dict): A dictionary containing the weather data for a single hour.
+        name (str): The name of the environment variable.
+        default (float): The value to use if the variable is missing or invalid.
 
     Returns:
-        str: The path to the appropriate icon, or a default path if not found or an error occurs.
+        float: The configured value, or the default.
     """
+    value = os.getenv(name)
+    if value is None or value.strip() == '':
+        return default
     try:
-        # Safely access the value associated with the key 'WeatherIcon' from the "hour_data" dictionary
-        icon_id = hour_data.get('WeatherIcon', None)
-        
-        # Check if "icon_id" exists
-        if icon_id is not None:
-            # Convert the extracted "icon_id" to a string
-            # Then try to find the corresponding icon path in the "aw_icon_map" dictionary, using the string version of "icon_id" as the key
-            # If "icon_id" is not found in the dictionary, the "icon_path" is set to the default icon path
-            icon_path = aw_icon_map.get(str(icon_id), '/assets/AccuWeatherIcons/DefaultImageAW.png')
+        return float(value)
+    except ValueError:
+        print(f'Warning: Invalid number for {name}: {value!r}. Using the default ({default}).')
+        return default
 
-            # Return the determined "icon_path"
-            return icon_path
 
-        # Handle missing 'WeatherIcon' key
-        else:
-            icon_path = '/assets/AccuWeatherIcons/DefaultImageAW.png'
-            return icon_path
-        
-    except (KeyError, TypeError) as e:
-        print(f"Encountered an error extracting AccuWeather's weather icon.\nDetails: {e}")
-        icon_path = '/assets/AccuWeatherIcons/DefaultImageAW.png'
-        # Return the default "icon_path"
-        return icon_path
+# Functions that report the runtime metrics of each subsystem, keyed by the subsystem's name
+# Every function returns a JSON-serializable dictionary; the "/metrics" endpoint collects all of them
+METRICS_PROVIDERS = {}
 
 
-def create_aw_weather_card(hour_data):
+def register_metrics(name, provider):
     """
-    Creates a Dash html Div for a single hour's AccuWeather data.
+    Registers a function reporting the metrics of a subsystem on the "/metrics" endpoint.
 
     Args:
-        hour_data (dict): A dictionary containg the weather data for a single hour.
+        name (str): The name of the subsystem.
+        provider (callable): A function, without arguments, returning a JSON-serializable dictionary.
+    """
+    METRICS_PROVIDERS[name] = provider
+
+
+def collect_metrics():
+    """
+    Collects the metrics of every registered subsystem.
 
     Returns:
-        html.Div: A Dash html Div component.
+        dict: A dictionary mapping each subsystem's name to its metrics.
     """
-    # Extract the raw time string from "hour_data", which is associated with the key "DateTime"
-    time_str = hour_data.get('DateTime', None)
-    # Call the "format_time" function to format the raw time string
-    # "%B" - Full name of the month
-    # "%I" - Hour (12-hour clock) as a zero padded number
-    # "%p" - AM or PM
-    formatted_time_aw = format_time(time_str, '%B %d, %Y, %I:%M %p')
+    return {name: provider() for name, provider in METRICS_PROVIDERS.items()}
 
-    # Call the "extract_aw_icon_id" function to determine the file path of the appropriate weather icon based on the "hour_data"
-    icon_path = extract_aw_icon_id(hour_data)
-            
-    # Create the html.Div to represent the AccuWeather weather card
-    return html.Div(
-        style={
-            'border': '1px solid #e0e0e0',
-            'borderRadius': '10px',
-            'boxShadow': '2px 2px 8px rgba(0, 0, 0, 0.1)',
-            'padding': '15px',
-            'margin': '10px',
-            'flexBasis': 'calc(33% - 20px)',
-            'boxSizing': 'border-box',
-            'display': 'inline-block',
-            'fontFamily': 'Arial, sans-serif',
-            'backgroundColor': '#f0f0f0'
-        }, # Styles the appearance of the card
-        children=[
-            html.H3(
-                f'Time: {formatted_time_aw}',
-                style={
-                    'fontSize': '16px',
-                    'fontWeight': 'bold',
-                    'marginBottom': '10px',
-                    'color': '2c3e50'
-                }
-                ),
-                html.Img(
-                    src=icon_path,
-                    style={
-                        'height': '80px',
-                        'width': '80px'
-                    }
-                ),
-                html.Div( # Group temperature-realted information - arranging verically
-                    style={
-                        'display': 'flex', # Using a flexbox
-                        'flexDirection': 'column', # Stacking the items vertically
-                        'marginBottom': '8px' # Adding some space below
-                    },
-                    children=[
-                        html.P(
-                            f'Temperature: {hour_data.get("Temperature", {}).get("Value", "Not Available")}°{hour_data.get("Temperature", {}).get("Unit", "N/A")}',
-                            style={
-                                'fontSize': '21px',
-                                'fontFamily': 'Franklin Gothic Heavy'
-                            }
-                        )
-                    ]
-                ),
-                html.P(f'Conditions: {hour_data.get("IconPhrase", "Not Available").title()}',
-                    style={
-                        'fontSize': '18px',
-                        'lineHeight': '1.4',
-                        'fontFamily': 'Footlight MT Light'
-                    }
-                ),
-                html.P(
-                    f'Precipitation: {"Yes" if hour_data.get("HasPrecipitation", False) else "No"}',
-                    style={
-                        'fontSize': '18px',
-                        'fontFamily': 'Gill Sans MT'
-                    }
-                ),
-                html.P(
-                    f'Precipitation Probability: {hour_data.get("PrecipitationProbability", "Not Available")}%',
-                    style={
-                        'fontSize': '18px',
-                        'fontFamily': 'Perpetua'
-                    }
-                ),
-                html.P(
-                    f'Day Light: {"Yes" if hour_data.get("IsDaylight", False) else "No"}',
-                    style={
-                        'fontSize': '18px',
-                        'fontFamily': 'Constantia'
-                    }
-                ),
-            ]
-        )
+
+# Julian date of the Unix epoch, and of the J2000 epoch (January 1st 2000, 12:00 UTC) the solar equations count from
+JULIAN_UNIX_EPOCH = 2440587.5
+JULIAN_J2000 = 2451545.0
+# Sun altitude (in degrees) at sunrise and sunset: the refraction of the atmosphere and the radius of the sun's disc
+SUNRISE_ALTITUDE = -0.833
 
 
-def extract_aw_plotting_data(forecast_data):
+def solar_day(day_number, latitude, longitude):
     """
-    Extracts time and temperature data from AccuWeather forecast data for plotting.
+    Computes the sunrise and the sunset of one solar day, using the sunrise equation.
 
     Args:
-        forecast_data (list): A list of hourly forecast data from AccuWeather.
+        day_number (int): The number of days since J2000 (solar noon at Greenwich, January 1st 2000).
+        latitude (float): The latitude of the location.
+        longitude (float): The longitude of the location (east is positive).
 
     Returns:
-        dict: A dictionary containing lists of time and corresponding temperatures.
+        tuple: The sunrise and sunset as Unix times. During the polar day it is '(-inf, inf)', during the polar night '(inf, -inf)'.
     """
-    # Create two empty lists to store the extracted time strings and the corresponding temperature values
-    times = []
-    temps = []
-
-    # Ensure forecast_data is not empty or None
-    if forecast_data:
-        
-        # Iterate through each "hour_data" in the "forecast_data" list
-        for hour_data in forecast_data:
-            
-            # Extract the time string
-            time_str = hour_data.get('DateTime')
-            
-            # Check that "time_str" is valid
-            if time_str:
-                # Format the time for display (without the time zone)
-                formatted_time = format_time(time_str, '%Y-%m-%d %H:%M:%S')
-                # Append the formatted time into the empty "times" list
-                times.append(formatted_time)
-
-                # Extract the temperature (from "hour_data")
-                # Get the dictionary associated with the key "Temperature"; if "Temperature" is not found it defaults to an empty dictionary - to avoid errors
-                # If successful, get the value associated with the key "Value" from this dictionary. If not found, it returns "None" by default
-                # Append the extracted temperature to the empty "temps" list
-                temps.append(hour_data.get('Temperature', {}).get('Value'))
-                
-    return {'times': times, 'temps': temps}
-
-
-def create_aw_temperature_graph(plotting_data):
+    # Mean solar noon, the mean anomaly of the sun, the equation of the center and the ecliptic longitude of the sun
+    mean_noon = day_number - longitude / 360
+    mean_anomaly = math.radians((357.5291 + 0.98560028 * mean_noon) % 360)
+    center = 1.9148 * math.sin(mean_anomaly) + 0.02 * math.sin(2 * mean_anomaly) + 0.0003 * math.sin(3 * mean_anomaly)
+    ecliptic_longitude = math.radians((math.degrees(mean_anomaly) + center + 180 + 102.9372) % 360)
+    # Julian date of the solar noon (when the sun crosses the meridian)
+    transit = JULIAN_J2000 + mean_noon + 0.0053 * math.sin(mean_anomaly) - 0.0069 * math.sin(2 * ecliptic_longitude)
+
+    # Declination of the sun, then the hour angle between the solar noon and the sunrise (or the sunset)
+    sin_declination = math.sin(ecliptic_longitude) * math.sin(math.radians(23.4397))
+    cos_declination = math.cos(math.asin(sin_declination))
+    phi = math.radians(latitude)
+    cos_hour_angle = ((math.sin(math.radians(SUNRISE_ALTITUDE)) - math.sin(phi) * sin_declination)
+                      / (math.cos(phi) * cos_declination))
+    if cos_hour_angle < -1:
+        return -math.inf, math.inf
+    if cos_hour_angle > 1:
+        return math.inf, -math.inf
+
+    half_day = math.degrees(math.acos(cos_hour_angle)) / 360
+    return ((transit - half_day - JULIAN_UNIX_EPOCH) * 86400,
+            (transit + half_day - JULIAN_UNIX_EPOCH) * 86400)
+
+
+def classify_daylight(timestamps, latitude=None, longitude=None, sunrise=None, sunset=None):
     """
-    Creates a Dash graph component to show AccuWeather temperature data against time.
+    Tells, in one pass, which timestamps of a forecast fall between sunrise and sunset.
+
+    Every timestamp is compared with the sunrise and the sunset of its own solar day, which are computed once per
+    day from the coordinates. Without coordinates, the sunrise and the sunset of one day (e.g., the "city.sunrise" and
+    "city.sunset" of OpenWeather) are shifted by whole days instead.
 
     Args:
-        plotting_data (dict): A dictionary containing "times" and "temps".
+        timestamps (list): The Unix times (in seconds) to classify; None entries are left unclassified.
+        latitude (float): The latitude of the location, or None.
+        longitude (float): The longitude of the location, or None.
+        sunrise (int): A sunrise as a Unix time, used without coordinates. Defaults to None.
+        sunset (int): The sunset following "sunrise", used without coordinates. Defaults to None.
 
     Returns:
-        dcc.Graph: A Dash graph component displaying the temperature over time.
+        list: A list holding, for each timestamp, True (day), False (night) or None (unknown).
     """
-    if plotting_data and plotting_data['times'] and plotting_data['temps']:
-        # Create the graph
-        fig = go.Figure(
-            # The "data" argument is a list containing the data to be plotted
-            data=[
-                go.Scatter(
-                    # Extract the data
-                    x=plotting_data['times'],
-                    y=plotting_data['temps'],
-                    mode='lines+markers', # The graph should display both, lines connecting the data points and markers at the data points themselves
-                    line=dict(color='#2e38f3', width=2),
-                    marker=dict(color='#fc0349', size=6)
-                )
-            ],
-            # Design the layout
-            layout=go.Layout(
-                title='Temperature Over Time',
-                xaxis_title='Time',
-                yaxis_title='Temperature (°F)',
-                template='plotly_white',
-                xaxis=dict(showgrid=True, gridcolor='lightgray'),
-                yaxis=dict(showgrid=True, gridcolor='lightgray'),
-            ),
-        )
-        # The "figure=fig" argument passes the plotly figure created in the previous step to the "dcc.Graph" component
-        # The "dcc.Graph" is then returned, making the interactive graph avaialable to be displayed in the Dash app's user interface
-        return dcc.Graph(figure=fig)
-    
-    else:
-        return html.P('No temperature data available for graph!')
+    flags = []
+    # Sunrise and sunset of every solar day met so far
+    solar_days = {}
+    for timestamp in timestamps:
+        if timestamp is None:
+            flags.append(None)
+        elif latitude is not None and longitude is not None:
+            # Number of the solar day whose solar noon is closest to the timestamp
+            day_number = round(timestamp / 86400 + JULIAN_UNIX_EPOCH - JULIAN_J2000 + longitude / 360)
+            if day_number not in solar_days:
+                solar_days[day_number] = solar_day(day_number, latitude, longitude)
+            day_start, day_end = solar_days[day_number]
+            flags.append(day_start <= timestamp <= day_end)
+        elif sunrise is not None and sunset is not None:
+            # Time since the last sunrise, compared with the length of the day
+            flags.append((timestamp - sunrise) % 86400 <= (sunset - sunrise) % 86400)
+        else:
+            flags.append(None)
+    return flags
 
 
-def aw_data_processing(search_text):
-    """
-    Fetches and processes the weather data from AccuWeather.
+# CATEGORY II - Shared Provider HTTP Client
 
-    Args:
-        search_text (str): The text entered in the search input box.
 
-    Returns:
-        list: A list of Dash HTML components to display the AccuWeather data.
+# Number of per-host connection pools each provider session keeps
+HTTP_POOL_CONNECTIONS = env_int('SKYLITE_HTTP_POOL_CONNECTIONS', 4)
+# Maximum number of keep-alive connections kept per host (should be at least the number of gunicorn threads)
+HTTP_POOL_MAXSIZE = env_int('SKYLITE_HTTP_POOL_MAXSIZE', 16)
+# Default (connect, read) timeout in seconds for a single upstream request
+HTTP_TIMEOUT = env_float('SKYLITE_HTTP_TIMEOUT', 10.0)
+
+
+class ProviderHTTPClient:
     """
-    # Fetch the "location_key" by calling "get_location_key" function to obtain the location key from AccuWeather based on the user's "search_text"
-    locations_aw = get_location_key(search_text)
-    if locations_aw:
-        # If "location_key" is found - "locations_aw[0]['Key']" extracts the first location's key
-        location_key = locations_aw[0]['Key']
-        # Call the "get_weather_forecast_aw" function to get the 12-hour hourly forecast data from AccuWeather
-        forecast_aw = get_weather_forecast_aw(location_key)
-    else:
-        # If "get_location_key" fails, it sets "forecast_aw" to None
-        forecast_aw = None
+    Keeps one keep-alive "requests.Session" per weather provider, so that repeated searches reuse warm connections
+    instead of paying fresh DNS, TCP and TLS handshakes on every call.
 
-    # Initialize a Children list
-    # This list will store:
-    #   Dash HTML components that will be displayed in the app
-    #   These components will include weather cards and a temperature graph
-    children = []
-    
-    # Process and prepare the data for display
-    if forecast_aw:
-        # Limit the number of entries to the first 12
-        forecast_aw = forecast_aw[:12]
-                
-        # Create an empty list to store the weather cards
-        weather_cards_aw = []
+    Sessions are created lazily and are safe to share between gunicorn threads: the underlying urllib3 connection
+    pools are thread-safe, and session creation is guarded by a lock. After a fork (e.g. gunicorn "--preload"), the
+    sessions inherited from the parent process are discarded so that worker processes never share sockets.
+    """
 
-        # Iterate through each hour's data in the "forecast_aw"
-        for hour_data in forecast_aw:
-            # For each hour, call the "create_aw_weather_card" to create a Dash 'html.Div' element (a weather card)
-            # That displays the weather information for that particular hour
-            # Then the generated weather card is appended to "weather_cards_aw" list
-            weather_cards_aw.append(create_aw_weather_card(hour_data))
+    def __init__(self, pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, timeout=HTTP_TIMEOUT):
+        """
+        Args:
+            pool_connections (int): The number of per-host connection pools to cache.
+            pool_maxsize (int): The maximum number of connections to keep alive per host.
+            timeout (float): The default timeout in seconds for each request.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _new_session(self):
+        """
+        Creates a session whose HTTP and HTTPS adapters use the configured pool sizes.
+
+        Returns:
+            requests.Session: A new session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def session(self, provider):
+        """
+        Returns the shared session of a provider, creating it on first use.
+
+        Args:
+            provider (str): The weather provider ('aw' or 'ow').
+
+        Returns:
+            requests.Session: The provider's session.
+        """
+        with self._lock:
+            # Drop sessions inherited through a fork - their sockets belong to the parent process
+            if self._pid != os.getpid():
+                self._sessions = {}
+                self._pid = os.getpid()
+
+            session = self._sessions.get(provider)
+            if session is None:
+                session = self._new_session()
+                self._sessions[provider] = session
+            return session
+
+    def get(self, provider, url, params=None, timeout=None):
+        """
+        Sends a GET request through the provider's pooled session.
+
+        Args:
+            provider (str): The weather provider ('aw' or 'ow').
+            url (str): The URL to request.
+            params (dict): The query parameters. Defaults to None.
+            timeout (float): The timeout in seconds. Defaults to the client's timeout.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self.session(provider).get(url, params=params, timeout=timeout or self.timeout)
+
+    def close(self):
+        """
+        Closes every session and its pooled connections.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+# The process-wide HTTP client shared by all the provider fetchers
+http_client = ProviderHTTPClient()
+
+
+# Length in seconds of the rolling window of calls a circuit breaker looks at
+BREAKER_WINDOW = env_float('SKYLITE_BREAKER_WINDOW', 60.0)
+# Minimum number of calls in the window before a circuit breaker may trip
+BREAKER_MIN_CALLS = env_int('SKYLITE_BREAKER_MIN_CALLS', 5)
+# Share of failed calls in the window that trips a circuit breaker
+BREAKER_ERROR_RATE = env_float('SKYLITE_BREAKER_ERROR_RATE', 0.5)
+# A call slower than this many seconds counts as a slow call
+BREAKER_SLOW_CALL_SECONDS = env_float('SKYLITE_BREAKER_SLOW_CALL_SECONDS', 5.0)
+# Share of slow calls in the window that trips a circuit breaker
+BREAKER_SLOW_CALL_RATE = env_float('SKYLITE_BREAKER_SLOW_CALL_RATE', 0.8)
+# Seconds a tripped circuit breaker stays open before it lets probe requests through
+BREAKER_OPEN_SECONDS = env_float('SKYLITE_BREAKER_OPEN_SECONDS', 30.0)
+# Number of probe requests allowed (and needed to succeed) while a circuit breaker is half-open
+BREAKER_HALF_OPEN_PROBES = env_int('SKYLITE_BREAKER_HALF_OPEN_PROBES', 2)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised instead of sending a request while the circuit breaker of its provider endpoint is open.
+    """
 
-        # After processing all the hourly data, it creates a 'html.Div' to contain all the weather cards
-        # This 'html.Div' uses flexbox to arrange the cards horizontally and wrap them if they exceed the container's width
-        children.append(
-            html.Div(
-                style={
-                    'display': 'flex',
-                    'flexWrap': 'wrap',
-                    'justifyContent': 'flex-start'
-                },
-                children = weather_cards_aw[:12] # Adds the list of weather cards as children
-            )
-        )
-        # Create and append the temperaure graph
 
-        # Call the "extract_aw_plotting_data" to prepare the forecast data for creating a temperature graph
-        plotting_data_aw = extract_aw_plotting_data(forecast_aw)
-        # Call the "create_aw_temperature_graph" to generate a Dash 'dcc.Graph' component that displays the temperature over time
-        temp_graph_aw = create_aw_temperature_graph(plotting_data_aw)
+class CircuitBreaker:
+    """
+    Tracks the recent calls to one provider endpoint and stops sending requests to it while it is failing.
 
-        # Append the temperature graph to the "children" list
-        children.append(temp_graph_aw)
+    The breaker is "closed" while the endpoint is healthy. It "opens" (trips) when, over the rolling window, the share
+    of failed calls or the share of slow calls reaches its threshold; every call is then rejected at once. After the
+    open period, it becomes "half-open" and lets a limited number of probe requests through: if all of them succeed the
+    breaker closes again, and if any of them fails it opens again.
 
-        # Finally, if the forecast data was successfully processed, the return the "children" list
-        # Which now contains the weather cards and the temperature graph
-        return children
+    The state is kept in the memory of the worker process, not in the shared cache.
+    """
 
-    # Handle if 'forecast_aw" is None
-    return [html.P('Sorry, could not retrieve weather data from AccuWeather!')]
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS, error_rate=BREAKER_ERROR_RATE,
+                 slow_call_seconds=BREAKER_SLOW_CALL_SECONDS, slow_call_rate=BREAKER_SLOW_CALL_RATE,
+                 open_seconds=BREAKER_OPEN_SECONDS, half_open_probes=BREAKER_HALF_OPEN_PROBES):
+        """
+        Args:
+            name (str): The name of the endpoint, e.g. 'ow.geocode'.
+            window (float): The length in seconds of the rolling window.
+            min_calls (int): The minimum number of calls in the window before the breaker may trip.
+            error_rate (float): The share of failed calls that trips the breaker.
+            slow_call_seconds (float): The latency in seconds above which a call counts as slow.
+            slow_call_rate (float): The share of slow calls that trips the breaker.
+            open_seconds (float): The number of seconds the breaker stays open.
+            half_open_probes (int): The number of probe requests allowed while half-open.
+        """
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        # Recent calls as (timestamp, failed, slow) tuples
+        self._calls = collections.deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        # Counters for the metrics
+        self._trips = 0
+        self._rejected = 0
+
+    def _prune(self, now):
+        """
+        Drops the calls that fell out of the rolling window. Must be called with the lock held.
+        """
+        while self._calls and self._calls[0][0] < now - self.window:
+            self._calls.popleft()
+
+    def _trip(self, now):
+        """
+        Opens the breaker. Must be called with the lock held.
+        """
+        self._state = self.OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._trips += 1
+        print(f'Circuit breaker "{self.name}" opened for {self.open_seconds} seconds.')
+
+    def allow(self):
+        """
+        Decides whether a request may be sent now.
+
+        Returns:
+            bool: True if the request may be sent, False if it must be rejected.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.OPEN:
+                if now - self._opened_at < self.open_seconds:
+                    self._rejected += 1
+                    return False
+                # The open period is over - start probing
+                self._state = self.HALF_OPEN
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+
+            if self._state == self.HALF_OPEN:
+                if self._probes_in_flight + self._probe_successes >= self.half_open_probes:
+                    self._rejected += 1
+                    return False
+                self._probes_in_flight += 1
+
+            return True
+
+    def record(self, failed, latency):
+        """
+        Records the outcome of a request that "allow" let through.
+
+        Args:
+            failed (bool): True if the request failed (timeout, connection error, 429 or 5xx).
+            latency (float): The duration of the request in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slow = latency >= self.slow_call_seconds
+
+            if self._state == self.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed or slow:
+                    self._trip(now)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_probes:
+                        # The endpoint has recovered - start over with an empty window
+                        self._state = self.CLOSED
+                        self._calls.clear()
+                        print(f'Circuit breaker "{self.name}" closed.')
+                return
+
+            if self._state == self.OPEN:
+                # A request that started before the breaker tripped - nothing more to learn from it
+                return
+
+            self._calls.append((now, failed, slow))
+            self._prune(now)
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, call_failed, _ in self._calls if call_failed)
+            slow_calls = sum(1 for _, _, call_slow in self._calls if call_slow)
+            if failures / total >= self.error_rate or slow_calls / total >= self.slow_call_rate:
+                self._trip(now)
+
+    def snapshot(self):
+        """
+        Reports the state of the breaker.
+
+        Returns:
+            dict: The state, the calls in the window, and the trip and rejection counters.
+        """
+        with self._lock:
+            self._prune(time.monotonic())
+            return {
+                'state': self._state,
+                'calls': len(self._calls),
+                'failures': sum(1 for _, call_failed, _ in self._calls if call_failed),
+                'slow_calls': sum(1 for _, _, call_slow in self._calls if call_slow),
+                'trips': self._trips,
+                'rejected': self._rejected,
+            }
 
 
-# CATEGORY III - Data Fetching, Formatting, and Displaying OpenWeather Data
+# The circuit breakers of this process, keyed by "provider.endpoint"
+# They live in the worker's memory, so they only see the calls of searches run inside the requests - a background
+# search job (see "create_background_manager") starts with fresh breakers and ends before any of them could trip
+circuit_breakers = {}
+circuit_breakers_lock = threading.Lock()
 
 
-def get_coordinates(city_name, api_key=API_OW, max_retries=3, retry_delay=2):
+def get_circuit_breaker(provider, endpoint):
     """
-    Fetches the latitude and longitude of a city.
+    Returns the circuit breaker of a provider endpoint, creating it on first use.
 
     Args:
-        city_name (str): The name of the city.
-        api_key: OpenWeather API key.
-        max_retries (int): The maximum number of times to retry the API call in case of a failure. Defaults to three.
-        retry_delay (int): The delay in seconds between retries. Defaults to two.
+        provider (str): The weather provider ('aw' or 'ow').
+        endpoint (str): The name of the endpoint, e.g. 'geocode'.
 
     Returns:
-        tuple or None: A tuple containing 'latitude, longitude' if found, otherwise None.
-        Returns the first result if multiple are found.
+        CircuitBreaker: The endpoint's circuit breaker.
     """
-    geocoding_url = 'http://api.openweathermap.org/geo/1.0/direct'
-    # This is a dictionary, which will be used as query parameters in the API request
-    params = {
-        'q': city_name,
-        'limit': 1, # Tell the API to return at most one result
-        'appid': api_key
-    }
-    latitude = None
-    longitude = None
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(geocoding_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            if data:
-                # If "data" is found, "data[0]" takes the first element of the list - which is a dictionary containing information about the location
-                # It then extracts the values associated with the keys "lat" and "lon", and returns them as a tuple
-                latitude = data[0]['lat']
-                longitude = data[0]['lon']
-                return latitude, longitude
-            else: # If the "data" list is empty
-                print(f'Sorry, could not find latitude and longitude for {city_name}!')
-                return None
-
-        # Error handling for network errors, invalid URLs, etc.   
-        except requests.exceptions.RequestException as Re:
-            print(f'Error fetching the latitude and longitude!\nDetails: {Re}')
-            if response is not None and response.status_code == 503:
-                print(f'Received 503 error!\nRetrying in {retry_delay} seconds...')
-                # The program pauses for the duration specified by the "retry_delay"
-                time.sleep(retry_delay)
-                # In the next step, the "retry_delay" is doubled to avoid overwhelming a temporarily overloaded server
-                # Commonly known as exponential backoff
-                retry_delay *= 2
-            else:
-                return None
-    
-        # Handle any other general errors
-        except Exception as e:
-            print(f'An unexpected error occured!\nDetails: {e}')
-            return None
+    name = f'{provider}.{endpoint}'
+    with circuit_breakers_lock:
+        breaker = circuit_breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name)
+            circuit_breakers[name] = breaker
+        return breaker
+
+
+def circuit_breaker_metrics():
+    """
+    Reports the state of every circuit breaker.
+
+    Returns:
+        dict: A dictionary mapping each "provider.endpoint" to its breaker's snapshot.
+    """
+    with circuit_breakers_lock:
+        breakers = list(circuit_breakers.items())
+    return {name: breaker.snapshot() for name, breaker in breakers}
 
-    print(f'Max retries ({max_retries}) exceeded!\nUnable to fetch latitude and logitude.')
-    return None
 
+register_metrics('circuit_breakers', circuit_breaker_metrics)
 
-def get_weather_forecast_ow(latitude, longitude, api_key=API_OW, exclude='minutely,hourly,alerts', units='imperial', max_retries=3, retry_delay=2):
+
+# HTTP status codes worth retrying: rate limiting (429) and temporary unavailability (503)
+RETRY_STATUS_CODES = frozenset({429, 503})
+# Base delay in seconds of the jittered exponential backoff
+RETRY_BASE_DELAY = env_float('SKYLITE_RETRY_BASE_DELAY', 0.5)
+# Upper bound in seconds of a single backoff delay
+RETRY_MAX_DELAY = env_float('SKYLITE_RETRY_MAX_DELAY', 4.0)
+# Total time budget in seconds for one upstream request, including every retry and every wait
+RETRY_DEADLINE = env_float('SKYLITE_RETRY_DEADLINE', 8.0)
+
+
+def decode_json(content):
     """
-    Fetches the forecast data for the given latitude and longitude.
+    Parses a JSON payload, with "orjson" when it is installed.
+
+    Args:
+        content (bytes): The raw payload (e.g., "response.content").
+
+    Returns:
+        The parsed payload.
+
+    Raises:
+        ValueError: If the payload is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def backoff_delay(attempt, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+    """
+    Computes the "full jitter" backoff delay of a retry attempt.
+
+    Every delay is drawn uniformly between zero and the capped exponential bound, so that clients which failed
+    together do not retry together.
+
+    Args:
+        attempt (int): The zero-based number of the attempt that just failed.
+        base_delay (float): The bound of the first delay in seconds.
+        max_delay (float): The largest bound in seconds.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def retry_after_delay(response):
+    """
+    Reads the "Retry-After" header of a response.
+
+    Args:
+        response (requests.Response): The response, or None.
+
+    Returns:
+        float or None: The number of seconds the server asked us to wait, or None if the header is missing or invalid.
+    """
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+
+    # The header is either a number of seconds...
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    # ...or an HTTP date
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+def provider_request(provider, endpoint, url, params=None, max_retries=3, retry_delay=RETRY_BASE_DELAY, deadline=RETRY_DEADLINE):
+    """
+    Sends a GET request to a weather provider, retrying timeouts, connection errors, 429 and 503 responses.
+
+    The whole call - every attempt and every wait - stays within the "deadline" budget: each attempt's timeout is
+    capped by the remaining budget, and the call gives up at once instead of waiting past the deadline (including
+    when a "Retry-After" header asks for a longer wait).
+
+    Every attempt goes through the circuit breaker of the provider endpoint: while the breaker is open, the call
+    fails at once with "CircuitOpenError" and nothing is sent upstream.
+
+    Args:
+        provider (str): The weather provider ('aw' or 'ow').
+        endpoint (str): The name of the endpoint, used to pick its circuit breaker (e.g. 'geocode').
+        url (str): The URL to request.
+        params (dict): The query parameters. Defaults to None.
+        max_retries (int): The maximum number of attempts. Defaults to three - at least one attempt is always made.
+        retry_delay (float): The base delay in seconds of the jittered exponential backoff.
+        deadline (float): The total time budget in seconds.
+
+    Returns:
+        requests.Response: The successful response.
+
+    Raises:
+        CircuitOpenError: If the endpoint's circuit breaker is open.
+        requests.exceptions.RequestException: If the request failed, or the retries or the budget ran out.
+    """
+    breaker = get_circuit_breaker(provider, endpoint)
+    deadline_at = time.monotonic() + deadline
+    # A request is always sent once, even when retries are turned off (0 or less)
+    max_retries = max(1, max_retries)
+
+    for attempt in range(max_retries):
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise requests.exceptions.Timeout(f'Deadline of {deadline} seconds exceeded for {url}')
+        if not breaker.allow():
+            raise CircuitOpenError(f'Circuit breaker "{breaker.name}" is open')
+
+        response = None
+        started = time.monotonic()
+        try:
+            response = http_client.get(provider, url, params=params, timeout=min(http_client.timeout, remaining))
+            response.raise_for_status()
+            breaker.record(False, time.monotonic() - started)
+            return response
+
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as Re:
+            breaker.record(True, time.monotonic() - started)
+            error = Re
+            delay = backoff_delay(attempt, retry_delay)
+
+        except requests.exceptions.HTTPError as Re:
+            # Only rate limiting and server errors say something about the endpoint's health
+            breaker.record(response.status_code == 429 or response.status_code >= 500, time.monotonic() - started)
+            # Don't retry the errors that won't go away by themselves (e.g. 401 or 404)
+            if response.status_code not in RETRY_STATUS_CODES:
+                raise
+            error = Re
+            # Honour the server's "Retry-After" header when it sends one
+            delay = retry_after_delay(response)
+            if delay is None:
+                delay = backoff_delay(attempt, retry_delay)
+
+        except Exception:
+            # Never leave a half-open probe unaccounted for
+            breaker.record(True, time.monotonic() - started)
+            raise
+
+        # Give up if this was the last attempt, or if waiting would overrun the deadline
+        if attempt == max_retries - 1:
+            break
+        if time.monotonic() + delay >= deadline_at:
+            print(f'Not retrying {provider} request: waiting {delay:.2f} seconds would exceed the deadline.')
+            raise error
+
+        print(f'Received a retryable error ({error})!\nRetrying in {delay:.2f} seconds...')
+        time.sleep(delay)
+
+    print(f'Max retries ({max_retries}) exceeded!')
+    raise error
+
+
+# CATEGORY III - Request Coalescing and Caching
+
+
+# Directory shared by all the worker processes on this host (lock files, shared results)
+CACHE_DIR = os.getenv('SKYLITE_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'skylite')
+# Longest time in seconds a caller waits for an identical in-flight request before fetching by itself
+SINGLEFLIGHT_WAIT = env_float('SKYLITE_SINGLEFLIGHT_WAIT', 30.0)
+# Seconds during which a result fetched by another worker process is handed to the workers that waited for it
+SINGLEFLIGHT_SHARE_SECONDS = env_float('SKYLITE_SINGLEFLIGHT_SHARE_SECONDS', 5.0)
+# Number of lock files the keys are spread over - a fixed set, so the directory doesn't grow with every new query
+SINGLEFLIGHT_LOCKS = max(1, env_int('SKYLITE_SINGLEFLIGHT_LOCKS', 256))
+
+
+def normalize_query(search_text):
+    """
+    Normalizes a "City, Country Code" query, so that trivially different spellings of a search share one key.
+
+    Args:
+        search_text (str): The text entered in the search input box.
+
+    Returns:
+        str: The query in lower case, with single spaces and one space after each comma.
+    """
+    # Collapse the runs of whitespace, then put exactly one space after every comma
+    query = ' '.join((search_text or '').split())
+    query = ', '.join(part.strip() for part in query.split(','))
+    return query.casefold()
+
+
+@contextlib.contextmanager
+def host_lock(path, wait):
+    """
+    Holds an exclusive lock file, shared by all the worker processes of the host.
+
+    The lock is polled, so that a stuck process can't hold the caller longer than "wait". On platforms without
+    "fcntl", nothing is locked.
+
+    Args:
+        path (str): The path of the lock file.
+        wait (float): The longest time in seconds to wait for the lock.
+
+    Yields:
+        bool: True if the lock is held, False if the wait ran out (or locking is not available).
+    """
+    if fcntl is None:
+        yield False
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as lock_file:
+        wait_until = time.monotonic() + wait
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= wait_until:
+                    yield False
+                    return
+                time.sleep(0.05)
+
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in flight, later calls for the same key wait for
+    it and receive its result (or its exception) instead of going upstream again.
+
+    Within a process, the waiting is done on threading events. Across the worker processes of a host, the first
+    process to take the key's lock file fetches, and the processes queued on the lock pick up the result it leaves
+    next to the lock file. Locking across processes needs "fcntl", so it is skipped on platforms without it.
+
+    The keys are hashed onto a fixed set of lock files, and the result files of a lock are deleted once they are too
+    old to be reused, so the shared directory stays small however many different queries are searched.
+    """
+
+    def __init__(self, shared_dir=None, wait=SINGLEFLIGHT_WAIT, share_seconds=SINGLEFLIGHT_SHARE_SECONDS, locks=SINGLEFLIGHT_LOCKS):
+        """
+        Args:
+            shared_dir (str): The directory for the lock and result files, or None to coalesce within the process only.
+            wait (float): The longest time in seconds to wait for an in-flight call.
+            share_seconds (float): How long in seconds a result left by another process may be reused.
+            locks (int): The number of lock files the keys are spread over.
+        """
+        self.shared_dir = shared_dir if fcntl is not None else None
+        self.wait = wait
+        self.share_seconds = share_seconds
+        self.locks = max(1, locks)
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._pid = os.getpid()
+        # Counters for the metrics
+        self._leaders = 0
+        self._coalesced = 0
+        self._shared = 0
+
+    def do(self, key, fn, shareable=lambda result: True, encode=lambda result: result, decode=lambda data: data):
+        """
+        Calls "fn", unless an identical call is already in flight.
+
+        Args:
+            key (tuple): The key identifying identical calls.
+            fn (callable): The function to call, without arguments.
+            shareable (callable): Tells whether a result may be handed to other processes.
+            encode (callable): Turns a result into JSON-serializable data, to hand it to other processes. Defaults to no change.
+            decode (callable): Turns the data written by "encode" back into a result. Defaults to no change.
+
+        Returns:
+            The result of "fn", possibly from another thread's or process's call.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # After a fork, the calls in flight belong to threads of the parent process - nobody would finish them here
+                self._calls = {}
+                self._pid = os.getpid()
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            if call['event'].wait(self.wait):
+                if call['error'] is not None:
+                    raise call['error']
+                return call['result']
+            # The in-flight call is taking too long - go upstream without it
+            return fn()
+
+        try:
+            if self.shared_dir:
+                call['result'] = self._do_across_processes(key, fn, shareable, encode, decode)
+            else:
+                call['result'] = fn()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['event'].set()
+
+    def _do_across_processes(self, key, fn, shareable, encode, decode):
+        """
+        Calls "fn" while holding the key's lock file, or reuses the result the previous holder left.
+
+        Args:
+            key (tuple): The key identifying identical calls.
+            fn (callable): The function to call, without arguments.
+            shareable (callable): Tells whether a result may be handed to other processes.
+            encode (callable): Turns a result into JSON-serializable data.
+            decode (callable): Turns the data written by "encode" back into a result.
+
+        Returns:
+            The result of "fn", possibly from another process's call.
+        """
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        # Keys sharing a lock file are serialized, but each keeps its own result file (named after the lock)
+        stripe = f'{int(digest, 16) % self.locks:03d}'
+        lock_path = os.path.join(self.shared_dir, f'{stripe}.lock')
+        result_path = os.path.join(self.shared_dir, f'{stripe}-{digest}.json')
+
+        with host_lock(lock_path, self.wait) as locked:
+            if not locked:
+                return fn()
+
+            # Holding the lock, no other process can be writing this lock's result files
+            self._sweep_results(f'{stripe}-')
+
+            # Reuse the result of the process that held the lock before us, if it is recent enough
+            try:
+                if time.time() - os.path.getmtime(result_path) <= self.share_seconds:
+                    with open(result_path, 'r') as f_result:
+                        result = decode(json.load(f_result))
+                    with self._lock:
+                        self._shared += 1
+                    return result
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+            result = fn()
+            if shareable(result):
+                # Write to a temporary file first, so readers never see a partial result
+                temp_path = f'{result_path}.{os.getpid()}.tmp'
+                with open(temp_path, 'w') as f_result:
+                    json.dump(encode(result), f_result)
+                os.replace(temp_path, result_path)
+            return result
+
+    def _sweep_results(self, prefix):
+        """
+        Deletes the result files (and leftover temporary files) of a lock that are too old to be reused.
+
+        Must be called while holding the lock the files belong to.
+
+        Args:
+            prefix (str): The file name prefix of the lock's result files.
+        """
+        expired_before = time.time() - self.share_seconds
+        try:
+            entries = [entry for entry in os.scandir(self.shared_dir) if entry.name.startswith(prefix)]
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < expired_before:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def snapshot(self):
+        """
+        Reports the coalescing counters.
+
+        Returns:
+            dict: The number of calls that went upstream, that joined an in-flight call, and that reused another process's result.
+        """
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'leaders': self._leaders,
+                'coalesced': self._coalesced,
+                'shared_across_processes': self._shared,
+            }
+
+
+# Coalesces identical searches (same provider, normalized query and units) across threads and worker processes
+search_flight = SingleFlight(shared_dir=os.path.join(CACHE_DIR, 'singleflight'))
+
+register_metrics('singleflight', search_flight.snapshot)
+
+
+# Returned by the caches when they hold nothing for a key (None is a valid cached value)
+CACHE_MISS = object()
+
+# Where the caches keep their entries:
+#   'memory' - in each worker process (nothing is shared between the workers)
+#   'sqlite' - in a SQLite database in "CACHE_DIR", shared by all the workers of a host and kept across restarts
+#   'redis'  - in a Redis server (or anything speaking its protocol), shared by every node
+CACHE_BACKEND = os.getenv('SKYLITE_CACHE_BACKEND', 'sqlite').strip().lower()
+# The Redis server used by the 'redis' backend
+REDIS_URL = os.getenv('SKYLITE_REDIS_URL', 'redis://localhost:6379/0')
+# Seconds a worker keeps its own copy of an entry read from a shared backend, to spare a round trip on hot keys
+CACHE_LOCAL_TTL = env_float('SKYLITE_CACHE_LOCAL_TTL', 30.0)
+# Maximum number of entries of each in-memory cache (or of the per-worker copies of a shared cache)
+CACHE_LOCAL_SIZE = env_int('SKYLITE_CACHE_LOCAL_SIZE', 512)
+
+
+class CacheBackend(abc.ABC):
+    """
+    The interface of the cache backends.
+
+    Keys are strings, values are JSON-serializable, and every entry has its own time to live. A backend never
+    raises on a failure of its storage: a failed read is a miss, and a failed write is dropped. A backend missing
+    one of the abstract methods can't be created.
+    """
+
+    @abc.abstractmethod
+    def get(self, key):
+        """
+        Looks up an entry.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            The cached value, or CACHE_MISS if the entry is missing or expired.
+        """
+
+    def get_with_expiry(self, key):
+        """
+        Looks up an entry, along with the time it expires.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            tuple: The cached value (or CACHE_MISS) and its expiry as a Unix timestamp - None if it is not known.
+        """
+        return self.get(key), None
+
+    @abc.abstractmethod
+    def set(self, key, value, ttl):
+        """
+        Stores an entry.
+
+        Args:
+            key (str): The key of the entry.
+            value: The JSON-serializable value to cache.
+            ttl (float): The time to live in seconds.
+        """
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """
+        Removes an entry, if it exists.
+
+        Args:
+            key (str): The key of the entry.
+        """
+
+    def snapshot(self):
+        """
+        Reports the backend's own counters.
+
+        Returns:
+            dict: The counters.
+        """
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    A thread-safe, size-bounded cache in the memory of the worker process.
+
+    When the cache is full, the least recently used entry is evicted. Values are stored as they are (not copied).
+    """
+
+    def __init__(self, maxsize=CACHE_LOCAL_SIZE):
+        """
+        Args:
+            maxsize (int): The maximum number of entries.
+        """
+        self.maxsize = maxsize
+        # Entries as key -> (expires_at, value), ordered from the least to the most recently used
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        # Counters for the metrics
+        self._expirations = 0
+        self._evictions = 0
+
+    def get(self, key):
+        return self.get_with_expiry(key)[0]
+
+    def get_with_expiry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return CACHE_MISS, None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                self._expirations += 1
+                return CACHE_MISS, None
+            self._entries.move_to_end(key)
+            return entry[1], entry[0]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'expirations': self._expirations,
+                'evictions': self._evictions,
+            }
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    A cache stored in a SQLite database file, shared by all the worker processes of a host and kept across restarts.
+
+    The database uses write-ahead logging, so the workers can read while another one writes. Each thread uses its
+    own connection, and connections are never carried over a fork. Expired rows are purged every now and then.
+    """
+
+    # Purge the expired rows once every this many writes (on average)
+    PURGE_EVERY = 200
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): The path of the SQLite database file.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Counters for the metrics
+        self._errors = 0
+
+    def _connection(self):
+        """
+        Returns this thread's connection, opening it (and creating the table) on first use.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # "isolation_level=None" - every statement commits on its own; "timeout" - wait for the other processes' writes
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def _error(self, action, error):
+        """
+        Reports a failure of the database.
+        """
+        print(f'SQLite cache {action} failed!\nDetails: {error}')
+        with self._lock:
+            self._errors += 1
+
+    def get(self, key):
+        return self.get_with_expiry(key)[0]
+
+    def get_with_expiry(self, key):
+        try:
+            row = self._connection().execute('SELECT value, expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            self._error('read', e)
+            return CACHE_MISS, None
+        if row is None or row[1] <= time.time():
+            return CACHE_MISS, None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, ttl):
+        try:
+            connection = self._connection()
+            connection.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time() + ttl)
+            )
+            if random.randrange(self.PURGE_EVERY) == 0:
+                connection.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),))
+        except sqlite3.Error as e:
+            self._error('write', e)
+
+    def delete(self, key):
+        try:
+            self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            self._error('delete', e)
+
+    def snapshot(self):
+        with self._lock:
+            return {'backend': 'sqlite', 'path': self.path, 'errors': self._errors}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    A cache stored in a Redis server, shared by every node of a deployment.
+
+    Only the "get", "pttl", "set" (with "px") and "delete" commands are used, so any client exposing them like redis-py does
+    can be passed in - e.g. "fakeredis.FakeRedis()", or a client connected to a local "redis-server" - which is how
+    the backend can be exercised without a real deployment.
+    """
+
+    def __init__(self, url=REDIS_URL, client=None, prefix='skylite:'):
+        """
+        Args:
+            url (str): The URL of the Redis server, used when no client is given.
+            client: A Redis client to use instead of connecting to "url". Defaults to None.
+            prefix (str): The prefix of every key, to share a server with other applications.
+
+        Raises:
+            RuntimeError: If no client is given and the "redis" package is not installed.
+        """
+        if client is None:
+            if redis is None:
+                raise RuntimeError('The "redis" package is required for the Redis cache backend (pip install redis).')
+            client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self.client = client
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        # Counters for the metrics
+        self._errors = 0
+
+    def _error(self, action, error):
+        """
+        Reports a failure of the server.
+        """
+        print(f'Redis cache {action} failed!\nDetails: {error}')
+        with self._lock:
+            self._errors += 1
+
+    # A cache must never break a search, so any failure of the client is treated as a miss or a dropped write
+    def get(self, key):
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception as e:
+            self._error('read', e)
+            return CACHE_MISS
+        if raw is None:
+            return CACHE_MISS
+        return json.loads(raw)
+
+    def get_with_expiry(self, key):
+        try:
+            raw = self.client.get(self.prefix + key)
+            # The remaining time to live in milliseconds (negative if the entry is gone, or never expires)
+            remaining_ms = self.client.pttl(self.prefix + key) if raw is not None else -2
+        except Exception as e:
+            self._error('read', e)
+            return CACHE_MISS, None
+        if raw is None:
+            return CACHE_MISS, None
+        expires_at = time.time() + remaining_ms / 1000 if remaining_ms >= 0 else None
+        return json.loads(raw), expires_at
+
+    def set(self, key, value, ttl):
+        try:
+            # "px" - the time to live in milliseconds, so the server expires the entry by itself
+            self.client.set(self.prefix + key, json.dumps(value), px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            self._error('write', e)
+
+    def delete(self, key):
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception as e:
+            self._error('delete', e)
+
+    def snapshot(self):
+        with self._lock:
+            return {'backend': 'redis', 'errors': self._errors}
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Puts a small in-memory cache in front of a shared backend.
+
+    Reads are served from the worker's memory when possible; otherwise they go to the shared backend, and the value
+    is kept in memory for at most "local_ttl" seconds - never past the expiry of the shared entry. Writes go to both.
+    """
+
+    def __init__(self, shared, local_ttl=CACHE_LOCAL_TTL, local_size=CACHE_LOCAL_SIZE):
+        """
+        Args:
+            shared (CacheBackend): The shared backend.
+            local_ttl (float): The longest time in seconds a value read from the shared backend is kept in memory.
+            local_size (int): The maximum number of entries kept in memory.
+        """
+        self.shared = shared
+        self.local = MemoryCacheBackend(local_size)
+        self.local_ttl = local_ttl
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is CACHE_MISS:
+            value, expires_at = self.shared.get_with_expiry(key)
+            if value is not CACHE_MISS:
+                # A local copy must not outlive the shared entry (e.g. a forecast past its staleness bound)
+                local_ttl = self.local_ttl if expires_at is None else min(self.local_ttl, expires_at - time.time())
+                if local_ttl > 0:
+                    self.local.set(key, value, local_ttl)
+        return value
+
+    def set(self, key, value, ttl):
+        self.shared.set(key, value, ttl)
+        self.local.set(key, value, min(ttl, self.local_ttl))
+
+    def delete(self, key):
+        self.shared.delete(key)
+        self.local.delete(key)
+
+    def snapshot(self):
+        return {'local': self.local.snapshot(), 'shared': self.shared.snapshot()}
+
+
+# The shared backends, created on first use: one per process, whichever cache uses it
+shared_cache_backends = {}
+
+
+def create_cache_backend(maxsize=CACHE_LOCAL_SIZE):
+    """
+    Creates the backend of a cache, according to "SKYLITE_CACHE_BACKEND".
+
+    Args:
+        maxsize (int): The maximum number of entries kept in the worker's memory.
+
+    Returns:
+        CacheBackend: An in-memory backend, or a shared backend behind a small in-memory tier.
+    """
+    if CACHE_BACKEND == 'memory':
+        return MemoryCacheBackend(maxsize)
+
+    if CACHE_BACKEND not in shared_cache_backends:
+        if CACHE_BACKEND == 'redis':
+            shared_cache_backends[CACHE_BACKEND] = RedisCacheBackend(REDIS_URL)
+        else:
+            if CACHE_BACKEND != 'sqlite':
+                print(f'Warning: Unknown cache backend {CACHE_BACKEND!r}. Using "sqlite".')
+            shared_cache_backends[CACHE_BACKEND] = SQLiteCacheBackend(os.path.join(CACHE_DIR, 'cache.sqlite3'))
+    return TieredCacheBackend(shared_cache_backends[CACHE_BACKEND], local_size=maxsize)
+
+
+class NamespacedCache:
+    """
+    One cache of the application (e.g. the forecasts) on top of a backend.
+
+    Keys are tuples, turned into "namespace:part:part" strings, so several caches can share one backend. Hits and
+    misses are counted for the metrics.
+    """
+
+    def __init__(self, namespace, backend):
+        """
+        Args:
+            namespace (str): The name of the cache, prefixed to every key.
+            backend (CacheBackend): The backend storing the entries.
+        """
+        self.namespace = namespace
+        self.backend = backend
+        self._lock = threading.Lock()
+        # Counters for the metrics
+        self._hits = 0
+        self._misses = 0
+
+    def _key(self, key):
+        """
+        Turns a key tuple into the backend's string key.
+        """
+        return ':'.join([self.namespace] + [str(part) for part in key])
+
+    def get(self, key, bypass_local=False):
+        """
+        Looks up an entry.
+
+        Args:
+            key (tuple): The key of the entry.
+            bypass_local (bool): Read a shared backend directly, skipping the worker's own copy. Defaults to False.
+
+        Returns:
+            The cached value, or CACHE_MISS if the entry is missing or expired.
+        """
+        backend = self.backend
+        if bypass_local and isinstance(backend, TieredCacheBackend):
+            backend = backend.shared
+        value = backend.get(self._key(key))
+        with self._lock:
+            if value is CACHE_MISS:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, key, value, ttl):
+        """
+        Stores an entry.
+
+        Args:
+            key (tuple): The key of the entry.
+            value: The JSON-serializable value to cache.
+            ttl (float): The time to live in seconds.
+        """
+        self.backend.set(self._key(key), value, ttl)
+
+    def delete(self, key):
+        """
+        Removes an entry, if it exists.
+
+        Args:
+            key (tuple): The key of the entry.
+        """
+        self.backend.delete(self._key(key))
+
+    def snapshot(self):
+        """
+        Reports the cache counters.
+
+        Returns:
+            dict: The hits and misses of this worker process, and the backend's own counters.
+        """
+        with self._lock:
+            counters = {'hits': self._hits, 'misses': self._misses}
+        counters['backend'] = self.backend.snapshot()
+        return counters
+
+
+# Time to live in seconds of a resolved location (city coordinates and location keys basically never change)
+GEOCODE_TTL = env_float('SKYLITE_GEOCODE_TTL', 30 * 24 * 3600)
+# Time to live in seconds of an unknown location, so that misspelled cities don't cost a request every time
+GEOCODE_NEGATIVE_TTL = env_float('SKYLITE_GEOCODE_NEGATIVE_TTL', 24 * 3600)
+
+# City -> coordinates (OpenWeather) and city -> location key (AccuWeather), keyed by (provider, normalized query)
+# Unknown locations are cached as None ("negative caching")
+geocode_cache = NamespacedCache('geocode', create_cache_backend())
+
+register_metrics('geocode_cache', geocode_cache.snapshot)
+
+
+# Maximum number of forecasts kept in memory by each worker process
+FORECAST_CACHE_SIZE = env_int('SKYLITE_FORECAST_CACHE_SIZE', CACHE_LOCAL_SIZE)
+# How often (in seconds) each provider publishes a new forecast:
+#   AccuWeather's 12-hour hourly forecast changes every hour
+#   OpenWeather's 5 day / 3 hour forecast moves in 3-hour steps
+FORECAST_CADENCE = {
+    'aw': env_int('SKYLITE_AW_FORECAST_CADENCE', 3600),
+    'ow': env_int('SKYLITE_OW_FORECAST_CADENCE', 3 * 3600),
+}
+# Seconds after each cadence boundary that a provider needs to publish the new forecast
+FORECAST_PUBLISH_DELAY = env_int('SKYLITE_FORECAST_PUBLISH_DELAY', 300)
+# Longest time in seconds an outdated forecast may still be served while a fresh one is fetched in the background
+FORECAST_MAX_STALENESS = env_int('SKYLITE_FORECAST_MAX_STALENESS', 900)
+
+
+def forecast_ttl(provider, now=None):
+    """
+    Computes how long a forecast fetched now stays current: until the provider's next update.
+
+    Updates are assumed to land "FORECAST_PUBLISH_DELAY" seconds after each multiple of the provider's cadence
+    (in UTC), so every forecast cached during one period expires at the same moment.
+
+    Args:
+        provider (str): The weather provider ('aw' or 'ow').
+        now (float): The current Unix time. Defaults to the current time.
+
+    Returns:
+        float: The time to live in seconds.
+    """
+    now = time.time() if now is None else now
+    cadence = FORECAST_CADENCE[provider]
+    # The next "boundary + publish delay" moment strictly after now
+    next_update = (math.floor((now - FORECAST_PUBLISH_DELAY) / cadence) + 1) * cadence + FORECAST_PUBLISH_DELAY
+    return next_update - now
+
+
+# The forecasts, keyed by (provider, location, units)
+# Each entry is a dictionary with the keys 'forecast' (see "Forecast.to_dict"), 'fetched_at' and 'fresh_until', and
+# stays in the cache until it is too stale to be served at all
+forecast_cache = NamespacedCache('forecast', create_cache_backend(FORECAST_CACHE_SIZE))
+
+register_metrics('forecast_cache', forecast_cache.snapshot)
+
+# Keys of the forecasts being refreshed in the background, so that each one is refreshed only once at a time
+revalidating_forecasts = set()
+revalidation_lock = threading.Lock()
+# Counters of the stale-while-revalidate behaviour, for the metrics
+revalidation_counters = collections.Counter()
+
+
+def revalidation_metrics():
+    """
+    Reports the stale-while-revalidate counters.
+
+    Returns:
+        dict: The number of stale forecasts served, and of background refreshes started and failed.
+    """
+    with revalidation_lock:
+        return {
+            'in_progress': len(revalidating_forecasts),
+            'stale_served': revalidation_counters['stale_served'],
+            'refreshes': revalidation_counters['refreshes'],
+            'failed_refreshes': revalidation_counters['failed_refreshes'],
+        }
+
+
+register_metrics('forecast_revalidation', revalidation_metrics)
+
+
+def refresh_forecast(key, fetch):
+    """
+    Fetches a forecast and stores it in the forecast cache.
+
+    Args:
+        key (tuple): The (provider, location, units) key of the forecast.
+        fetch (callable): Fetches the forecast as a "Forecast", without arguments; returns None on failure.
+
+    Returns:
+        tuple: The forecast (None if fetching failed) and the Unix time it was fetched at.
+    """
+    forecast = fetch()
+    fetched_at = time.time()
+    # Failures are not cached, so the next search tries again (a stale entry, if any, stays servable)
+    if forecast is not None:
+        ttl = forecast_ttl(key[0], fetched_at)
+        entry = {'forecast': forecast.to_dict(), 'fetched_at': fetched_at, 'fresh_until': fetched_at + ttl}
+        forecast_cache.set(key, entry, ttl + FORECAST_MAX_STALENESS)
+    return forecast, fetched_at
+
+
+def revalidate_in_background(key, fetch):
+    """
+    Refreshes a stale forecast on the fetch engine's thread pool, unless it is already being refreshed.
+
+    Args:
+        key (tuple): The (provider, location, units) key of the forecast.
+        fetch (callable): Fetches the forecast, without arguments; returns None on failure.
+    """
+    with revalidation_lock:
+        if key in revalidating_forecasts:
+            return
+        revalidating_forecasts.add(key)
+        revalidation_counters['refreshes'] += 1
+
+    def revalidate():
+        try:
+            forecast, _ = refresh_forecast(key, fetch)
+            if forecast is None:
+                with revalidation_lock:
+                    revalidation_counters['failed_refreshes'] += 1
+        finally:
+            with revalidation_lock:
+                revalidating_forecasts.discard(key)
+
+    get_fetch_executor().submit(revalidate)
+
+
+def forecast_request(provider, location, units):
+    """
+    Describes the forecast request of a resolved location.
+
+    Args:
+        provider (str): The weather provider ('aw' or 'ow').
+        location: The location: an AccuWeather location key, or an OpenWeather (latitude, longitude) tuple.
+        units (str): The unit system of the forecast.
+
+    Returns:
+        tuple: The (provider, location, units) key of the forecast cache, and a function fetching the forecast
+               (parsed into a "Forecast").
+    """
+    if provider == 'aw':
+        return ('aw', location, units), lambda: parse_aw_forecast(get_weather_forecast_aw(location, units=units), units)
+
+    latitude, longitude = location
+    # The coordinates are rounded to about 10 metres, so that the key doesn't depend on float formatting
+    return (('ow', f'{latitude:.4f},{longitude:.4f}', units),
+            lambda: parse_ow_forecast(get_weather_forecast_ow(latitude, longitude, units=units), units))
+
+
+def cached_forecast(key, fetch):
+    """
+    Returns a provider's forecast for a location from the forecast cache, fetching and caching it on a miss.
+
+    A forecast that is past its provider's update but still within "FORECAST_MAX_STALENESS" is served at once, and
+    refreshed in the background for the next search ("stale-while-revalidate").
+
+    Args:
+        key (tuple): The (provider, location, units) key of the forecast (see "forecast_request").
+        fetch (callable): Fetches the forecast as a "Forecast", without arguments; returns None on failure.
+
+    Returns:
+        tuple: The "Forecast" (None if it is not cached and fetching it failed) and the Unix time it was fetched at.
+    """
+    entry = forecast_cache.get(key)
+    if entry is not CACHE_MISS:
+        try:
+            forecast = Forecast.from_dict(entry['forecast'])
+        except (KeyError, TypeError, ValueError):
+            # An entry cached by an older version of the application - fetch the forecast again
+            entry = CACHE_MISS
+    if entry is CACHE_MISS:
+        return refresh_forecast(key, fetch)
+
+    if time.time() >= entry['fresh_until']:
+        with revalidation_lock:
+            revalidation_counters['stale_served'] += 1
+        revalidate_in_background(key, fetch)
+    return forecast, entry['fetched_at']
+
+
+# The rendered weather cards and graphs (as component JSON), keyed by (provider, location, units, fetched_at, graph mode, part)
+render_cache = NamespacedCache('render', create_cache_backend())
+
+register_metrics('render_cache', render_cache.snapshot)
+
+
+# CATEGORY IV - Normalized Forecast Model
+
+
+# Bumped whenever the layout of "Forecast.to_dict" changes, so that cached forecasts of an older layout are ignored
+FORECAST_MODEL_VERSION = 1
+
+
+class ForecastMeta:
+    """
+    What a forecast is about: its provider, units and location.
+    """
+
+    __slots__ = ('source', 'units', 'temperature_unit', 'latitude', 'longitude', 'utc_offset', 'sunrise', 'sunset', 'city_name')
+
+    def __init__(self, source, units='imperial', temperature_unit='F', latitude=None, longitude=None,
+                 utc_offset=None, sunrise=None, sunset=None, city_name=None):
+        """
+        Args:
+            source (str): The weather provider ('aw' or 'ow').
+            units (str): The unit system of the forecast ("imperial" or "metric").
+            temperature_unit (str): The temperature unit to display ('F' or 'C').
+            latitude (float): The latitude of the location, or None.
+            longitude (float): The longitude of the location, or None.
+            utc_offset (int): The location's shift from UTC in seconds, or None.
+            sunrise (int): A sunrise at the location as a Unix time, or None.
+            sunset (int): The sunset following "sunrise" as a Unix time, or None.
+            city_name (str): The name of the location given by the provider, or None.
+        """
+        self.source = source
+        self.units = units
+        self.temperature_unit = temperature_unit
+        self.latitude = latitude
+        self.longitude = longitude
+        self.utc_offset = utc_offset
+        self.sunrise = sunrise
+        self.sunset = sunset
+        self.city_name = city_name
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The metadata as a JSON-serializable dictionary.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Args:
+            data (dict): A dictionary returned by "to_dict".
+
+        Returns:
+            ForecastMeta: The metadata.
+        """
+        return cls(**data)
+
+
+class Forecast:
+    """
+    A provider's forecast, normalized into one NumPy array per field ("columns"), one value per forecast time.
+
+    Both providers' payloads are parsed into this shape once (see "parse_aw_forecast" and "parse_ow_forecast"), so
+    the cards, the graphs and the caches never walk the provider's JSON again. Missing numbers are NaN, and flags
+    (e.g., "is_daylight") are 1.0 or 0.0, with NaN when unknown.
+    """
+
+    # The columns, with their NumPy types
+    COLUMNS = {
+        'time': 'int64',                         # Unix time of the forecast
+        'utc_offset': 'int64',                   # Shift from UTC (in seconds) of the time shown by the provider
+        'temp': 'float64',
+        'feels_like': 'float64',
+        'temp_min': 'float64',
+        'temp_max': 'float64',
+        'humidity': 'float64',                   # Relative humidity in percent
+        'dew_point': 'float64',
+        'wind_speed': 'float64',
+        'visibility': 'float64',                 # In metres
+        'precipitation_probability': 'float64',  # In percent
+        'has_precipitation': 'float64',          # Flag
+        'is_daylight': 'float64',                # Flag
+        'icon': 'str',                           # The provider's icon code
+        'description': 'str',                    # The provider's description of the conditions
+    }
+
+    __slots__ = ('meta',) + tuple(COLUMNS)
+
+    def __init__(self, meta, **columns):
+        """
+        Args:
+            meta (ForecastMeta): What the forecast is about.
+            **columns: The values of each column (lists or arrays of equal length); missing columns are left unknown.
+        """
+        self.meta = meta
+        length = len(columns.get('time', ()))
+        for name, dtype in self.COLUMNS.items():
+            values = columns.get(name)
+            if dtype == 'str':
+                values = [''] * length if values is None else ['' if value is None else str(value) for value in values]
+                setattr(self, name, np.array(values, dtype=str))
+            elif dtype == 'float64':
+                # "dtype=float" turns the missing values (None) into NaN
+                setattr(self, name, np.full(length, np.nan) if values is None else np.asarray(values, dtype=float))
+            else:
+                setattr(self, name, np.zeros(length, dtype=dtype) if values is None else np.asarray(values, dtype=dtype))
+
+    def __len__(self):
+        return len(self.time)
+
+    def head(self, count):
+        """
+        Returns the first forecast times (the columns are views, not copies).
+
+        Args:
+            count (int): The number of forecast times to keep.
+
+        Returns:
+            Forecast: The shortened forecast.
+        """
+        return Forecast(self.meta, **{name: getattr(self, name)[:count] for name in self.COLUMNS})
+
+    def entry_digest(self, index):
+        """
+        Hashes everything known about one forecast time: its values, and the provider and units they come from.
+
+        Args:
+            index (int): The position of the forecast time.
+
+        Returns:
+            str: The hexadecimal digest - equal for equal entries, whichever search or fetch they come from.
+        """
+        digest = hashlib.blake2b(f'{self.meta.source}|{self.meta.temperature_unit}'.encode(), digest_size=16)
+        for name, dtype in self.COLUMNS.items():
+            value = getattr(self, name)[index]
+            digest.update(str(value).encode() if dtype == 'str' else value.tobytes())
+            # Separate the values, so that e.g. the icons '1' + '2' and '12' + '' don't collide
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The forecast as a JSON-serializable dictionary (NaN becomes None), for the caches and the API.
+        """
+        columns = {}
+        for name, dtype in self.COLUMNS.items():
+            values = getattr(self, name)
+            columns[name] = to_optional_list(values) if dtype == 'float64' else values.tolist()
+        return {'version': FORECAST_MODEL_VERSION, 'meta': self.meta.to_dict(), 'columns': columns}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Args:
+            data (dict): A dictionary returned by "to_dict".
+
+        Returns:
+            Forecast: The forecast.
+
+        Raises:
+            ValueError: If the dictionary was made by another version of the model.
+        """
+        if data.get('version') != FORECAST_MODEL_VERSION:
+            raise ValueError(f'Unsupported forecast model version: {data.get("version")!r}')
+        return cls(ForecastMeta.from_dict(data['meta']), **data['columns'])
+
+
+def to_optional_list(values):
+    """
+    Converts a NumPy array to a list of floats, with None in place of NaN (for the cards, the graphs and JSON).
+
+    Args:
+        values (numpy.ndarray): The array to convert.
+
+    Returns:
+        list: The values as Python floats, or None where they are missing.
+    """
+    return [None if math.isnan(value) else value for value in values.tolist()]
+
+
+def optional_float(value):
+    """
+    Converts a provider's value to a float, for a "Forecast" column.
+
+    Args:
+        value: The value (a number, a numeric string, or anything else when unavailable).
+
+    Returns:
+        float or None: The number, or None if the value is not a number.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def optional_flag(value):
+    """
+    Reads a flag column's value.
+
+    Args:
+        value (float): 1.0, 0.0 or NaN.
+
+    Returns:
+        bool or None: True, False, or None if the flag is unknown.
+    """
+    return None if math.isnan(value) else bool(value)
+
+
+def format_value(value, unavailable='Not Available'):
+    """
+    Formats a number of a "Forecast" column for display, without a useless ".0".
+
+    Args:
+        value (float): The number, possibly NaN.
+        unavailable (str): The text shown for NaN. Defaults to "Not Available".
+
+    Returns:
+        str: The formatted number.
+    """
+    if value is None or math.isnan(value):
+        return unavailable
+    return f'{value:g}'
+
+
+# Time formats of the cards and of the graphs' hover labels
+CARD_TIME_FORMAT = '%B %d, %Y, %I:%M %p'
+# Number of (timestamp, format, UTC offset) labels each worker remembers
+TIME_LABEL_CACHE_SIZE = 4096
+
+
+def time_axis(forecast):
+    """
+    Converts all the forecast times at once into the wall-clock times shown by the provider, for plotting.
+
+    Args:
+        forecast (Forecast): The forecast.
+
+    Returns:
+        numpy.ndarray: A "datetime64[s]" array (without a timezone: the times as read on the provider's clock).
+    """
+    return (forecast.time + forecast.utc_offset).astype('datetime64[s]')
+
+
+def format_utc_offset(utc_offset):
+    """
+    Formats a shift from UTC like "strftime('%z')" does.
+
+    Args:
+        utc_offset (int): The shift from UTC in seconds.
+
+    Returns:
+        str: The offset, as "+HHMM" or "-HHMM".
+    """
+    sign = '-' if utc_offset < 0 else '+'
+    hours, minutes = divmod(abs(int(utc_offset)) // 60, 60)
+    return f'{sign}{hours:02d}{minutes:02d}'
+
+
+@functools.lru_cache(maxsize=TIME_LABEL_CACHE_SIZE)
+def time_label(timestamp, output_format, utc_offset, show_offset=False):
+    """
+    Formats one forecast time, remembering the result (forecasts of a period share most of their times).
+
+    Args:
+        timestamp (int): The Unix time.
+        output_format (str): The desired format string for the output time.
+        utc_offset (int): The shift from UTC in seconds of the clock to show the time on.
+        show_offset (bool): Append the UTC offset (e.g., " (UTC+0100)"). Defaults to False.
+
+    Returns:
+        str: The formatted time.
+    """
+    return format_timestamp(timestamp, utc_offset, output_format, show_offset)
+
+
+def time_labels(forecast, output_format, show_offset=False):
+    """
+    Formats all the forecast times, for the cards.
+
+    OpenWeather's times are in UTC (their UTC offset is 0); AccuWeather's are local, and are shown with their offset.
+
+    Args:
+        forecast (Forecast): The forecast.
+        output_format (str): The desired format string for the output time.
+        show_offset (bool): Append the UTC offset (e.g., " (UTC+0100)"). Defaults to False.
+
+    Returns:
+        list: The formatted times, one per forecast time.
+    """
+    return [time_label(timestamp, output_format, utc_offset, show_offset)
+            for timestamp, utc_offset in zip(forecast.time.tolist(), forecast.utc_offset.tolist())]
+
+
+def time_label_metrics():
+    """
+    Reports how often the time labels were answered from memory.
+
+    Returns:
+        dict: The hits, misses and size of the time label cache.
+    """
+    info = time_label.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+
+
+register_metrics('time_labels', time_label_metrics)
+
+
+# Maximum number of rendered weather cards each worker keeps in memory
+CARD_CACHE_SIZE = env_int('SKYLITE_CARD_CACHE_SIZE', 1024)
+# Seconds a rendered card is kept - its key is its content, so it never goes stale and only has to make room for newer ones
+CARD_CACHE_TTL = 24 * 3600
+
+# The rendered weather cards (as component JSON), keyed by (card function, entry digest, time label)
+# In the configured backend like the other caches, so the cards are shared by every process that renders searches
+card_cache = NamespacedCache('cards', create_cache_backend(CARD_CACHE_SIZE))
+
+register_metrics('card_cache', card_cache.snapshot)
+
+
+def render_cards(create_card, forecast, labels):
+    """
+    Renders a weather card per forecast time, reusing the cards already rendered for the same entries.
+
+    Args:
+        create_card (callable): The provider's card function ("create_aw_weather_card" or "create_ow_weather_card").
+        forecast (Forecast): The forecast.
+        labels (list): The formatted time of each forecast time (see "time_labels").
+
+    Returns:
+        list: The cards, as component JSON (which Dash sends as it is).
+    """
+    cards = []
+    for index, label in enumerate(labels):
+        key = (create_card.__name__, forecast.entry_digest(index), label)
+        card = card_cache.get(key)
+        if card is CACHE_MISS:
+            # Store the card as plain JSON, so it is serialized once however many responses it goes into
+            card = json.loads(pio.json.to_json_plotly(create_card(forecast, index, label)))
+            card_cache.set(key, card, CARD_CACHE_TTL)
+        cards.append(card)
+    return cards
+
+
+# The template of every graph, resolved once into a dictionary
+# Figures are built as plain dictionaries (see "FigureSkeleton"), and plotly.js doesn't know Plotly's template
+# names - "go.Figure" resolves 'plotly_white' to its full definition, so the plain figures must carry it too
+GRAPH_TEMPLATE = pio.templates['plotly_white'].to_plotly_json()
+
+
+def typed_array(values):
+    """
+    Encodes numbers as a Plotly typed array: base64 of their little-endian float64 bytes, which plotly.js reads directly.
+
+    Args:
+        values (numpy.ndarray): The numbers (NaN for gaps).
+
+    Returns:
+        dict: The typed array specification ('dtype' and 'bdata').
+    """
+    array = np.ascontiguousarray(values, dtype='<f8')
+    return {'dtype': 'f8', 'bdata': base64.b64encode(array.tobytes()).decode('ascii')}
+
+
+def time_typed_array(times):
+    """
+    Encodes times as a Plotly typed array of milliseconds, which a date axis shows as they are (without converting
+    them to the browser's timezone).
+
+    Args:
+        times (numpy.ndarray): The times ("datetime64" values).
+
+    Returns:
+        dict: The typed array specification ('dtype' and 'bdata').
+    """
+    return typed_array(times.astype('datetime64[ms]').astype('int64'))
+
+
+class FigureSkeleton:
+    """
+    Everything about a figure but its data: the layout and the style of each trace, built once.
+
+    Figures are plain dictionaries, without "plotly.graph_objects" validation. A skeleton's layout and trace styles
+    are shared by every figure made from it - they must never be modified - so making a figure only encodes the data
+    arrays and attaches them.
+    """
+
+    __slots__ = ('traces', 'layout')
+
+    def __init__(self, traces, layout):
+        """
+        Args:
+            traces (list): The trace of each series, without its data ("x" and "y").
+            layout (dict): The layout of the figure.
+        """
+        self.traces = tuple(traces)
+        self.layout = layout
+
+    def figure(self, times, series, x_title=None):
+        """
+        Makes a figure by attaching data to the skeleton.
+
+        Args:
+            times (numpy.ndarray): The times ("datetime64" values, as read on the provider's clock), shared by all the traces.
+            series (list): The values (NumPy arrays, NaN where missing) of each trace, in order.
+            x_title (str): The title of the x-axis, if it differs from the skeleton's. Defaults to None.
+
+        Returns:
+            dict: The figure, ready for "dcc.Graph".
+        """
+        # The times are the same for every trace - encode them once
+        x = time_typed_array(times)
+        data = [{**trace, 'x': x, 'y': typed_array(values)} for trace, values in zip(self.traces, series)]
+        layout = self.layout
+        if x_title is not None:
+            # Copy only what changes, leaving the skeleton as it is
+            layout = {**layout, 'xaxis': {**layout['xaxis'], 'title': {'text': x_title}}}
+        return {'data': data, 'layout': layout}
+
+
+def scatter_skeleton(title, y_title, line_color, marker_color, x_title='Time'):
+    """
+    Builds the skeleton of a line-and-markers graph of one series against time.
+
+    This is what "go.Figure(data=[go.Scatter(...)], layout=go.Layout(...))" produces, as a plain dictionary.
+
+    Args:
+        title (str): The title of the graph.
+        y_title (str): The title of the y-axis.
+        line_color (str): The colour of the line.
+        marker_color (str): The colour of the markers.
+        x_title (str): The title of the x-axis. Defaults to "Time".
+
+    Returns:
+        FigureSkeleton: The skeleton of the graph.
+    """
+    trace = {
+        'type': 'scatter',
+        'mode': 'lines+markers', # The graph should display both, lines connecting the data points and markers at the data points themselves
+        'line': {'color': line_color, 'width': 2},
+        'marker': {'color': marker_color, 'size': 6},
+    }
+    layout = {
+        'template': GRAPH_TEMPLATE,
+        'title': {'text': title},
+        'xaxis': {'type': 'date', 'title': {'text': x_title}, 'showgrid': True, 'gridcolor': 'lightgray'},
+        'yaxis': {'title': {'text': y_title}, 'showgrid': True, 'gridcolor': 'lightgray'},
+    }
+    return FigureSkeleton([trace], layout)
+
+
+def panels_skeleton(panels, x_title='Time'):
+    """
+    Builds the skeleton of a graph stacking a panel per series, all sharing one time axis.
+
+    Each series keeps the look of its own "scatter_skeleton" graph, but the template, layout and plotly.js
+    instance are shared - and the legend hides or shows a series in the browser, without calling the server.
+
+    Args:
+        panels (list): The series, from top to bottom, as (title, y-axis title, colour) tuples.
+        x_title (str): The title of the x-axis. Defaults to "Time".
+
+    Returns:
+        FigureSkeleton: The skeleton of the graph.
+    """
+    # Split the height between the panels, leaving room for each one's title
+    gap = 0.08
+    height = (1 - gap * (len(panels) - 1)) / len(panels)
+
+    traces = []
+    layout = {
+        'template': GRAPH_TEMPLATE,
+        'height': 300 * len(panels) + 100,
+        'annotations': [],
+        # One x-axis for all the panels, labelled under the bottom one
+        'xaxis': {'type': 'date', 'title': {'text': x_title}, 'anchor': f'y{len(panels)}', 'showgrid': True, 'gridcolor': 'lightgray'},
+    }
+    for index, (title, y_title, color) in enumerate(panels, start=1):
+        # Plotly names the first y-axis "y"/"yaxis", then "y2"/"yaxis2", ...
+        suffix = '' if index == 1 else str(index)
+        # Rounded, as Plotly rejects domains a rounding error outside [0, 1]
+        top = round(1 - (index - 1) * (height + gap), 6)
+        traces.append({
+            'type': 'scatter',
+            'name': title,
+            'xaxis': 'x',
+            'yaxis': f'y{suffix}',
+            'mode': 'lines+markers',
+            'line': {'color': color, 'width': 2},
+            'marker': {'color': color, 'size': 6},
+        })
+        layout[f'yaxis{suffix}'] = {
+            'domain': [max(round(top - height, 6), 0), top],
+            'title': {'text': y_title},
+            'showgrid': True,
+            'gridcolor': 'lightgray',
+        }
+        # The title of the panel, centred above it
+        layout['annotations'].append({
+            'text': title,
+            'xref': 'paper',
+            'yref': 'paper',
+            'x': 0.5,
+            'y': top,
+            'xanchor': 'center',
+            'yanchor': 'bottom',
+            'showarrow': False,
+            'font': {'size': 16},
+        })
+    return FigureSkeleton(traces, layout)
+
+
+# CATEGORY V - Data Fetching, Formatting, and Displaying AccuWeather Data
+
+
+def get_location_key(search_text, max_retries=3, retry_delay=RETRY_BASE_DELAY, deadline=RETRY_DEADLINE):
+    """
+    Fetches location key for AccuWeather based on the search box input.
+
+    Args:
+        search_text (str): The "City, Country Code" to search for.
+        max_retries (int): The maximum number of times to try the API call in case of a failure. Defaults to three.
+        retry_delay (float): The base delay in seconds of the jittered backoff between retries.
+        deadline (float): The total time budget in seconds for the call, including retries.
+
+    Returns:
+        list or None: The AccuWeather locations matching the search (an empty list if there are none), or "None" if the request failed.
+    """
+    location_key_url = f'http://dataservice.accuweather.com/locations/v1/cities/search?q={search_text}&apikey={API_AW}'
+    
+    try:
+        # Make a request to AccuWeather API using the 'location_key_url', and asks to find locations matching the '{search_text}'
+        # The request goes through the shared AccuWeather session, so a warm keep-alive connection is reused when available
+        # "provider_request" retries temporary failures within the deadline, and raises an exception for the rest
+        response = provider_request('aw', 'location_search', location_key_url, max_retries=max_retries, retry_delay=retry_delay, deadline=deadline)
+        # If the API request was successful, it parses the JSON data in the response; and stores it in a variable 'locations'
+        locations = decode_json(response.content)
+        # If everything went correctly, the function returns the 'location_key'
+        return locations
+
+    # Error handling for network errors, invalid URLs, exhausted retries, etc.
+    except requests.exceptions.RequestException as Re:
+        print(f'Error fetching location!\nDetails: {Re}')
+        # If there was an error, the block returns 'None' to signal failure
+        return None
+
+    # Handle any other general errors
+    except Exception as e:
+        print(f'An unexpected error occured!\nDetails: {e}')
+        return None
+
+
+def get_weather_forecast_aw(location_key, units='imperial', max_retries=3, retry_delay=RETRY_BASE_DELAY, deadline=RETRY_DEADLINE):
+    """
+    Fetches the 12-hour hourly forecast data for the given location key.
+
+    Args:
+        location_key (str): The AccuWeather location key.
+        units (str): The unit system to use for the forecast: 'imperial' (Fahrenheit) or 'metric' (Celsius). Defaults to "imperial".
+        max_retries (int): The maximum number of times to try the API call in case of a failure. Defaults to three.
+        retry_delay (float): The base delay in seconds of the jittered backoff between retries.
+        deadline (float): The total time budget in seconds for the call, including retries.
+
+    Returns:
+        list or None: A list of dictionaries containing the 12-hour hourly forecast data, or None if an error occurs or no data is returned.
+    """
+    # Check if 'location_key' is empty or None, if it is the block return None, and prevents unnecessary API calls and potential errors
+    if not location_key:
+        return None
+    
+    # AccuWeather only knows two unit systems, selected through the "metric" flag
+    metric = 'true' if units == 'metric' else 'false'
+    forecast_url_aw = f'http://dataservice.accuweather.com/forecasts/v1/hourly/12hour/{location_key}?apikey={API_AW}&metric={metric}'
+    
+    try:
+        response = provider_request('aw', 'hourly_forecast', forecast_url_aw, max_retries=max_retries, retry_delay=retry_delay, deadline=deadline)
+        weather_data_aw = decode_json(response.content)
+        # If 'weather_data_aw' is not empty, the 'return'-block returns a list of dictionaries containing the 12-hour hourly forecast data
+        # But if 'weather_data_aw' is empty, the 'return'-block returns None
+        return weather_data_aw if weather_data_aw else None
+
+    # Error handling for network errors, invalid URLs, exhausted retries, etc.
+    except requests.exceptions.RequestException as Re:
+        print(f'Error fetching the weather data from AccuWeather!\nDetails: {Re}')
+        return None
+
+    # Handle any other general errors
+    except Exception as e:
+        print(f'An unexpected error occured!\nDetails: {e}')
+        return None
+
+
+# Dictionary to associate weather descriptions with the corresponding image file paths - for AccuWeather
+aw_icon_map = {
+    '1': '/assets/AccuWeatherIcons/Sunny_(1).png',
+    '2': '/assets/AccuWeatherIcons/MostlySunny_(2).png',
+    '3': '/assets/AccuWeatherIcons/PartlySunny_(3).png',
+    '4': '/assets/AccuWeatherIcons/IntermittentCloudsAtDay_(4).png',
+    '5': '/assets/AccuWeatherIcons/HazySunshine_(5).png',
+    '6': '/assets/AccuWeatherIcons/MostlyCloudyAtDay_(6).png',
+    '7': '/assets/AccuWeatherIcons/Cloudy_(7).png',
+    '8': '/assets/AccuWeatherIcons/Dreary(Overcast)_(8).png',
+    '11': '/assets/AccuWeatherIcons/Fog_(11).png',
+    '12': '/assets/AccuWeatherIcons/Showers_(12).png',
+    '13': '/assets/AccuWeatherIcons/MostlyCloudyWithShowers_(13).png',
+    '14': '/assets/AccuWeatherIcons/PartlySunnyWithShowers_(14).png',
+    '15': '/assets/AccuWeatherIcons/ThunderStorms_(15).png',
+    '16': '/assets/AccuWeatherIcons/MostlyCloudyWithThunderStorms_(16).png',
+    '17': '/assets/AccuWeatherIcons/PartlySunnyWithThunderStorms_(17).png',
+    '18': '/assets/AccuWeatherIcons/Rain_(18).png',
+    '19': '/assets/AccuWeatherIcons/Flurries_(19).png',
+    '20': '/assets/AccuWeatherIcons/MostlyCloudyWithFlurriesAtDay_(20).png',
+    '21': '/assets/AccuWeatherIcons/PartlySunnyWithFlurries_(21).png',
+    '22': '/assets/AccuWeatherIcons/Snow_(22).png',
+    '23': '/assets/AccuWeatherIcons/MostlyCloudyWithSnowAtDay_(23).png',
+    '24': '/assets/AccuWeatherIcons/Ice_(24).png',
+    '25': '/assets/AccuWeatherIcons/Sleet_(25).png',
+    '26': '/assets/AccuWeatherIcons/FreezingRain_(26).png',
+    '29': '/assets/AccuWeatherIcons/RainAndSnow_(29).png',
+    '30': '/assets/AccuWeatherIcons/Hot_(30).png',
+    '31': '/assets/AccuWeatherIcons/Cold_(31).png',
+    '32': '/assets/AccuWeatherIcons/Windy_(32).png',
+    '33': '/assets/AccuWeatherIcons/Clear_(33).png',
+    '34': '/assets/AccuWeatherIcons/MostlyClear_(34).png',
+    '35': '/assets/AccuWeatherIcons/PartlyCloudy_(35).png',
+    '36': '/assets/AccuWeatherIcons/IntermittentCloudsAtNight_(36).png',
+    '37': '/assets/AccuWeatherIcons/HazyMoonlight_(37).png',
+    '38': '/assets/AccuWeatherIcons/MostlyCloudyAtNight_(38).png',
+    '39': '/assets/AccuWeatherIcons/PartlyCloudyWithShowers_(39).png',
+    '40': '/assets/AccuWeatherIcons/MostlyCloudyWithShowers_(40).png',
+    '41': '/assets/AccuWeatherIcons/PartlyCloudyWithThunderstorms_(41).png',
+    '42': '/assets/AccuWeatherIcons/MostlyCloudyWithThunderstorms_(42).png',
+    '43': '/assets/AccuWeatherIcons/MostlyCloudyWithFlurriesAtNight_(43).png',
+    '44': '/assets/AccuWeatherIcons/MostlyCloudyWithSnowAtNight_(44).png',
+    
+}
+
+
+# AccuWeather icons that have a day and a night version - the other icons look the same at any time
+aw_night_icon_ids = {
+    '1': '33', '2': '34', '3': '35', '4': '36', '5': '37', '6': '38',
+    '13': '40', '14': '39', '16': '42', '17': '41', '20': '43', '23': '44',
+}
+aw_day_icon_ids = {night: day for day, night in aw_night_icon_ids.items()}
+
+
+def classify_aw_daylight(forecast_aw, latitude=None, longitude=None):
+    """
+    Tells which AccuWeather forecast hours fall between sunrise and sunset, for the whole response at once.
+
+    AccuWeather's own "IsDaylight" flag is used when present; the other hours are classified from the sun's position
+    when the coordinates of the location are known.
+
+    Args:
+        forecast_aw (list): The hourly forecast data from AccuWeather.
+        latitude (float): The latitude of the location, or None.
+        longitude (float): The longitude of the location, or None.
+
+    Returns:
+        list: A list holding, for each hour, True (day), False (night) or None (unknown).
+    """
+    flags = [hour_data.get('IsDaylight') for hour_data in forecast_aw]
+    missing = [index for index, flag in enumerate(flags) if flag is None]
+    if missing:
+        # "EpochDateTime" is the Unix time of each forecast hour
+        solar_flags = classify_daylight([forecast_aw[index].get('EpochDateTime') for index in missing], latitude, longitude)
+        for index, flag in zip(missing, solar_flags):
+            flags[index] = flag
+    return flags
+
+
+def extract_aw_icon_id(icon_id, is_daylight=None):
+    """
+    Extarcts the weather path from AccuWeather data.
+
+    Args:
+        icon_id (str): AccuWeather's icon number ("WeatherIcon"), or an empty string if it is missing.
+        is_daylight (bool): Whether the hour is during the day, to swap a day icon for its night version (or the other way round). Defaults to None.
+
+    Returns:
+        str: The path to the appropriate icon, or a default path if not found or an error occurs.
+    """
+    # Check if "icon_id" exists
+    if icon_id:
+        # Swap the icon for its day or night version if it doesn't match the time of day
+        if is_daylight is True:
+            icon_id = aw_day_icon_ids.get(icon_id, icon_id)
+        elif is_daylight is False:
+            icon_id = aw_night_icon_ids.get(icon_id, icon_id)
+
+        # Try to find the corresponding icon path in the "aw_icon_map" dictionary
+        # If "icon_id" is not found in the dictionary, the "icon_path" is set to the default icon path
+        return aw_icon_map.get(icon_id, '/assets/AccuWeatherIcons/DefaultImageAW.png')
+
+    # Handle missing 'WeatherIcon' key
+    return '/assets/AccuWeatherIcons/DefaultImageAW.png'
+
+
+def parse_aw_forecast(forecast_aw, units='imperial'):
+    """
+    Parses AccuWeather's hourly forecast into a "Forecast".
+
+    Args:
+        forecast_aw (list): The hourly forecast data from AccuWeather, or None.
+        units (str): The unit system of the forecast. Defaults to "imperial".
+
+    Returns:
+        Forecast or None: The parsed forecast, or None if there is no data.
+    """
+    if forecast_aw is None:
+        return None
+
+    hours = []
+    times = []
+    utc_offsets = []
+    for hour_data in forecast_aw:
+        # AccuWeather's time strings are local times, with their UTC offset (e.g., "2025-10-09T07:00:00+01:00")
+        try:
+            dt_obj = datetime.datetime.fromisoformat(hour_data.get('DateTime', '').replace('Z', '+00:00'))
+        except (TypeError, ValueError):
+            dt_obj = None
+        timestamp = hour_data.get('EpochDateTime')
+        if timestamp is None and dt_obj is not None and dt_obj.tzinfo is not None:
+            timestamp = int(dt_obj.timestamp())
+        # Hours without a usable time cannot be shown
+        if timestamp is None:
+            continue
+        hours.append(hour_data)
+        times.append(timestamp)
+        utc_offset = dt_obj.utcoffset() if dt_obj is not None else None
+        utc_offsets.append(int(utc_offset.total_seconds()) if utc_offset is not None else 0)
+
+    temperatures = [hour_data.get('Temperature', {}) for hour_data in hours]
+    humidities = [hour_data.get('RelativeHumidity') for hour_data in hours]
+    # The wind is only sent with the forecast's details
+    wind_speeds = [hour_data.get('Wind', {}).get('Speed', {}).get('Value') for hour_data in hours]
+    meteorology = derive_meteorology([temperature.get('Value') for temperature in temperatures], humidities, units)
+
+    meta = ForecastMeta(
+        'aw',
+        units,
+        temperature_unit=temperatures[0].get('Unit', 'F') if temperatures else ('C' if units == 'metric' else 'F'),
+        utc_offset=utc_offsets[0] if utc_offsets else None,
+    )
+    return Forecast(
+        meta,
+        time=times,
+        utc_offset=utc_offsets,
+        temp=meteorology['temp'],
+        feels_like=[hour_data.get('RealFeelTemperature', {}).get('Value') for hour_data in hours],
+        humidity=meteorology['humidity'],
+        dew_point=meteorology['dew_point'],
+        wind_speed=wind_speeds,
+        visibility=None,
+        precipitation_probability=[optional_float(hour_data.get('PrecipitationProbability')) for hour_data in hours],
+        has_precipitation=[hour_data.get('HasPrecipitation') for hour_data in hours],
+        is_daylight=classify_aw_daylight(hours),
+        icon=[hour_data.get('WeatherIcon') for hour_data in hours],
+        description=[hour_data.get('IconPhrase') for hour_data in hours],
+    )
+
+
+def create_aw_weather_card(forecast, index, formatted_time_aw=None):
+    """
+    Creates a Dash html Div for a single hour's AccuWeather data.
+
+    Args:
+        forecast (Forecast): The AccuWeather forecast.
+        index (int): The position of the hour in the forecast.
+        formatted_time_aw (str): The time of the hour, if it was already formatted with "time_labels". Defaults to None.
+
+    Returns:
+        html.Div: A Dash html Div component.
+    """
+    # Format the time of the hour, as the local time of the location followed by its UTC offset
+    # "%B" - Full name of the month
+    # "%I" - Hour (12-hour clock) as a zero padded number
+    # "%p" - AM or PM
+    if formatted_time_aw is None:
+        formatted_time_aw = time_label(int(forecast.time[index]), CARD_TIME_FORMAT, int(forecast.utc_offset[index]), True)
+
+    # Call the "extract_aw_icon_id" function to determine the file path of the appropriate weather icon for the hour
+    is_daylight = optional_flag(forecast.is_daylight[index])
+    icon_path = extract_aw_icon_id(forecast.icon[index], is_daylight)
+    description = forecast.description[index] or 'Not Available'
+            
+    # Create the html.Div to represent the AccuWeather weather card
+    # The appearance of the card comes from the stylesheet ("assets/css/style.css"), so no styles are sent with it
+    return html.Div(
+        className='weather-card aw-card',
+        children=[
+            html.H3(f'Time: {formatted_time_aw}', className='aw-card-time'),
+            html.Img(src=icon_path, className='weather-card-icon'),
+            html.Div( # Group temperature-realted information - arranging verically
+                className='weather-card-group',
+                children=[
+                    html.P(
+                        f'Temperature: {format_value(forecast.temp[index])}°{forecast.meta.temperature_unit}',
+                        className='aw-card-temperature'
+                    )
+                ]
+            ),
+            html.P(f'Conditions: {description.title()}', className='aw-card-conditions'),
+            html.P(
+                f'Precipitation: {"Yes" if optional_flag(forecast.has_precipitation[index]) else "No"}',
+                className='aw-card-precipitation'
+            ),
+            html.P(
+                f'Precipitation Probability: {format_value(forecast.precipitation_probability[index])}%',
+                className='aw-card-precipitation-probability'
+            ),
+            html.P(f'Day Light: {"Yes" if is_daylight else "No"}', className='aw-card-daylight'),
+        ]
+    )
+
+
+def extract_aw_plotting_data(forecast):
+    """
+    Extracts time and temperature data from AccuWeather forecast data for plotting.
+
+    Args:
+        forecast (Forecast): The AccuWeather forecast.
+
+    Returns:
+        dict: A dictionary containing the times (local "datetime64" values), the corresponding temperatures (NumPy arrays), and the
+              title of the time axis (with the location's UTC offset).
+    """
+    # Ensure the forecast is not empty or None
+    if not forecast:
+        return {'times': np.array([], dtype='datetime64[s]'), 'temps': np.array([]), 'time_title': 'Time'}
+
+    return {
+        'times': time_axis(forecast),
+        'temps': forecast.temp,
+        # The times are local, so tell which UTC offset they are on
+        'time_title': f'Time (UTC{format_utc_offset(forecast.utc_offset[0])})',
+    }
+
+
+# The layout and style of the AccuWeather temperature graph, built once (only its x-axis title changes per forecast)
+AW_TEMPERATURE_SKELETON = scatter_skeleton('Temperature Over Time', 'Temperature (°F)', line_color='#2e38f3', marker_color='#fc0349')
+
+
+def create_aw_temperature_graph(plotting_data):
+    """
+    Creates a Dash graph component to show AccuWeather temperature data against time.
+
+    Args:
+        plotting_data (dict): A dictionary containing "times" and "temps".
+
+    Returns:
+        dcc.Graph: A Dash graph component displaying the temperature over time.
+    """
+    if plotting_data and len(plotting_data['times']) and len(plotting_data['temps']):
+        # Attach the arrays to the prebuilt graph (see "FigureSkeleton")
+        fig = AW_TEMPERATURE_SKELETON.figure(
+            plotting_data['times'],
+            [plotting_data['temps']],
+            x_title=plotting_data.get('time_title', 'Time'),
+        )
+        # The "figure=fig" argument passes the plotly figure created in the previous step to the "dcc.Graph" component
+        # The "dcc.Graph" is then returned, making the interactive graph avaialable to be displayed in the Dash app's user interface
+        return dcc.Graph(figure=fig)
+    
+    else:
+        return html.P('No temperature data available for graph!')
+
+
+def lookup_location_key(search_text):
+    """
+    Resolves a search to an AccuWeather location key, going through the geocoding cache first.
+
+    Args:
+        search_text (str): The "City, Country Code" to search for.
+
+    Returns:
+        str or None: The location key, or None if the location is unknown or the request failed.
+    """
+    query = normalize_query(search_text)
+    location_key = geocode_cache.get(('aw', query))
+    if location_key is not CACHE_MISS:
+        return location_key
+
+    locations_aw = get_location_key(search_text)
+    # Don't cache failed requests - only actual answers from AccuWeather
+    if locations_aw is None:
+        return None
+    # "locations_aw[0]['Key']" extracts the first location's key; an empty list means the location is unknown
+    location_key = locations_aw[0]['Key'] if locations_aw else None
+    geocode_cache.set(('aw', query), location_key, GEOCODE_TTL if location_key else GEOCODE_NEGATIVE_TTL)
+    return location_key
+
+
+def fetch_aw_forecast(search_text, units='imperial'):
+    """
+    Runs the AccuWeather chain: the location search, followed by the 12-hour hourly forecast.
+
+    Args:
+        search_text (str): The text entered in the search input box.
+        units (str): The unit system of the forecast. Defaults to "imperial".
+
+    Returns:
+        dict: A dictionary with the keys 'source', 'query', 'location' (the location key, or None),
+              'forecast' (the "Forecast", or None) and 'fetched_at' (the Unix time the forecast was fetched at).
+    """
+    # Call the "lookup_location_key" function to obtain the location key (from the cache, or from AccuWeather) based on the user's "search_text"
+    location_key = lookup_location_key(search_text)
+    if location_key:
+        # Call the "get_weather_forecast_aw" function to get the 12-hour hourly forecast data from AccuWeather, unless it is cached
+        forecast_aw, fetched_at = cached_forecast(*forecast_request('aw', location_key, units))
+    else:
+        # If the lookup fails, it sets "forecast_aw" to None
+        forecast_aw, fetched_at = None, None
+
+    return {'source': 'aw', 'query': search_text, 'location': location_key, 'forecast': forecast_aw, 'fetched_at': fetched_at}
+
+
+def aw_data_processing(search_text, fetched_aw=None, include_graphs=True):
+    """
+    Fetches and processes the weather data from AccuWeather.
+
+    Args:
+        search_text (str): The text entered in the search input box.
+        fetched_aw (dict): The result of "fetch_aw_forecast", if the data was already fetched. Defaults to None.
+        include_graphs (bool): Append the graphs after the weather cards. Defaults to True - without them, they are
+                               rendered on their own by "aw_graph_processing".
+
+    Returns:
+        list: A list of Dash HTML components to display the AccuWeather data.
+    """
+    # Only go upstream if the caller has not fetched the data already (e.g. through the concurrent fetch engine)
+    if fetched_aw is None:
+        fetched_aw = fetch_aw_forecast(search_text)
+    forecast_aw = fetched_aw['forecast']
+
+    # Initialize a Children list
+    # This list will store:
+    #   Dash HTML components that will be displayed in the app
+    #   These components will include weather cards and a temperature graph
+    children = []
+    
+    # Process and prepare the data for display
+    if forecast_aw:
+        # Limit the number of entries to the first 12
+        forecast_aw = forecast_aw.head(12)
+
+        # Tell the user how recent the data is (it may come from the cache)
+        as_of_label = create_as_of_label(fetched_aw.get('fetched_at'))
+        if as_of_label is not None:
+            children.append(as_of_label)
+                
+        # Format the times of all the hours at once
+        time_labels_aw = time_labels(forecast_aw, CARD_TIME_FORMAT, show_offset=True)
+
+        # For each hour, call the "create_aw_weather_card" to create a Dash 'html.Div' element (a weather card)
+        # That displays the weather information for that particular hour - unless an identical card was already rendered
+        weather_cards_aw = render_cards(create_aw_weather_card, forecast_aw, time_labels_aw)
+
+        # After processing all the hourly data, it creates a 'html.Div' to contain all the weather cards
+        # This 'html.Div' uses flexbox (the "weather-cards" class) to arrange the cards horizontally and wrap them if they exceed the container's width
+        children.append(
+            html.Div(
+                className='weather-cards',
+                children = weather_cards_aw[:12] # Adds the list of weather cards as children
+            )
+        )
+        # Create and append the temperaure graph
+        if include_graphs:
+            children.extend(aw_graph_components(forecast_aw))
+
+        # Finally, if the forecast data was successfully processed, the return the "children" list
+        # Which now contains the weather cards and the temperature graph
+        return children
+
+    # Handle if 'forecast_aw" is None
+    return [html.P('Sorry, could not retrieve weather data from AccuWeather!')]
+
+
+def aw_graph_components(forecast_aw):
+    """
+    Creates the graphs of the displayed AccuWeather hours.
+
+    Args:
+        forecast_aw (Forecast): The displayed hours of the AccuWeather forecast.
+
+    Returns:
+        list: The Dash graph components (the temperature graph).
+    """
+    # Call the "extract_aw_plotting_data" to prepare the forecast data for creating a temperature graph
+    plotting_data_aw = extract_aw_plotting_data(forecast_aw)
+    # Call the "create_aw_temperature_graph" to generate a Dash 'dcc.Graph' component that displays the temperature over time
+    return [create_aw_temperature_graph(plotting_data_aw)]
+
+
+def aw_graph_processing(search_text, fetched_aw):
+    """
+    Processes the AccuWeather data into its graphs alone, for the graphs rendered after the weather cards.
+
+    Args:
+        search_text (str): The text entered in the search input box.
+        fetched_aw (dict): The result of "fetch_aw_forecast".
+
+    Returns:
+        list: The Dash graph components - empty if there is no forecast (the weather cards explain why).
+    """
+    forecast_aw = fetched_aw['forecast']
+    if not forecast_aw:
+        return []
+    # The same hours as "aw_data_processing"
+    return aw_graph_components(forecast_aw.head(12))
+
+
+# CATEGORY VI - Data Fetching, Formatting, and Displaying OpenWeather Data
+
+
+def get_coordinates(city_name, api_key=API_OW, max_retries=3, retry_delay=RETRY_BASE_DELAY, deadline=RETRY_DEADLINE):
+    """
+    Fetches the latitude and longitude of a city.
+
+    Args:
+        city_name (str): The name of the city.
+        api_key: OpenWeather API key.
+        max_retries (int): The maximum number of times to try the API call in case of a failure. Defaults to three.
+        retry_delay (float): The base delay in seconds of the jittered backoff between retries.
+        deadline (float): The total time budget in seconds for the call, including retries.
+
+    Returns:
+        tuple or None: A tuple containing 'latitude, longitude' if found, an empty tuple if the city is unknown, or None if the request failed.
+        Returns the first result if multiple are found.
+    """
+    geocoding_url = 'http://api.openweathermap.org/geo/1.0/direct'
+    # This is a dictionary, which will be used as query parameters in the API request
+    params = {
+        'q': city_name,
+        'limit': 1, # Tell the API to return at most one result
+        'appid': api_key
+    }
+    latitude = None
+    longitude = None
+    try:
+        response = provider_request('ow', 'geocode', geocoding_url, params=params, max_retries=max_retries, retry_delay=retry_delay, deadline=deadline)
+        data = decode_json(response.content)
+        if data:
+            # If "data" is found, "data[0]" takes the first element of the list - which is a dictionary containing information about the location
+            # It then extracts the values associated with the keys "lat" and "lon", and returns them as a tuple
+            latitude = data[0]['lat']
+            longitude = data[0]['lon']
+            return latitude, longitude
+        else: # If the "data" list is empty
+            print(f'Sorry, could not find latitude and longitude for {city_name}!')
+            # An empty (but not None) result tells the caller that the city is unknown, rather than that the request failed
+            return ()
+
+    # Error handling for network errors, invalid URLs, exhausted retries, etc.
+    except requests.exceptions.RequestException as Re:
+        print(f'Error fetching the latitude and longitude!\nDetails: {Re}')
+        return None
+
+    # Handle any other general errors
+    except Exception as e:
+        print(f'An unexpected error occured!\nDetails: {e}')
+        return None
+
+
+# Number of 3-hour forecast entries requested from OpenWeather (at most 40) - only the first 9 (27 hours) are displayed
+OW_FORECAST_COUNT = env_int('SKYLITE_OW_FORECAST_COUNT', 9)
+
+
+def get_weather_forecast_ow(latitude, longitude, api_key=API_OW, exclude='minutely,hourly,alerts', units='imperial', count=OW_FORECAST_COUNT, max_retries=3, retry_delay=RETRY_BASE_DELAY, deadline=RETRY_DEADLINE):
+    """
+    Fetches the forecast data for the given latitude and longitude.
 
     Args:
         latitude (float): The latitude of the location.
@@ -827,664 +2983,1178 @@ def get_weather_forecast_ow(latitude, longitude, api_key=API_OW, exclude='minute
         units (str): The unit system to use for the forecast.
                      Possible values: 'standard' (Kelvin), 'metric' (Celsius), and 'imperial' (Fahrenheit).
                      Defaults to "imperial".
-        max_retries (int): The maximum number of times to retry the API call in case of a failure. Defaults to three.
-        retry_delay (int): The delay in seconds between retries. Defaults to two.
+        count (int): The number of 3-hour entries to request, from now on. Defaults to "OW_FORECAST_COUNT".
+        max_retries (int): The maximum number of times to try the API call in case of a failure. Defaults to three.
+        retry_delay (float): The base delay in seconds of the jittered backoff between retries.
+        deadline (float): The total time budget in seconds for the call, including retries.
+
+    Returns:
+        dict or None: If successful, returns the weather data in a JSON format, otherwise returns None.
+    """
+    forecast_url_ow = 'https://api.openweathermap.org/data/2.5/forecast'
+    params = {
+        'lat': latitude,
+        'lon': longitude,
+        'exclude': exclude,
+        'appid': api_key,
+        'units': units,
+        # Only ask for the entries that are displayed - the full 5 days are four times as much JSON to download and parse
+        'cnt': count
+    }
+    try:
+        response = provider_request('ow', 'forecast', forecast_url_ow, params=params, max_retries=max_retries, retry_delay=retry_delay, deadline=deadline)
+        forecast_data_ow = decode_json(response.content)
+        
+        return forecast_data_ow
+
+    # Error handling for network errors, invalid URLs, exhausted retries, etc.
+    except requests.exceptions.RequestException as Re:
+        print(f'Error fetching the weather data from OpenWeather!\nDetails: {Re}')
+        return None
+
+    # Handle any other general errors
+    except Exception as e:
+        print(f'An unexpected error occured!\nDetails: {e}')
+        return None
+
+
+# Constants of the Magnus formula used for the dew point (over water, for temperatures in Celsius)
+MAGNUS_A = 17.27
+MAGNUS_B = 237.7
+
+
+def derive_meteorology(temperatures, humidities, units='imperial'):
+    """
+    Computes the dew point of a whole forecast in one vectorized pass (Magnus formula).
+
+    The providers send their own "feels like" temperature, so the heat index and the wind chill are not derived.
+
+    Args:
+        temperatures (list): The air temperatures (°F for "imperial", °C for "metric"); None for missing values.
+        humidities (list): The relative humidities in percent (0 to 100); None for missing values.
+        units (str): The unit system of the values, and of the results. Defaults to "imperial".
+
+    Returns:
+        dict: A dictionary of NumPy float arrays with the keys 'temp', 'humidity' and 'dew_point'. Missing or
+              invalid values are NaN.
+    """
+    # "dtype=float" turns the missing values (None) into NaN, so they simply propagate through the formula
+    temp = np.asarray(temperatures, dtype=float)
+    humidity = np.asarray(humidities, dtype=float)
+
+    # The formula works in Celsius
+    temp_c = temp if units == 'metric' else (temp - 32) * 5 / 9
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # The humidity is a percentage, so it is scaled to a 0 to 1 fraction exactly once
+        # A humidity of 0% gives "log(0) = -inf", and is turned into NaN below
+        gamma = np.log(humidity / 100) + MAGNUS_A * temp_c / (MAGNUS_B + temp_c)
+        dew_point_c = MAGNUS_B * gamma / (MAGNUS_A - gamma)
+        dew_point_c[~np.isfinite(dew_point_c)] = np.nan
+
+    # Convert the result back to the unit system of the inputs
+    dew_point_out = dew_point_c if units == 'metric' else dew_point_c * 9 / 5 + 32
+
+    return {
+        'temp': temp,
+        'humidity': humidity,
+        'dew_point': dew_point_out,
+    }
+
+
+def derive_ow_meteorology(forecast_list, units='imperial'):
+    """
+    Collects the temperature and humidity of OpenWeather forecast entries, and derives the dew point from them.
+
+    Args:
+        forecast_list (list): The forecast entries ("forecast_ow['list']").
+        units (str): The unit system of the forecast. Defaults to "imperial".
+
+    Returns:
+        dict: The arrays returned by "derive_meteorology", one value per entry.
+    """
+    return derive_meteorology(
+        [forecast.get('main', {}).get('temp') for forecast in forecast_list],
+        [forecast.get('main', {}).get('humidity') for forecast in forecast_list],
+        units,
+    )
+
+
+def get_wind_speed(forecast):
+    """
+    Extracts the wind speed from the forecast data.
+
+    Args:
+        forecast (dict): A dictionary containing the forecast data.
+
+    Returns:
+        str or 'Not Available': The wind speed or 'Not Available' if not found.
+    """
+    # First check if "wind" exists directly in the "forecast" dictionary
+    if 'wind' in forecast:
+        # If it does, use ".get(...)" to retrieve the value associated with the key "speed" within the "wind" sub-dictionary
+        # If the "speed" key is found, it returns its value (wind speed)
+        # Otherwise, it returns a default value - "Not Available"
+        return forecast['wind'].get('speed', 'Not Available')
+
+    # If the "wind" key is not found directly, check if the "weather" key exists in the "forecast" dictionary
+    # "len(forecast['weather']) > 0" - check that the "weather" list has at least one element
+    # Now check if "wind" exists within the first element of the "weather" list (forecast['weather'][0])
+    elif 'weather' in forecast and len(forecast['weather']) > 0 and 'wind' in forecast['weather'][0]:
+        # If found, retrieve the wind speed using ".get(...)", otherwise return the default value - "Not Available"
+        return forecast['wind'][0].get('speed', 'Not Available')
+
+    # If nothing is found, return "Not Available"
+    else:
+        return 'Not Available'
+
+
+def get_visibility(forecast):
+    """
+    Extracts the visibility from the forecast data.
+
+    Args:
+        forecast (dict): A dictionary containing the forecast data.
+
+    Returns:
+        str or 'Not Available': The visibility or 'Not Available' if not found.
+    """
+    if 'visibility' in forecast:
+        return forecast['visibility']
+    
+    elif 'weather' in forecast and len(forecast['weather']) > 0 and 'visibility' in forecast['weather'][0]:
+        return forecast['weather'][0].get('visibility', 'Not Available')
+    
+    else:
+        return 'Not Available'
+
+
+def classify_ow_daylight(forecast_list, forecast_ow):
+    """
+    Tells which OpenWeather forecast entries fall between sunrise and sunset, for the whole response at once.
+
+    Args:
+        forecast_list (list): The forecast entries to classify.
+        forecast_ow (dict): The entire forecast data from OpenWeather, containing the city's coordinates, sunrise and sunset.
+
+    Returns:
+        list: A list holding, for each entry, True (day), False (night) or None (unknown).
+    """
+    city_data = (forecast_ow or {}).get('city', {})
+    coord_data = city_data.get('coord', {})
+    # "dt" is the Unix time of each forecast entry - no time strings need to be parsed
+    return classify_daylight(
+        [forecast.get('dt') for forecast in forecast_list],
+        coord_data.get('lat'),
+        coord_data.get('lon'),
+        city_data.get('sunrise'),
+        city_data.get('sunset'),
+    )
+
+
+def override_ow_icon_code(icon_code, is_daylight):
+    """
+    Override the original icon code provided by OpenWeather if it is incorrect.
+
+    Args:
+        icon_code (str): The original OpenWeather icon code.
+        is_daylight (bool): Whether the forecast time is during the day (see "classify_ow_daylight"), or None if unknown.
+
+    Returns:
+        str: The overriddden icon path, or the original icon path if no override is required.
+    """
+    if not icon_code or is_daylight is None:
+        # If the time of day is unknown, return the original icon code
+        return icon_code
+
+    # If it is daytime, and the "icon_code" ends with "n" (which indicates night), replace the "n" with "d", effectively overriding the icon to a day icon
+    if is_daylight and icon_code.endswith('n'):
+        icon_code = icon_code[:-1] + 'd'
+    elif not is_daylight and icon_code.endswith('d'):
+        icon_code = icon_code[:-1] + 'n'
+
+    # Return the potentially overridden "icon_code"        
+    return icon_code
+
+
+# Dictionary to associate weather descriptions with the corresponding image file paths - for OpenWeather
+ow_icon_map = {
+    '01d': '/assets/OpenWeatherIcons/ClearSkyDay_(01d).png',
+    '01n': '/assets/OpenWeatherIcons/ClearSkyNight_(01n).png',
+    '02d': '/assets/OpenWeatherIcons/FewCloudsDay_(02d).png',
+    '02n': '/assets/OpenWeatherIcons/FewCloudsNight_(02n).png',
+    '03d': '/assets/OpenWeatherIcons/ScatteredCloudsDay_(03d).png',
+    '03n': '/assets/OpenWeatherIcons/ScatteredCloudsNight_(03n).png',
+    '04d': '/assets/OpenWeatherIcons/BrokenCloudsDay_(04d).png',
+    '04n': '/assets/OpenWeatherIcons/BrokenCloudsNight_(04n).png',
+    '09d': '/assets/OpenWeatherIcons/ShowerRainDay_(09d).png',
+    '09n': '/assets/OpenWeatherIcons/ShowerRainNight_(09n).png',
+    '10d': '/assets/OpenWeatherIcons/RainDay_(10d).png',
+    '10n': '/assets/OpenWeatherIcons/RainNight_(10n).png',
+    '11d': '/assets/OpenWeatherIcons/ThunderstormDay_(11d).png',
+    '11n': '/assets/OpenWeatherIcons/ThunderstormNight_(11n).png',
+    '13d': '/assets/OpenWeatherIcons/SnowDay_(13d).png',
+    '13n': '/assets/OpenWeatherIcons/SnowNight_(13n).png',
+    '50d': '/assets/OpenWeatherIcons/MistDay_(50d).png',
+    '50n': '/assets/OpenWeatherIcons/MistNight_(50n).png',
+}
+
+
+def extract_ow_icon_code(icon_code, is_daylight=None):
+    """
+    Extarcts the icon code path from a single weather forecast entry, from OpenWeather data.
+
+    Args:
+        icon_code (str): OpenWeather's icon code (e.g., "01d"), or an empty string if it is missing.
+        is_daylight (bool): Whether the forecast time is during the day, or None if unknown. Defaults to None.
+
+    Returns:
+        str: The path to the appropriate icon, or a default path if not found or an error occurs.
+    """
+    # Call the "override_ow_icon_code" function to correct the potential inaccuracies in the icon codes
+    overridden_icon_code = override_ow_icon_code(icon_code, is_daylight)
+
+    # Map the potentially overridden icon code to a path, or to the default path if it is unknown
+    return ow_icon_map.get(overridden_icon_code, '/assets/OpenWeatherIcons/DefaultImageOW.png')
+
+
+def parse_ow_forecast(forecast_ow, units='imperial'):
+    """
+    Parses OpenWeather's 5 day / 3 hour forecast into a "Forecast".
+
+    Args:
+        forecast_ow (dict): The forecast data from OpenWeather, or None.
+        units (str): The unit system of the forecast. Defaults to "imperial".
+
+    Returns:
+        Forecast or None: The parsed forecast, or None if there is no data.
+    """
+    if forecast_ow is None:
+        return None
+
+    # Entries without a time cannot be shown
+    forecast_list = [forecast for forecast in forecast_ow.get('list', []) if forecast.get('dt') is not None]
+    city_data = forecast_ow.get('city', {})
+    coord_data = city_data.get('coord', {})
+    mains = [forecast.get('main', {}) for forecast in forecast_list]
+    # "weather" is a list holding one description of the conditions
+    conditions = [(forecast.get('weather') or [{}])[0] for forecast in forecast_list]
+    meteorology = derive_ow_meteorology(forecast_list, units)
+
+    meta = ForecastMeta(
+        'ow',
+        units,
+        temperature_unit='C' if units == 'metric' else 'F',
+        latitude=coord_data.get('lat'),
+        longitude=coord_data.get('lon'),
+        utc_offset=city_data.get('timezone'),
+        sunrise=city_data.get('sunrise'),
+        sunset=city_data.get('sunset'),
+        city_name=city_data.get('name'),
+    )
+    return Forecast(
+        meta,
+        # OpenWeather's times ("dt", "dt_txt") are in UTC
+        time=[forecast['dt'] for forecast in forecast_list],
+        utc_offset=None,
+        temp=meteorology['temp'],
+        feels_like=[main.get('feels_like') for main in mains],
+        temp_min=[main.get('temp_min') for main in mains],
+        temp_max=[main.get('temp_max') for main in mains],
+        humidity=meteorology['humidity'],
+        dew_point=meteorology['dew_point'],
+        wind_speed=[optional_float(get_wind_speed(forecast)) for forecast in forecast_list],
+        visibility=[optional_float(get_visibility(forecast)) for forecast in forecast_list],
+        # "pop" is the probability of precipitation, between 0 and 1
+        precipitation_probability=np.asarray([forecast.get('pop') for forecast in forecast_list], dtype=float) * 100,
+        has_precipitation=[('rain' in forecast or 'snow' in forecast) for forecast in forecast_list],
+        is_daylight=classify_ow_daylight(forecast_list, forecast_ow),
+        icon=[condition.get('icon') for condition in conditions],
+        description=[condition.get('description') for condition in conditions],
+    )
+
+
+def create_ow_weather_card(forecast, index, formatted_time_ow=None):
+    """
+    Creates a Dash html Div for a single forecast from OpenWeather.
+
+    Args:
+        forecast (Forecast): The OpenWeather forecast.
+        index (int): The position of the forecast time in the forecast.
+        formatted_time_ow (str): The forecast time, if it was already formatted with "time_labels". Defaults to None.
+
+    Returns:
+        html.Div: A Dash html Div component.
+    """
+    # Format the forecast time (in UTC, like OpenWeather's "dt_txt")
+    if formatted_time_ow is None:
+        formatted_time_ow = time_label(int(forecast.time[index]), CARD_TIME_FORMAT, int(forecast.utc_offset[index]))
+
+    # Extract the weather informations
+    description = forecast.description[index] or 'Not Available'
+    unit = forecast.meta.temperature_unit
+    temp = format_value(forecast.temp[index])
+    feels_like = format_value(forecast.feels_like[index])
+    min_temp = format_value(forecast.temp_min[index])
+    max_temp = format_value(forecast.temp_max[index])
+    humidity = format_value(forecast.humidity[index])
+    # The dew point is derived for the whole forecast when it is parsed (see "derive_meteorology")
+    dew_point_value = forecast.dew_point[index]
+    wind_speed = format_value(forecast.wind_speed[index])
+    visibility = format_value(forecast.visibility[index])
+
+    # Call the "extract_ow_icon_code" function to determine the file path for the appropriate weather icon based on the forecast data
+    icon_path = extract_ow_icon_code(forecast.icon[index], optional_flag(forecast.is_daylight[index]))
+                    
+    # Create and return the OpenWeather weather card as a html.Div component
+    # The appearance of the card comes from the stylesheet ("assets/css/style.css"), so no styles are sent with it
+    return html.Div( # Create the single weather card
+        className='weather-card ow-card',
+        children=[
+            html.H4(f'Time: {formatted_time_ow}', className='ow-card-time'),
+            html.Img(src=icon_path, className='weather-card-icon'),
+            html.P(f'Conditions: {description.title()}', className='ow-card-conditions'),
+            html.Div( # Group the temperature related data - arranging verticaly
+                className='weather-card-group',
+                children=[
+                    html.P(f'Temperature: {temp}°{unit}', className='ow-card-temperature'),
+                    html.P(f'Feels Like: {feels_like}°{unit}', className='ow-card-temperature-detail'),
+                    html.P(f'Min Temperature: {min_temp}°{unit}', className='ow-card-temperature-detail'),
+                    html.P(f'Max Temperature: {max_temp}°{unit}', className='ow-card-temperature-detail'),
+                ]
+            ),
+            html.P(f'Humidity: {humidity}%', className='ow-card-humidity'),
+            html.P(
+                f'Dew Point: {dew_point_value:.2f}°{unit}' if not math.isnan(dew_point_value) else 'Dew Point: Not Available',
+                className='ow-card-dew-point'
+            ),
+            html.Div( # Group the wind related data - arranging verically
+                className='weather-card-group',
+                children=[
+                    html.P(f'Wind Speed: {wind_speed} m/s', className='ow-card-wind'),
+                    html.P(f'Visibility: {visibility} metres', className='ow-card-visibility'),
+                ]
+            ),
+        ]
+    )
+
+
+def extract_ow_plotting_data(forecast):
+    """
+    Extracts time, temperaure, humidity, and wind speed from OpenWeather forecast data for plotting.
+
+    Args:
+        forecast (Forecast): The OpenWeather forecast.
+
+    Returns:
+        dict: A dictionary of NumPy arrays: the times ("datetime64" values) and corresponding temperatures, humidity, and wind speeds.
+    """
+    if not forecast: # Ensure the forecast is not empty or None
+        empty = np.array([])
+        return {'times': np.array([], dtype='datetime64[s]'), 'temp': empty, 'humidity': empty, 'wind_speed': empty, 'dew_points': empty}
+
+    return {
+        # The times (in UTC) as "datetime64" values, which Plotly shows on a date axis
+        'times': time_axis(forecast),
+        'temp': forecast.temp,
+        'humidity': forecast.humidity,
+        'wind_speed': forecast.wind_speed,
+        'dew_points': forecast.dew_point,
+    }
+
+
+# How the OpenWeather graphs are displayed:
+#   'separate' - a graph per series (temperature, humidity, dew point and wind speed)
+#   'combined' - a single graph, with a panel per series sharing the time axis
+GRAPH_MODE = os.getenv('SKYLITE_GRAPH_MODE', 'separate').strip().lower()
+if GRAPH_MODE not in ('separate', 'combined'):
+    print(f'Warning: Unknown graph mode {GRAPH_MODE!r}. Using "separate".')
+    GRAPH_MODE = 'separate'
+
+# The OpenWeather graphs, in display order: the title, the title of the y-axis, and the colour of each series
+OW_GRAPH_SERIES = {
+    'temp': ('Temperature Over Time', 'Temperature (°F)', '#e84118'),
+    'humidity': ('Humidity Over Time', 'Humidity (%)', '#00a8ff'),
+    'dew_points': ('Dew Point Over Time', ' Dew Point (°F)', '#f5cb11'),
+    'wind_speed': ('Wind Speed Over Time', 'Wind Speed (m/s)', '#4cd137'),
+}
+
+# The layout and style of each OpenWeather graph, and of the combined one, built once
+OW_GRAPH_SKELETONS = {
+    data_type: scatter_skeleton(title, y_title, color, color)
+    for data_type, (title, y_title, color) in OW_GRAPH_SERIES.items()
+}
+OW_PANELS_SKELETON = panels_skeleton(list(OW_GRAPH_SERIES.values()))
+
+
+def create_ow_graph(plotting_data, data_type):
+    """
+    Creates a Dash graph component to show OpenWeather temperature data against time.
+
+    Args:
+        plotting_data (dict): A dictionary containing "times", "temps", "humidity", and "wind_speed".
+        data_type (str): The type of data to plot.
+
+    Returns:
+       dcc.Graph: A Dash graph component.
+    """
+    # Handle missing data
+    # "plotting_data.get(data_type)" is used to safely check for the presence of the data associated with the requested "data_type"
+    # Here, "data_type" is a variable that will hold strings like 'temp', 'humidity', and 'wind_speed'
+    if not (plotting_data and len(plotting_data['times']) and len(plotting_data['temp']) and len(plotting_data.get(data_type, ()))):
+        return html.P(f'No data available for {data_type} graph.')
+
+    # Extract the y-axis data
+    # The "data_type" argument is used to access the corresponding list of values from the "plotting_data" dictionary
+    y_data = plotting_data[data_type]
+    # Select the prebuilt graph based on the "data_type" (unknown types get a default one)
+    skeleton = OW_GRAPH_SKELETONS.get(data_type)
+    if skeleton is None:
+        skeleton = scatter_skeleton('Over Time', '', '#30336b', '#30336b')
+
+    # Attach the arrays to the prebuilt graph (see "FigureSkeleton")
+    fig = skeleton.figure(plotting_data['times'], [y_data])
+    # Return the Dash graph component
+    return dcc.Graph(figure=fig)
+
+
+def create_ow_graphs(plotting_data):
+    """
+    Creates the Dash graph components showing the OpenWeather data, according to "SKYLITE_GRAPH_MODE".
+
+    Args:
+        plotting_data (dict): The data returned by "extract_ow_plotting_data".
+
+    Returns:
+        list: The Dash components - a graph per series, or a single graph with a panel per series.
+    """
+    if GRAPH_MODE != 'combined':
+        return [create_ow_graph(plotting_data, data_type) for data_type in OW_GRAPH_SERIES]
+
+    # Handle missing data
+    if not (plotting_data and len(plotting_data['times']) and len(plotting_data['temp'])):
+        return [html.P('No data available for the graphs.')]
+    # Leave out the series without data, as the separate graphs do (which needs a graph of its own)
+    data_types = [data_type for data_type in OW_GRAPH_SERIES if len(plotting_data.get(data_type, ()))]
+    if len(data_types) == len(OW_GRAPH_SERIES):
+        skeleton = OW_PANELS_SKELETON
+    else:
+        skeleton = panels_skeleton([OW_GRAPH_SERIES[data_type] for data_type in data_types])
+    fig = skeleton.figure(plotting_data['times'], [plotting_data[data_type] for data_type in data_types])
+    return [dcc.Graph(figure=fig)]
+
+
+def lookup_coordinates(search_text):
+    """
+    Resolves a search to its latitude and longitude, going through the geocoding cache first.
+
+    Args:
+        search_text (str): The "City, Country Code" to search for.
 
     Returns:
-        dict or None: If successful, returns the weather data in a JSON format, otherwise returns None.
+        tuple or None: A tuple containing 'latitude, longitude', an empty tuple if the city is unknown, or None if the request failed.
     """
-    forecast_url_ow = 'https://api.openweathermap.org/data/2.5/forecast'
-    params = {
-        'lat': latitude,
-        'lon': longitude,
-        'exclude': exclude,
-        'appid': api_key,
-        'units': units
-    }
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(forecast_url_ow, params=params)
-            response.raise_for_status()
-            forecast_data_ow = response.json()
-            
-            return forecast_data_ow
-
-        # Error handling for network errors, invalid URLs, etc.
-        except requests.exceptions.RequestException as Re:
-            print(f'Error fetching the weather data from OpenWeather!\nDetails: {Re}')
-            if response is not None and response.status_code == 503:
-                print(f'Received 503 error!\nRetrying in {retry_delay} seconds...')
-                time.sleep(retry_delay)
-                retry_delay *= 2 # Exponential backoff
-            else:
-                return None
+    query = normalize_query(search_text)
+    coordinates = geocode_cache.get(('ow', query))
+    if coordinates is not CACHE_MISS:
+        # JSON has no tuples - unknown cities are cached as None
+        return tuple(coordinates) if coordinates is not None else ()
+
+    coordinates = get_coordinates(search_text)
+    # Don't cache failed requests - only actual answers from OpenWeather
+    if coordinates is not None:
+        if coordinates:
+            geocode_cache.set(('ow', query), list(coordinates), GEOCODE_TTL)
+        else:
+            geocode_cache.set(('ow', query), None, GEOCODE_NEGATIVE_TTL)
+    return coordinates
 
-        # Handle any other general errors
-        except Exception as e:
-            print(f'An unexpected error occured!\nDetails: {e}')
-            return None
 
-    print(f'Max retries ({max_retries}) exceeded!\nUnable to fetch weather data from OpenWeather.')
-    return None
+def fetch_ow_forecast(search_text, units='imperial'):
+    """
+    Runs the OpenWeather chain: the geocoding request, followed by the 5 day / 3 hour forecast.
+
+    Args:
+        search_text (str): The text entered in the search input box.
+        units (str): The unit system of the forecast. Defaults to "imperial".
+
+    Returns:
+        dict: A dictionary with the keys 'source', 'query', 'location' (the coordinates tuple, or None),
+              'forecast' (the "Forecast", or None) and 'fetched_at' (the Unix time the forecast was fetched at).
+    """
+    # Call the "lookup_coordinates" function to get the latitude and longitude of the location (from the cache, or from OpenWeather) as specified by the "search_text"
+    coordinates_ow = lookup_coordinates(search_text)
+    
+    # If "lookup_coordinates" function is successful it returns a non-empty tuple
+    if coordinates_ow:
+        # Call the "get_weather_forecast_ow" function to get the forecast data from the obtained coordinates, unless it is cached
+        forecast_ow, fetched_at = cached_forecast(*forecast_request('ow', coordinates_ow, units))
+    # If the city is unknown or the lookup failed, set "forecast_ow" to "None"
+    else:
+        forecast_ow, fetched_at = None, None
+
+    return {'source': 'ow', 'query': search_text, 'location': coordinates_ow, 'forecast': forecast_ow, 'fetched_at': fetched_at}
 
 
-def dew_point(forecast_data_ow):
+def ow_data_processing(search_text, fetched_ow=None, include_graphs=True):
     """
-    Calculate dew point from humidity as obtained by OpenWeather.
+    Fetches and processes the weather data from OpenWeather.
 
     Args:
-        forecast_data_ow (dict): A dictionary containing the weather forecast data from OpenWeather.
+        search_text (str): The text entered in the search input box.
+        fetched_ow (dict): The result of "fetch_ow_forecast", if the data was already fetched. Defaults to None.
+        include_graphs (bool): Append the graphs after the weather cards. Defaults to True - without them, they are
+                               rendered on their own by "ow_graph_processing".
 
     Returns:
-        float or None: The calculated dew point in Fahrenheit, or None if encounters an error.
+        list: A list of Dash HTML components to display the OpenWeather data.
     """
-    # Initialize the temperature_celsius
-    temperature_celsius = None
+    # Fetch weather data from OpenWeather, unless the caller has already done so
+    if fetched_ow is None:
+        fetched_ow = fetch_ow_forecast(search_text)
+    coordinates_ow = fetched_ow['location']
+    forecast_ow = fetched_ow['forecast']
+
+    # Intitialize an empty list
+    # This list will store the Dash HTML components that will be created to display the weather information
+    children = []
     
-    # Fetch the humidity data
-    humidity = forecast_data_ow.get('humidity')
+    # Display the data obtained from OpenWeather
+    if forecast_ow:
+
+        # Process the forecast data for display
+        forecast_ow = forecast_ow.head(9) # Limit the number of entries to the first 27 hours (in 3 hour intervals)
+
+        # Tell the user how recent the data is (it may come from the cache)
+        as_of_label = create_as_of_label(fetched_ow.get('fetched_at'))
+        if as_of_label is not None:
+            children.append(as_of_label)
+
+        # Format the times of all the entries at once
+        time_labels_ow = time_labels(forecast_ow, CARD_TIME_FORMAT)
+
+        # Call the "create_ow_weather_card" for each entry to format the data for a single forecast into a displayable card (an "html.Div" element)
+        # Day and night, and the dew points, were worked out for the whole forecast when it was parsed
+        # Entries identical to ones already rendered reuse their card
+        weather_cards_ow = render_cards(create_ow_weather_card, forecast_ow, time_labels_ow)
+
+        # Create the flex container with the desired number of cards
+        # Append this container "html.Div" to the "children" list, to display the cards in the app's layout
+        children.append(
+            html.Div(
+                className='weather-cards', # Arranges the cards horizontally and wraps them to the next line if necessary
+                # Set the "children" attribute of this container "html.Div" to the "weather_cards_ow" list
+                # Which facilitates adding all the created weather cards to the container
+                children = weather_cards_ow[:9]
+            )
+        )
+        # Create and append the graphs
+        if include_graphs:
+            children.extend(ow_graph_components(forecast_ow))
+        return children
     
-    # Fetch the temperature data
-    temperature_fahrenheit = forecast_data_ow.get('temp')
+    elif not coordinates_ow:
+        children.append(html.P(f'Could not retrieve coordinates for {search_text} from OpenWeather.\nPlease check your input!'))
+    else:
+        children.append(html.P('Sorry, could not retrieve weather data from OpenWeather!'))
 
-    if temperature_fahrenheit is None or humidity is None:
-        return None
+    return children
 
-    # Convert Fahrenheit to Celsius
-    temperature_celsius = (temperature_fahrenheit - 32) * 5 / 9
 
-    # Covert humidity to relative humidity
-    relative_humidity = humidity / 100
+def ow_graph_components(forecast_ow):
+    """
+    Creates the graphs of the displayed OpenWeather forecast times.
 
-    # Set the constants
-    a = 17.27
-    b = 237.7
+    Args:
+        forecast_ow (Forecast): The displayed forecast times of the OpenWeather forecast.
 
-    # Calculate the dew point
-    try:
-        numerator = (b * math.log(relative_humidity / 100) + a * temperature_celsius)
-        denominator = (a - math.log(relative_humidity / 100) - a * temperature_celsius / (b + temperature_celsius))
-        dew_point_celsius = numerator / denominator
-        return dew_point_celsius * 9 / 5 + 32
-        
-    # Handle potential math errors
-    except (ValueError, ZeroDivisionError) as e:
-        print(f'Encountered an error!\nDetails: {e}')
-        return None
+    Returns:
+        list: The Dash graph components (separate, or combined into one - see "SKYLITE_GRAPH_MODE").
+    """
+    # Call the "extract_ow_plotting_data" to extract the data required for plotting
+    plotting_data_ow = extract_ow_plotting_data(forecast_ow)
+    # Call "create_ow_graphs" to create the desired graphs
+    return create_ow_graphs(plotting_data_ow)
 
 
-def get_wind_speed(forecast):
+def ow_graph_processing(search_text, fetched_ow):
     """
-    Extracts the wind speed from the forecast data.
+    Processes the OpenWeather data into its graphs alone, for the graphs rendered after the weather cards.
 
     Args:
-        forecast (dict): A dictionary containing the forecast data.
+        search_text (str): The text entered in the search input box.
+        fetched_ow (dict): The result of "fetch_ow_forecast".
 
     Returns:
-        str or 'Not Available': The wind speed or 'Not Available' if not found.
+        list: The Dash graph components - empty if there is no forecast (the weather cards explain why).
     """
-    # First check if "wind" exists directly in the "forecast" dictionary
-    if 'wind' in forecast:
-        # If it does, use ".get(...)" to retrieve the value associated with the key "speed" within the "wind" sub-dictionary
-        # If the "speed" key is found, it returns its value (wind speed)
-        # Otherwise, it returns a default value - "Not Available"
-        return forecast['wind'].get('speed', 'Not Available')
+    forecast_ow = fetched_ow['forecast']
+    if not forecast_ow:
+        return []
+    # The same forecast times as "ow_data_processing"
+    return ow_graph_components(forecast_ow.head(9))
 
-    # If the "wind" key is not found directly, check if the "weather" key exists in the "forecast" dictionary
-    # "len(forecast['weather']) > 0" - check that the "weather" list has at least one element
-    # Now check if "wind" exists within the first element of the "weather" list (forecast['weather'][0])
-    elif 'weather' in forecast and len(forecast['weather']) > 0 and 'wind' in forecast['weather'][0]:
-        # If found, retrieve the wind speed using ".get(...)", otherwise return the default value - "Not Available"
-        return forecast['wind'][0].get('speed', 'Not Available')
 
-    # If nothing is found, return "Not Available"
-    else:
-        return 'Not Available'
+# CATEGORY VII - Concurrent Forecast Fetch Engine
 
 
-def get_visibility(forecast):
+# Number of threads that run the blocking provider requests for the fetch engine
+FETCH_WORKERS = env_int('SKYLITE_FETCH_WORKERS', 8)
+# Set to 1 to fetch every provider on each search and keep their forecasts in the browser ("forecast-store"),
+# so that switching the weather source redraws the search without calling the providers again
+# Off by default, since it spends an AccuWeather call (50 a day on the free plan) on every OpenWeather search
+FETCH_ALL_SOURCES = env_int('SKYLITE_FETCH_ALL_SOURCES', 0) == 1
+
+# The geocode + forecast chain of every weather provider
+PROVIDER_CHAINS = {
+    'aw': fetch_aw_forecast,
+    'ow': fetch_ow_forecast,
+}
+
+# Thread pool shared by every event loop of the fetch engine (see "get_fetch_executor")
+# The requests themselves are blocking, so each chain runs on one of these threads while the event loop awaits them
+fetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='skylite-fetch')
+fetch_executor_pid = os.getpid()
+fetch_executor_lock = threading.Lock()
+
+
+def get_fetch_executor():
     """
-    Extracts the visibility from the forecast data.
+    Returns the thread pool of the fetch engine.
 
-    Args:
-        forecast (dict): A dictionary containing the forecast data.
+    Threads don't survive a fork (e.g. a background search job, see "create_background_manager"): a forked process
+    gets a new pool, instead of queueing work on threads that only exist in its parent.
 
     Returns:
-        str or 'Not Available': The visibility or 'Not Available' if not found.
+        concurrent.futures.ThreadPoolExecutor: The thread pool of this process.
     """
-    if 'visibility' in forecast:
-        return forecast['visibility']
-    
-    elif 'weather' in forecast and len(forecast['weather']) > 0 and 'visibility' in forecast['weather'][0]:
-        return forecast['weather'][0].get('visibility', 'Not Available')
-    
-    else:
-        return 'Not Available'
+    global fetch_executor, fetch_executor_pid
+    with fetch_executor_lock:
+        if fetch_executor_pid != os.getpid():
+            fetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='skylite-fetch')
+            fetch_executor_pid = os.getpid()
+        return fetch_executor
 
 
-def extract_ow_sunrise_sunset_location(forecast_ow):
+def encode_fetched(fetched):
     """
-    Extracts the sunrise time, sunset time, and location (latitude, longitude) from OpenWeather for correct weather icon selection.
+    Turns the result of a provider's chain into JSON-serializable data.
 
     Args:
-        forecast_ow (dict): A dictionary containing the forecast data from openWeather.
+        fetched (dict): The result of the provider's chain.
 
     Returns:
-        A tuple containg:
-            str: Formatted sunrise time, or None if not found.
-            str: Formatted sunset time, or None if not found.
-            float: Latitude, or None if not found.
-            float: Longitude, or None if not found.
+        dict: The same result, with the forecast as a dictionary (see "Forecast.to_dict").
     """
-    # Initialize the variables
-    formatted_sunrise = None
-    formatted_sunset = None
-    latitude = None
-    longitude = None
-    
-    if forecast_ow and 'city' in forecast_ow:
-        city_data = forecast_ow.get('city', {})
-        sunrise_timestamp = city_data.get('sunrise', None)
-        sunset_timestamp = city_data.get('sunset', None)
-        coord_data = city_data.get('coord', {})
-
-        if coord_data:
-            latitude = coord_data.get('lat', None)
-            longitude = coord_data.get('lon', None)
-
-            # 1. Finding the timezone
-            # Create an instance of the "TimezoneFinder" class
-            tf = TimezoneFinder()
-            # Call the "timezone_at()" method of the "TimezoneFinder" object
-            # It returns a string representing the timezone name (e.g., America/New_York)
-            # If no timezone is found for the given coordinates, it will return "None"
-            timezone_str = tf.timezone_at(lng=longitude, lat=latitude)
-
-            # 2. Using the timezone
-            # Check if the timezone string is retrieved successfully
-            if timezone_str:
-                # "local_tz = pytz.timezone(...)" - If a timezone string is found, use the "pytz" library to create a timezone object based on the retrieved string
-                # "local_tz" object represents the specific timezone of the location
-                local_tz = pytz.timezone(timezone_str)
-
-                # 3. Processing sunrise time
-                # Check if a "sunrise_timestamp" was obtained from the OpenWeather data
-                if sunrise_timestamp is not None:
-                    try:
-                        # "datetime.datetime.fromtimestamp(sunrise_timestamp)" - Convert the Unix timestamp into a "datetime" object
-                        # "tz=pytz.utc" - Explicitly tell Python that the initial "datetime" object represents a time in UTC (Coordinated Universal Time)
-                        utc_sunrise_time = datetime.datetime.fromtimestamp(sunrise_timestamp, tz=pytz.utc)
-                        # Timezone conversion:
-                        #   The ".astimezone(local_tz)" method takes the UTC "datetime" object
-                        #   Converts it to the time in the "local_tz" which has been determined earlier using "TimezoneFinder"
-                        local_sunrise_time = utc_sunrise_time.astimezone(local_tz)
-                        # Format the local sunrise time into a string with the format "HH:MM AM/PM"
-                        formatted_sunrise = local_sunrise_time.strftime('%I:%M %p')
-                        
-                    except (TypeError, ValueError) as e:
-                        print(f'An error occured while processing "sunrise_time".\nDetails: {e}')
-
-                # 4. Processing sunrise time
-                if sunset_timestamp is not None:
-                    try:
-                        utc_sunset_time = datetime.datetime.fromtimestamp(sunset_timestamp, tz=pytz.utc)
-                        local_sunset_time = utc_sunset_time.astimezone(local_tz)
-                        formatted_sunset = local_sunset_time.strftime('%I:%M %p')
-                    except (TypeError, ValueError) as e:
-                        print(f'n error occured while processing "sunset_time".\nDetails: {e}')
-            else:
-                print('Could not determine timezone from coordinates.')
-        else:
-            print('Coordinates data (latitude and longitude) not found.')
-    else:
-        print('"city_data" not found in "forecast_ow"!')
+    forecast = fetched['forecast']
+    return dict(fetched, forecast=forecast.to_dict() if forecast is not None else None)
+
 
-    return formatted_sunrise, formatted_sunset, latitude, longitude
+def decode_fetched(data):
+    """
+    Turns the data written by "encode_fetched" back into the result of a provider's chain.
 
+    Args:
+        data (dict): The encoded result.
 
-def override_ow_icon_code(forecast, icon_code, forecast_ow):
+    Returns:
+        dict: The result of the provider's chain.
     """
-    Override the original icon code provided by OpenWeather if it is incorrect.
+    forecast = data['forecast']
+    return dict(data, forecast=Forecast.from_dict(forecast) if forecast is not None else None)
+
+
+def coalesced_fetch(source, search_text, units='imperial'):
+    """
+    Runs a provider's chain, sharing one upstream call between identical concurrent searches.
 
     Args:
-        forecast (dict): A dictionary containg the forecast data for a single time. 
-        icon_code (str): The original OpenWeather icon code.
-        forecast_ow (dict): The entire forecast data from OpenWeather, containing the sunrise and the sunset timestamps.
+        source (str): The weather provider ('aw' or 'ow').
+        search_text (str): The "City, Country Code" to search for.
+        units (str): The unit system of the forecast. Defaults to "imperial".
 
     Returns:
-        str: The overriddden icon path, or the original icon path if no override is required.
+        dict: The result of the provider's chain.
     """
-    # Fetch the forecast time from the "forecast" dictionary using the key 'dt_txt'. If not found, default to "Not Avaialble"
-    time_str = forecast.get('dt_txt', 'Not Avaialble')
-    if not time_str:
-        print('Time string is not available. Cannot override icon codes!')
-        # If "time_str" is not available, return the original icon code
-        return icon_code
+    key = (source, normalize_query(search_text), units)
+    # Only successful results are worth handing to other worker processes
+    return search_flight.do(key, lambda: PROVIDER_CHAINS[source](search_text, units),
+                            shareable=lambda result: result['forecast'] is not None,
+                            encode=encode_fetched, decode=decode_fetched)
 
-    try:
-        # Covert the "time_str" into a "datetime" object
-        # "current_time" represents the time for which the forecast is being considered
-        current_time = datetime.datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S')
-
-        # Call the "extract_ow_sunrise_sunset_location" function with the complete "forecast_ow" data
-        # The "extract_ow_sunrise_sunset_location" function returns formatted sunrise and sunset time, latitude, and longitude
-        # And because only the sunrise and sunset time are required, only unpack the tuple and ignore the latitude and longitude using "_"
-        sunrise_time, sunset_time, _, _ = extract_ow_sunrise_sunset_location(forecast_ow)
-
-        if sunrise_time and sunset_time:
-            # "datetime.datetime.strptime(sunrise_time, '%I:%M %p').time()" - Parse the formatted sunrise time string into a "date.time" object
-            sunrise = datetime.datetime.strptime(sunrise_time, '%I:%M %p').time()
-            sunset = datetime.datetime.strptime(sunset_time, '%I:%M %p').time()
-            # "datetime.datetime.combine(current_time.date(), sunrise)" - Combine the date of the current forecast ("current_time.date()") with the time of sunrise
-            # To create a full "datetime" object for the sunrise on that day
-            sunrise_datetime = datetime.datetime.combine(current_time.date(), sunrise)
-            sunset_datetime = datetime.datetime.combine(current_time.date(), sunset)
-            
-            # Compare the "current_time" with sunrise and sunset
-            # Check if the "current_time" of the forecast fall between the "sunrise_datetime" and "sunset_datetime" on the same day. If it does, it means it is daytime
-            if sunrise_datetime <= current_time <= sunset_datetime:
-                # If it is daytime, and the "icon_code" ends with "n" (which indicates night), replace the "n" with "d", effectively overriding the icon to a day icon
-                if icon_code.endswith('n'):
-                    icon_code = icon_code.replace('n', 'd')
-            else:
-                if icon_code.endswith('d'):
-                    icon_code = icon_code.replace('d', 'n')
 
-    except ValueError as e:
-        print(f'An error occured while comparing sunrise or sunset!\nDetails: {e}')
-    except Exception as e:
-        print(f'An unexpected error occured in the "override_ow_icon_code" function!\nDetails: {e}\n'
-                f'sunrise time: {sunrise_time}, sunset time: {sunset_time}, time_str: {time_str}')
+async def fetch_forecasts_async(search_text, sources=('aw', 'ow'), units='imperial'):
+    """
+    Runs the geocode + forecast chains of the given providers at the same time.
 
-    # Return the potentially overridden "icon_code"        
-    return icon_code
+    One search therefore pays the latency of the slowest chain instead of the sum of all of them.
 
+    Args:
+        search_text (str): The "City, Country Code" to search for.
+        sources (tuple): The weather providers to fetch ('aw' and/or 'ow'). Defaults to both.
+        units (str): The unit system of the forecasts. Defaults to "imperial".
 
-# Dictionary to associate weather descriptions with the corresponding image file paths - for OpenWeather
-ow_icon_map = {
-    '01d': '/assets/OpenWeatherIcons/ClearSkyDay_(01d).png',
-    '01n': '/assets/OpenWeatherIcons/ClearSkyNight_(01n).png',
-    '02d': '/assets/OpenWeatherIcons/FewCloudsDay_(02d).png',
-    '02n': '/assets/OpenWeatherIcons/FewCloudsNight_(02n).png',
-    '03d': '/assets/OpenWeatherIcons/ScatteredCloudsDay_(03d).png',
-    '03n': '/assets/OpenWeatherIcons/ScatteredCloudsNight_(03n).png',
-    '04d': '/assets/OpenWeatherIcons/BrokenCloudsDay_(04d).png',
-    '04n': '/assets/OpenWeatherIcons/BrokenCloudsNight_(04n).png',
-    '09d': '/assets/OpenWeatherIcons/ShowerRainDay_(09d).png',
-    '09n': '/assets/OpenWeatherIcons/ShowerRainNight_(09n).png',
-    '10d': '/assets/OpenWeatherIcons/RainDay_(10d).png',
-    '10n': '/assets/OpenWeatherIcons/RainNight_(10n).png',
-    '11d': '/assets/OpenWeatherIcons/ThunderstormDay_(11d).png',
-    '11n': '/assets/OpenWeatherIcons/ThunderstormNight_(11n).png',
-    '13d': '/assets/OpenWeatherIcons/SnowDay_(13d).png',
-    '13n': '/assets/OpenWeatherIcons/SnowNight_(13n).png',
-    '50d': '/assets/OpenWeatherIcons/MistDay_(50d).png',
-    '50n': '/assets/OpenWeatherIcons/MistNight_(50n).png',
-}
+    Returns:
+        dict: A dictionary mapping each provider to the result of its chain ("fetch_aw_forecast" or
+              "fetch_ow_forecast"). A chain that raised an exception maps to an empty result.
+    """
+    loop = asyncio.get_running_loop()
+    # Start every chain before awaiting any of them
+    executor = get_fetch_executor()
+    tasks = [loop.run_in_executor(executor, coalesced_fetch, source, search_text, units) for source in sources]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    fetched = {}
+    for source, result in zip(sources, results):
+        if isinstance(result, Exception):
+            print(f'The {source} fetch chain failed!\nDetails: {result}')
+            result = {'source': source, 'query': search_text, 'location': None, 'forecast': None, 'fetched_at': None}
+        fetched[source] = result
+    return fetched
+
+
+def fetch_forecasts(search_text, sources=('aw', 'ow'), units='imperial'):
+    """
+    Synchronous entry point of the fetch engine, usable outside of Dash (scripts, jobs, other web frameworks).
+
+    Must not be called from a running event loop - use "fetch_forecasts_async" there instead.
+
+    Args:
+        search_text (str): The "City, Country Code" to search for.
+        sources (tuple): The weather providers to fetch ('aw' and/or 'ow'). Defaults to both.
+        units (str): The unit system of the forecasts. Defaults to "imperial".
+
+    Returns:
+        dict: A dictionary mapping each provider to the result of its chain.
+    """
+    return asyncio.run(fetch_forecasts_async(search_text, tuple(sources), units))
 
 
-def extract_ow_icon_code(forecast, forecast_ow):
+def cached_fetch(source, search_text, units='imperial'):
     """
-    Extarcts the icon code path from a single weather forecast entry, from OpenWeather data.
+    Rebuilds the result of a provider chain from the geocoding and forecast caches alone - nothing is fetched.
 
     Args:
-        forecast (dist): A dictionary containing the weather data for a single time.
-        forecast_ow (dict): The entire forecast data from OpenWeather.
+        source (str): The weather provider ('aw' or 'ow').
+        search_text (str): The "City, Country Code" searched for.
+        units (str): The unit system of the forecast. Defaults to "imperial".
 
     Returns:
-        str: The path to the appropriate icon, or a default path if not found or an error occurs.
+        dict: The result of the chain, as "fetch_aw_forecast" or "fetch_ow_forecast" return it, or None if the
+              location or the forecast is not cached (e.g. the search failed).
     """
-    # Extract the initial icon code
-    # "forecast.get('weather', [{}])" - Get the value associated with the key 'weather'. If not found, default to a list containing an empty dictionary "[{}]"
-    # "[0]" - Extract the first element of the list (the value associated with the key 'weather' is a list)
-    # ".get('icon')" - Get the value associated with the key 'icon'. If not found, default to "None"
-    icon_code = forecast.get('weather', [{}])[0].get('icon')
+    location = geocode_cache.get((source, normalize_query(search_text)))
+    if location is CACHE_MISS or not location:
+        return None
+    if source == 'ow':
+        # JSON has no tuples - see "lookup_coordinates"
+        location = tuple(location)
 
-    # Call the "override_ow_icon_code" function to correct the potential inaccuracies in the icon codes
-    overridden_icon_code = override_ow_icon_code(forecast, icon_code, forecast_ow)
+    entry = forecast_cache.get(forecast_request(source, location, units)[0])
+    if entry is CACHE_MISS:
+        return None
+    try:
+        forecast = Forecast.from_dict(entry['forecast'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return {'source': source, 'query': search_text, 'location': location, 'forecast': forecast, 'fetched_at': entry['fetched_at']}
 
-    # Check if the "overridden_icon_code" exists as a key in the "ow_icon_map" dictionary
-    if overridden_icon_code in ow_icon_map:
-        # Map the potentially overridden icon code to a path
-        icon_path = ow_icon_map.get(overridden_icon_code, '/assets/OpenWeatherIcons/DefaultImageOW.png')
-    else:
-        # Return the default "icon_path"
-        icon_path = '/assets/OpenWeatherIcons/DefaultImageOW.png'
 
-    # Return the determined icon path        
-    return icon_path
+# What "render_forecast" can render: the whole forecast, the weather cards (and messages) alone, or the graphs alone
+RENDER_PARTS = {
+    'page': {'aw': aw_data_processing, 'ow': ow_data_processing},
+    'cards': {
+        'aw': functools.partial(aw_data_processing, include_graphs=False),
+        'ow': functools.partial(ow_data_processing, include_graphs=False),
+    },
+    'graphs': {'aw': aw_graph_processing, 'ow': ow_graph_processing},
+}
 
 
-def create_ow_weather_card(forecast, forecast_ow):
+def render_forecast(source, search_text, fetched, units='imperial', cache_rendering=True, part='page'):
     """
-    Creates a Dash html Div for a single forecast from OpenWeather.
+    Renders the fetched data of a provider into Dash components, reusing an earlier rendering of the same forecast.
+
+    Successful renderings are kept in the render cache as component JSON, keyed by the forecast's provider, location,
+    units and fetch time (and the graph mode), so every search served from the same cached forecast skips building the cards and graphs.
 
     Args:
-        forecast (dict): A dictionary containg the forecast data for a single time.
-        forecast_ow (dict): The entire forecast data from OpenWeather.
+        source (str): The weather provider ('aw' or 'ow').
+        search_text (str): The text entered in the search input box.
+        fetched (dict): The result of the provider's fetch chain.
+        units (str): The unit system of the forecast. Defaults to "imperial".
+        cache_rendering (bool): Keep a new rendering in the render cache. Defaults to True - renderings of data sent
+                                back by the browser (see "stored_forecasts") must not be, since anyone can forge it.
+        part (str): What to render - 'page' (everything), 'cards' or 'graphs' (see "RENDER_PARTS"). Defaults to 'page'.
 
     Returns:
-        html.Div: A Dash html Div component.
+        list: The Dash components (or their JSON) to display the weather data.
     """
-    # Retreive the time string from the forecast dictionary
-    time_str = forecast.get('dt_txt', 'None')
-    # Call the "format_time" function to format the time string
-    formatted_time_ow = format_time(time_str, '%B %d, %Y, %I:%M %p')
+    processing = RENDER_PARTS[part][source]
+    # Error messages mention the search text, and are cheap anyway - don't cache them
+    if fetched.get('forecast') is None:
+        return processing(search_text, fetched)
+
+    # The graph mode is part of the key, as the shared backends keep renderings across restarts
+    key = (source, json.dumps(fetched['location']), units, fetched['fetched_at'], GRAPH_MODE, part)
+    rendered = render_cache.get(key)
+    if rendered is CACHE_MISS:
+        # Store the components as plain JSON, which every cache backend can hold and Dash can send as it is
+        rendered = json.loads(pio.json.to_json_plotly(processing(search_text, fetched)))
+        if cache_rendering:
+            render_cache.set(key, rendered, forecast_ttl(source) + FORECAST_MAX_STALENESS)
+    return rendered
+
+
+def store_forecasts(search_text, fetched):
+    """
+    Packs the forecasts fetched for a search into the data of the "forecast-store" component.
 
-    # Extract the weather informations
-    description = forecast['weather'][0]['description']
-    temp = forecast['main']['temp']
-    feels_like = forecast['main']['feels_like']
-    min_temp = forecast['main']['temp_min']
-    max_temp = forecast['main']['temp_max']
-    humidity = forecast['main']['humidity']
-
-    # Extract the wind speed through the "dew_point" function
-    dew_point_value = dew_point(forecast['main'])
-    # Extract the wind speed through the "get_wind_speed" function
-    wind_speed = get_wind_speed(forecast)
-    # Extract the wind speed through the "get_visibility" function
-    visibility = get_visibility(forecast)
+    Only the successful results are kept, so that switching to a provider that failed tries it again.
 
-    # Call the "extract_ow_icon_code" function to determine the file path for the appropriate weather icon based on the forecast data
-    icon_path = extract_ow_icon_code(forecast, forecast_ow)
-                    
-    # Create and return the OpenWeather weather card as a html.Div component
-    return html.Div( # Create the single weather card
-        style={
-            'border': '1px solid #0e0e0e',
-            'borderRadius': '10px',
-            'boxShadow': '2px 2px 8px rgba(0, 0, 0, 0.1)',
-            'padding': '15px',
-            'margin': '10px',
-            'flexBasis': 'calc(33% - 20px)',
-            'boxSizing': 'border-box',
-            'display': 'inline-block',
-            'fontFamily': 'Arial, sans-serif',
-            'backgroundColor': '#f0f0f0'
-        }, # Styles the appearance of the cards
-        children=[
-            html.H4(
-                f'Time: {formatted_time_ow}',
-                style={
-                    'fontSize': '18px',
-                    'marginBotom': '10px',
-                    'color': '#2c3e50'
-                }
-            ),
-            html.Img(
-                src=icon_path,
-                style={
-                    'height': '80px',
-                    'width': '80px'
-                }
-            ),
-            html.P(f'Conditions: {description.title()}',
-                style={
-                    'fontSize': '17px',
-                    'lineHeight': '1.4',
-                    'fontFamily': 'Bahnschrift SemiBold'
-                }
-            ),
-            html.Div( # Group the temperature related data - arranging verticaly
-                style={
-                    'display': 'flex', # Using a flex box
-                    'flexDirection': 'column', # Stacking items vertically
-                    'marginBottom': '8px' # Adding some space below
-                },
-                children=[
-                    html.P(
-                        f'Temperature: {temp}°F',
-                        style={
-                            'fontSize': '22px',
-                            'fontWeight': 'bold',
-                            'fontFamily': 'Eras Bold ITC'
-                        }
-                    ),
-                    html.P(
-                        f'Feels Like: {feels_like}°F',
-                        style={
-                            'fontSize': '17px',
-                            'fontFamily': 'Berlin Sans FB'
-                        }
-                    ),
-                    html.P(
-                        f'Min Temperature: {min_temp}°F',
-                        style={
-                            'fontSize': '17px',
-                            'fontFamily': 'Berlin Sans FB'
-                        }
-                    ),
-                    html.P(
-                        f'Max Temperature: {max_temp}°F',
-                        style={
-                            'fontSize': '17px',
-                            'fontFamily': 'Berlin Sans FB'
-                        }
-                    ),
-                ]
-            ),
-            html.P(
-                f'Humidity: {humidity}%',
-                style={
-                    'fontSize': '20px',
-                    'fontFamily': 'Colonna MT'
-                }
-            ),
-            html.P(
-                f'Dew Point: {dew_point_value:.2f}°F' if dew_point_value is not None else 'Dew Point: Not Available',
-                
-                style={
-                    'fontSize': '16px',
-                    'fontFamily': 'Maiandra GD'
-                }
-            ),
-            html.Div( # Group the wind related data - arranging verically
-                style={
-                    'display': 'flex',
-                    'flexDirection': 'column',
-                    'marginBottom': '8px'
-                },
-                children=[
-                    html.P(
-                        f'Wind Speed: {wind_speed} m/s',
-                        style={
-                            'fontSize': '16px',
-                            'fontFamily': 'Eras Medium ITC'
-                        }
-                    ),
-                    html.P(
-                        f'Visibility: {visibility} metres',
-                        style={
-                        'fontSize': '18px',
-                        'fontFamily': 'High Tower Text'
-                        }
-                    ),
-                ]
-            ),
-        ]
-    )
+    Args:
+        search_text (str): The text entered in the search input box.
+        fetched (dict): A dictionary mapping each provider to the result of its chain.
+
+    Returns:
+        dict: The search ("query") and the encoded results of each provider ("fetched", see "encode_fetched").
+    """
+    return {
+        'query': normalize_query(search_text),
+        'fetched': {source: encode_fetched(result) for source, result in fetched.items() if result['forecast'] is not None},
+    }
 
 
-def extract_ow_plotting_data(forecast_list):
+def stored_forecasts(store, search_text):
     """
-    Extracts time, temperaure, humidity, and wind speed from OpenWeather forecast data for plotting.
+    Unpacks the forecasts kept in the "forecast-store" component for a search.
 
     Args:
-        forecast_list (list): A list of forecast data from OpenWeather ("forecast_ow['list']").
+        store (dict): The data of the "forecast-store" component (written by "store_forecasts"), or None.
+        search_text (str): The text entered in the search input box.
 
     Returns:
-        dict: A dictionary containing the list of times and corresponding temperatures, humidity, and wind speeds.
+        dict: A dictionary mapping each stored provider to the result of its chain - empty if the store holds
+              another search, or data this version of the application can't read.
+    """
+    if not store or store.get('query') != normalize_query(search_text):
+        return {}
+    try:
+        return {source: decode_fetched(data) for source, data in store['fetched'].items() if source in PROVIDER_CHAINS}
+    except (AttributeError, KeyError, TypeError, ValueError):
+        # Written by an older version of the application (or not by it at all) - fetch the forecasts again
+        return {}
+
+
+# CATEGORY VIII - Popular-City Warmup
+
+
+# Set to 1 to keep the forecasts of the most searched cities fresh in the background
+WARMUP_ENABLED = env_int('SKYLITE_WARMUP_ENABLED', 0) == 1
+# Seconds between two warmup cycles
+WARMUP_INTERVAL = env_float('SKYLITE_WARMUP_INTERVAL', 300.0)
+# Number of most searched queries (per provider) the warmup looks after
+WARMUP_TOP_QUERIES = env_int('SKYLITE_WARMUP_TOP_QUERIES', 200)
+# Most upstream calls per provider the warmup may make for the whole host, and the period (in seconds) they count over
+WARMUP_BUDGET = {
+    # AccuWeather's free tier allows 50 calls a day - leave most of them to the user searches
+    'aw': (env_int('SKYLITE_WARMUP_DAILY_BUDGET_AW', 20), 24 * 3600),
+    'ow': (env_int('SKYLITE_WARMUP_BUDGET_OW', 30), WARMUP_INTERVAL),
+}
+# Factor applied to every hit count after each cycle, so that yesterday's trends fade away
+WARMUP_DECAY = env_float('SKYLITE_WARMUP_DECAY', 0.98)
+# A file with one "City, Country Code" per line, searched on both providers, to warm up right after a start
+WARMUP_SEED_FILE = os.getenv('SKYLITE_WARMUP_SEED_FILE')
+
+
+class PopularQueries:
+    """
+    Counts the searches of each worker process, to rank the queries worth keeping warm.
     """
-    times = []
-    temps = []
-    humidity = []
-    wind_speed = []
-    dew_points = []
 
-    if forecast_list: # Ensure forecast_list is not empty or None
-        
-        for forecast in forecast_list:
-            time_str = forecast.get('dt_txt')
-            if time_str:
-                # Format the time for display
-                formatted_time = format_time(time_str, '%Y-%m-%d %H:%M:%S')
-                times.append(formatted_time)
-                
-                temps.append(forecast['main']['temp'])
-                humidity.append(forecast['main']['humidity'])
-                wind_speed.append(forecast['wind']['speed'])
+    def __init__(self, decay=WARMUP_DECAY):
+        """
+        Args:
+            decay (float): The factor applied to every count by "decay".
+        """
+        self.decay_factor = decay
+        # Hit counts keyed by (provider, normalized query)
+        self._counts = collections.Counter()
+        self._lock = threading.Lock()
+
+    def record(self, source, search_text, weight=1.0):
+        """
+        Counts one search.
+
+        Args:
+            source (str): The weather provider ('aw' or 'ow').
+            search_text (str): The text entered in the search input box.
+            weight (float): How much the search counts. Defaults to one.
+        """
+        query = normalize_query(search_text)
+        if not query:
+            return
+        with self._lock:
+            self._counts[(source, query)] += weight
+
+    def top(self, limit=WARMUP_TOP_QUERIES):
+        """
+        Ranks the queries of each provider by their hit count.
+
+        Args:
+            limit (int): The number of queries to return per provider.
+
+        Returns:
+            dict: A dictionary mapping each provider to its queries, most searched first.
+        """
+        with self._lock:
+            ranked = self._counts.most_common()
+        top_queries = {}
+        for (source, query), _ in ranked:
+            queries = top_queries.setdefault(source, [])
+            if len(queries) < limit:
+                queries.append(query)
+        return top_queries
+
+    def decay(self):
+        """
+        Fades every hit count, and forgets the queries that are no longer searched.
+        """
+        with self._lock:
+            for key in list(self._counts):
+                self._counts[key] *= self.decay_factor
+                if self._counts[key] < 0.01:
+                    del self._counts[key]
+
+    def load_seed_file(self, path):
+        """
+        Adds the queries of a seed file (one "City, Country Code" per line, "#" starts a comment) for both providers.
+
+        Args:
+            path (str): The path of the seed file.
+
+        Returns:
+            int: The number of queries loaded.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f_seed:
+                lines = f_seed.read().splitlines()
+        except OSError as e:
+            print(f'Could not read the warmup seed file!\nDetails: {e}')
+            return 0
+
+        loaded = 0
+        for line in lines:
+            search_text = line.split('#', 1)[0].strip()
+            if search_text:
+                for source in PROVIDER_CHAINS:
+                    self.record(source, search_text)
+                loaded += 1
+        return loaded
+
+    def snapshot(self):
+        """
+        Reports the tracked queries.
+
+        Returns:
+            dict: The number of tracked queries, and the ten most searched ones.
+        """
+        with self._lock:
+            return {
+                'tracked': len(self._counts),
+                'top': [f'{source}:{query}' for (source, query), _ in self._counts.most_common(10)],
+            }
 
-                dew_point_value = dew_point(forecast['main'])
-                dew_points.append(dew_point_value)
-                
-    return {'times': times, 'temp': temps, 'humidity': humidity, 'wind_speed': wind_speed, 'dew_points': dew_points}
 
+# The searches seen by this worker process
+popular_queries = PopularQueries()
 
-def create_ow_graph(plotting_data, data_type):
-    """
-    Creates a Dash graph component to show OpenWeather temperature data against time.
+# Upstream calls spent by the warmup, keyed by (provider, budget period number), shared by the workers of the host
+warmup_budget_cache = NamespacedCache('warmup_budget', create_cache_backend(16))
 
-    Args:
-        plotting_data (dict): A dictionary containing "times", "temps", "humidity", and "wind_speed".
-        data_type (str): The type of data to plot.
 
-    Returns:
-       dcc.Graph: A Dash graph component.
+class WarmupWorker:
     """
-    # Handle missing data
-    # "plotting_data.get(data_type)" is used to safely check for the presence of the data associated with the requested "data_type"
-    # Here, "data_type" is a variable that will hold strings like 'temp', 'humidity', and 'wind_speed'
-    if not (plotting_data and plotting_data['times'] and plotting_data['temp'] and plotting_data.get(data_type)):
-        return html.P(f'No data available for {data_type} graph.')
-
-    # Extract the y-axis data
-    # The "data_type" argument is used to access the corresponding list of values from the "plotting_data" dictionary
-    y_data = plotting_data[data_type]
-    # Select the title for the graph based on the "data_type"
-    title = {
-        'temp': 'Temperature Over Time',
-        'humidity': 'Humidity Over Time',
-        'wind_speed': 'Wind Speed Over Time',
-        'dew_points': 'Dew Point Over Time'
-    }.get(data_type, f'Over Time') # Default title for the graph
-
-    # Set the title for y-axis
-    y_title = {
-        'temp': 'Temperature (°F)',
-        'humidity': 'Humidity (%)',
-        'wind_speed': 'Wind Speed (m/s)',
-        'dew_points': ' Dew Point (°F)'
-    }.get(data_type, '') # Default title for the y-axis
-    color = {
-        'temp': '#e84118',
-        'humidity': '#00a8ff',
-        'wind_speed': '#4cd137',
-        'dew_points': '#f5cb11',
-    }.get(data_type, '#30336b') # Default colour
-
-    # Create the graph
-    fig = go.Figure(
-        # The "data" argument is a list containing the data to be plotted
-        data=[
-            go.Scatter(
-                x=plotting_data['times'], # Set the x-axis to the list of times from the input data
-                y=y_data,
-                mode='lines+markers', # The graph should display both, lines connecting the data points and markers at the data points themselves
-                line=dict(color=color, width=2),
-                marker=dict(color=color, size=6)
-            )
-        ],
-        # Design the layout
-        layout=go.Layout(
-            title=title,
-            xaxis_title='Time',
-            yaxis_title=y_title,
-            template='plotly_white',
-            xaxis=dict(showgrid=True, gridcolor='lightgray'),
-            yaxis=dict(showgrid=True, gridcolor='lightgray'),
-        ),
-    )
-    # Return the Dash graph component
-    return dcc.Graph(figure=fig)
+    A background thread that keeps the geocodes and forecasts of the most searched cities in the caches.
 
+    Every cycle, it walks the most searched queries of each provider, and refreshes the locations missing from the
+    geocode cache and the forecasts that would expire before the next cycle - without spending more upstream calls
+    than the provider's budget (counted per day for AccuWeather, per cycle for OpenWeather). Cycles of all the worker
+    processes of a host take turns under a lock file and share one budget, so adding workers doesn't multiply the
+    upstream calls.
+    """
 
-def ow_data_processing(search_text):
+    def __init__(self, queries, interval=WARMUP_INTERVAL, budget=WARMUP_BUDGET, units='imperial'):
+        """
+        Args:
+            queries (PopularQueries): The searches to rank.
+            interval (float): The number of seconds between two cycles.
+            budget (dict): The most upstream calls per provider, and the period in seconds they are counted over.
+            units (str): The unit system of the warmed forecasts. Defaults to "imperial".
+        """
+        self.queries = queries
+        self.interval = interval
+        self.budget = budget
+        self.units = units
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        # Counters for the metrics - updated by the warmup thread, read by the "/metrics" requests
+        self._counters = collections.Counter()
+        self._counters_lock = threading.Lock()
+
+    def _count(self, name, amount=1):
+        """
+        Adds to one of the metrics counters.
+
+        Args:
+            name (str): The name of the counter.
+            amount (int): The amount to add. Defaults to one.
+        """
+        with self._counters_lock:
+            self._counters[name] += amount
+
+    def ensure_started(self):
+        """
+        Starts the background thread of this process, unless it is already running.
+
+        Cheap enough to call on every request: a process forked after the start (e.g. a gunicorn worker of a
+        preloaded app) doesn't inherit the thread, so it starts its own on its first request.
+        """
+        with self._lock:
+            # A thread started before a fork doesn't exist in the child process
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='skylite-warmup', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """
+        Runs a cycle every "interval" seconds, until the process exits.
+        """
+        while True:
+            # Spread the cycles of the worker processes a little
+            time.sleep(random.uniform(0, min(5.0, self.interval)))
+            try:
+                self.run_cycle()
+            except Exception as e:
+                print(f'An unexpected error occured during the warmup!\nDetails: {e}')
+            self.queries.decay()
+            time.sleep(self.interval)
+
+    def run_cycle(self):
+        """
+        Refreshes what the most searched queries need, within what is left of each provider's budget.
+
+        Returns:
+            dict: The number of upstream calls spent per provider during this run.
+        """
+        spent_now = collections.Counter()
+        with host_lock(os.path.join(CACHE_DIR, 'warmup.lock'), self.interval) as locked:
+            if not locked and fcntl is not None:
+                # Another worker is still warming up - it will cover this cycle
+                return spent_now
+
+            for source, queries in self.queries.top().items():
+                budget, period = self.budget.get(source, (0, self.interval))
+                budget_key = (source, int(period), int(time.time() // period))
+                # Read past the worker's local copy - the other workers spend the same budget
+                spent = warmup_budget_cache.get(budget_key, bypass_local=True)
+                spent = 0 if spent is CACHE_MISS else spent
+                for query in queries:
+                    remaining = budget - spent
+                    if remaining <= 0:
+                        self._count('budget_exhausted')
+                        break
+                    cost = self.warm(source, query, remaining)
+                    spent += cost
+                    spent_now[source] += cost
+                warmup_budget_cache.set(budget_key, spent, 2 * period)
+
+        self._count('cycles')
+        for source, cost in spent_now.items():
+            self._count(f'{source}_upstream_calls', cost)
+        return spent_now
+
+    def warm(self, source, query, remaining):
+        """
+        Makes sure the geocode and the forecast of one query are cached and will stay fresh until the next cycle.
+
+        Args:
+            source (str): The weather provider ('aw' or 'ow').
+            query (str): The normalized query.
+            remaining (int): The upstream calls left in the provider's budget.
+
+        Returns:
+            int: The number of upstream calls made.
+        """
+        cost = 0
+        lookup = lookup_location_key if source == 'aw' else lookup_coordinates
+        if geocode_cache.get((source, query), bypass_local=True) is CACHE_MISS:
+            cost += 1
+        location = lookup(query)
+        if not location or cost >= remaining:
+            return cost
+
+        key, fetch = forecast_request(source, location, self.units)
+        entry = forecast_cache.get(key, bypass_local=True)
+        # Refresh the forecasts that are missing, or that would go stale before the next cycle
+        if entry is CACHE_MISS or entry['fresh_until'] - time.time() <= self.interval:
+            refresh_forecast(key, fetch)
+            cost += 1
+            self._count('forecasts_refreshed')
+        return cost
+
+    def snapshot(self):
+        """
+        Reports the warmup counters.
+
+        Returns:
+            dict: Whether the warmup runs, and its cycle, refresh and upstream call counters.
+        """
+        with self._counters_lock:
+            counters = dict(self._counters)
+        counters['running'] = self._thread is not None and self._thread.is_alive()
+        counters['queries'] = self.queries.snapshot()
+        return counters
+
+
+# The warmup of this worker process
+warmup_worker = WarmupWorker(popular_queries)
+
+register_metrics('warmup', warmup_worker.snapshot)
+
+if WARMUP_SEED_FILE:
+    print(f'Loaded {popular_queries.load_seed_file(WARMUP_SEED_FILE)} warmup queries from {WARMUP_SEED_FILE}.')
+
+
+def record_search(source, search_text):
     """
-    Fetches and processes the weather data from OpenWeather.
+    Counts a user search for the warmup.
 
     Args:
+        source (str): The weather provider ('aw' or 'ow').
         search_text (str): The text entered in the search input box.
-
-    Returns:
-        list: A list of Dash HTML components to display the OpenWeather data.
     """
-    # Fetch weather data from OpenWeather
-
-    # Call the "get_coordinates" function to get the latitude and longitude of the location as specified by the "search_text"
-    coordinates_ow = get_coordinates(search_text)
-    
-    # If "get_coordinates" function is successful it returns a tuple
-    if coordinates_ow:
-        latitude, longitude = coordinates_ow
-        # Call the "get_weather_forecast_ow" function to get the forecast data from the obtained coordinates
-        forecast_ow = get_weather_forecast_ow(latitude, longitude)
-    # # If "get_coordinates" function fails it returns "None" and sets "forecast_ow" to "None"
-    else:
-        forecast_ow = None
-
-    # Intitialize an empty list
-    # This list will store the Dash HTML components that will be created to display the weather information
-    children = []
-    
-    # Display the data obtained from OpenWeather
-    if forecast_ow and forecast_ow['list']:
-
-        # Process the forecast data for display
-        forecast_list_ow = forecast_ow['list'][:9] # Limit the number of entries to the first 27 hours (in 3 hour intervals)
+    popular_queries.record(source, search_text)
 
-        # Create an empty list to store the created weather cards
-        weather_cards_ow = []
 
-        # Iterate through the forecast entries
-        for forecast in forecast_list_ow:
-            # Call the "create_ow_weather_card" for each entry to format the data for a single forecast into a displayable card (an "html.Div" element)
-            # Append the created weather card to the "weather_cards_ow" list
-            weather_cards_ow.append(create_ow_weather_card(forecast, forecast_ow))
+if WARMUP_ENABLED:
+    # Warm the seed queries right after the start, without waiting for a search
+    warmup_worker.ensure_started()
 
-        # After the loop, create the flex container with the desired number of cards
-        # Append this container "html.Div" to the "children" list, to display the cards in the app's layout
-        children.append(
-            html.Div(
-                style={
-                    'display': 'flex',
-                    'flexWrap': 'wrap',
-                    'justifyContent': 'flex-start'
-                }, # Styles the display area - to arrange the cards horizontally and wrap them to the next line if necessary
-                # Set the "children" attribute of this container "html.Div" to the "weather_cards_ow" list
-                # Which facilitates adding all the created weather cards to the container
-                children = weather_cards_ow[:9]
-            )
-        )
-        # Create and append the temperaure graph
+    @app.server.before_request
+    def start_warmup():
+        """
+        Starts the warmup of a worker process forked after the import (e.g. by gunicorn's "--preload").
 
-        # Call the "extract_ow_plotting_data" to extract the data required for plotting
-        plotting_data_ow = extract_ow_plotting_data(forecast_list_ow)
-        # Call "create_ow_graph" to create the desired graphs
-        # Append the generated graphs to the "children" list
-        children.append(create_ow_graph(plotting_data_ow, 'temp'))
-        children.append(create_ow_graph(plotting_data_ow, 'humidity'))
-        children.append(create_ow_graph(plotting_data_ow, 'dew_points'))
-        children.append(create_ow_graph(plotting_data_ow, 'wind_speed'))
-        return children
-    
-    elif coordinates_ow is None:
-        children.append(html.P(f'Could not retrieve coordinates for {search_text} from OpenWeather.\nPlease check your input!'))
-    else:
-        children.append(html.P('Sorry, could not retrieve weather data from OpenWeather!'))
+        Only the processes serving requests run a warmup - the background search jobs never go through here.
+        """
+        warmup_worker.ensure_started()
 
 
-# CATEGORY IV - Attributions for the Used Images
+# CATEGORY IX - Attributions for the Used Images
 
 
 def load_image_attributions(source_select):
@@ -1500,8 +4170,8 @@ def load_image_attributions(source_select):
     """
     # Construct the filename
     filename = f'{source_select.lower()}_attributions.json'
-    # Construct the filepath
-    filepath = os.path.join('assets', 'Attributions', filename)
+    # Construct the filepath (in the app's assets folder, wherever the app is started from)
+    filepath = os.path.join(app.config.assets_folder, 'Attributions', filename)
     
     try:
         # Load the JSON data
@@ -1556,384 +4226,426 @@ def create_attribution_elements(attributions_list):
     return elements
 
 
-# CATEGORY V - User Interaction Callback
-        
-        
-# '@app.callback()' - This is a decorator provided by Dash
-# It links the output of a Python function ('update_search_output' - in this case) to a specific component property in the Dash app's layout
-# And it also specifies which component property's change will trigger the function
+# The attribution elements of every weather source, as component JSON
+# They are loaded once, and sent with the layout, so that the browser can open the accordion by itself
+ATTRIBUTION_ELEMENTS = {
+    source: json.loads(pio.json.to_json_plotly(
+        create_attribution_elements(load_image_attributions(source)) or [html.P('No attribution data is available')]
+    ))
+    for source in ('aw', 'ow')
+}
+app.layout['attributions-store'].data = ATTRIBUTION_ELEMENTS
+
+
+# CATEGORY X - User Interaction Callbacks
+
+
+# The interactions are split into small callbacks, each updating only what it changes:
+#   "search_forecast"       - a search (the search button) fetches and displays the forecast of the selected source
+#   "switch_source"         - a change of weather source displays the same search from the other provider
+#   "reset_attributions"    - after either of them, closes the attribution accordion and shows or hides its button
+#   "update_provider_badge" - after either of them, displays the attribution of the provider that was used
+#   "render_graphs"         - after either of them, fills in the graphs below the weather cards
+#   "toggle_attributions"   - the attribution accordion itself, toggled in the browser
+#   "count_search"          - counts the searches for the warmup
+# The first two write what they displayed to the "search-status" component, which triggers the next three
+
+
+# Set to 0 to send the graphs with the weather cards, instead of in a second response (see "render_graphs")
+PROGRESSIVE_RENDERING = env_int('SKYLITE_PROGRESSIVE_RENDERING', 1) == 1
+if PROGRESSIVE_RENDERING and CACHE_BACKEND == 'memory':
+    # "render_graphs" may be served by another worker process, whose caches don't hold the searched forecast
+    print('Warning: Progressive rendering needs a shared cache backend ("sqlite" or "redis"). Sending the graphs with the weather cards.')
+    PROGRESSIVE_RENDERING = False
+# Set to 1 to run the searches as background jobs (see "create_background_manager")
+# Off by default: every job runs in a new short-lived process, which loses what the worker keeps in its memory
+BACKGROUND_SEARCHES = env_int('SKYLITE_BACKGROUND_SEARCHES', 0) == 1
+
+
+def create_background_manager():
+    """
+    Creates the job manager that runs the searches as Dash background callbacks.
+
+    The jobs run in their own processes and keep their state and results in a disk cache in "CACHE_DIR", which every
+    worker of the host can read - no broker is needed. The browser polls for the result, so a slow provider (or a
+    retry) no longer holds a web worker for the whole search, and a running search can be cancelled.
+
+    Dash starts a new process for every job, so what a search leaves in process memory ends with the job: the
+    circuit breakers never see enough calls to trip, identical searches are only coalesced across processes, the
+    per-worker cache copies are cold, background revalidations delay the job's exit, and the worker's "/metrics"
+    don't count the searches. The shared caches (forecasts, geocodes, rendered results) still work.
+
+    Returns:
+        DiskcacheManager or None: The job manager, or None to run the searches in the requests (disabled, or missing
+                                  "dash[diskcache]", or a cache backend the job processes can't share).
+    """
+    if not BACKGROUND_SEARCHES:
+        return None
+    if CACHE_BACKEND == 'memory':
+        # What a job fetches would stay in its own process, and every search would go upstream again
+        print('Warning: Background searches need a shared cache backend ("sqlite" or "redis"). Running searches in the requests.')
+        return None
+    if diskcache is None:
+        print('Background searches are not available (pip install "dash[diskcache]"). Running searches in the requests.')
+        return None
+    try:
+        manager = DiskcacheManager(diskcache.Cache(os.path.join(CACHE_DIR, 'background-jobs')))
+    except ImportError as e:
+        # "DiskcacheManager" also needs "psutil" and "multiprocess"
+        print(f'Background searches are not available ({e}). Running searches in the requests.')
+        return None
+    print('Running searches as background jobs - the circuit breakers only work with searches run in the requests.')
+    return manager
+
+
+background_manager = create_background_manager()
+# Whether the searches run as background callbacks
+SEARCH_IN_BACKGROUND = background_manager is not None
+
+# What the page shows while a search is running: a "Fetching…" message, and the cancel button for background searches
+SEARCH_RUNNING = [(Output('search-progress', 'children'), 'Fetching…', None)]
+if SEARCH_IN_BACKGROUND:
+    SEARCH_RUNNING.append((Output('search-cancel', 'style'), {'display': 'inline-block', 'marginLeft': '10px'}, {'display': 'none', 'marginLeft': '10px'}))
+
+# How the search callbacks run - as background jobs (cancelled by the cancel button), or in the request
+SEARCH_CALLBACK_OPTIONS = {
+    'background': SEARCH_IN_BACKGROUND,
+    'manager': background_manager,
+    'running': SEARCH_RUNNING,
+    'cancel': [Input('search-cancel', 'n_clicks')] if SEARCH_IN_BACKGROUND else None,
+}
+
+
+# The AccuWeather logo, displayed at the top of the page with its forecasts
+AW_BADGE = html.Div(
+    [
+        html.A(
+            html.Img(
+                src='/assets/Image/AW_RGB_R.png',
+                alt='AccuWeather',
+                style={
+                    'height': '40px'
+                }
+            ),
+            href='https://www.accuweather.com/',
+            target='_blank'
+        )
+    ],
+    style={
+        'textAlign': 'center',
+        'marginTop': '5px',
+        'marginBottom': '5px'
+    }
+)
+
+# The OpenWeather attribution, displayed in the footer with its forecasts
+OW_BADGE = html.Div(
+    html.P(
+        [
+            'Weather data provided by ',
+            html.A(
+                'OpenWeather',
+                href='https://www.openweathermap.org',
+                target='_blank'
+            ),
+            ' (',
+            html.A(
+                'CC BY-SA 4.0',
+                href='https://creativecommons.org/licenses/by-sa/4.0/',
+                target='_blank',
+            ),
+            ')',
+        ],
+        style={
+            'fontSize': '12px',
+            'color': '#333333',
+            'textAlign': 'center',
+            'marginTop': '5px',
+            'marginBottom': '5px'
+        }
+    )
+)
+
+
+def display_search(source_select, search_value, forecast_store=None):
+    """
+    Fetches (or takes from the stored forecasts) and renders the forecast of a weather source.
+
+    Args:
+        source_select (str): The selected weather source.
+        search_value (str): The text entered in the search input box.
+        forecast_store (dict): The forecasts kept by the last search (see "store_forecasts"), if they may be used. Defaults to None.
+
+    Returns:
+        tuple: The values of the "search-output" children, the "graph-output" children, the "forecast-store" data
+               (or "dash.no_update") and the "search-status" data.
+    """
+    search_results = None
+    store_data = dash.no_update
+
+    try:
+        # When only the source changed, the forecasts fetched by the search may already be in the browser
+        fetched = stored_forecasts(forecast_store, search_value)
+        from_store = source_select in fetched
+
+        if source_select in PROVIDER_CHAINS and not from_store:
+            # Run the provider chains through the fetch engine - all of them at once in the "SKYLITE_FETCH_ALL_SOURCES" mode
+            fetched = fetch_forecasts(search_value, sources=tuple(PROVIDER_CHAINS) if FETCH_ALL_SOURCES else (source_select,))
+            if FETCH_ALL_SOURCES:
+                # Keep the forecasts in the browser, for the next change of source
+                store_data = store_forecasts(search_value, fetched)
+
+        if source_select in PROVIDER_CHAINS:
+            # Call the "render_forecast" function to format the data of the provider (or reuse its earlier rendering)
+            # With progressive rendering, only the weather cards go out now - "render_graphs" follows with the graphs
+            search_results = render_forecast(source_select, search_value, fetched[source_select], cache_rendering=not from_store,
+                                             part='cards' if PROGRESSIVE_RENDERING else 'page')
+
+    except Exception as e:
+        print(f'Encountered an error during fetching data!\nDetails: {e}')
+
+    # Tell the other callbacks which provider's forecast is displayed (none, if there is no forecast - e.g. the
+    # provider failed and an error message is displayed), for which search, and when that forecast was fetched
+    displayed = search_results and fetched[source_select]['forecast'] is not None
+    search_status = {
+        'source': source_select if displayed else None,
+        'query': search_value,
+        'fetched_at': fetched[source_select]['fetched_at'] if displayed else None,
+    }
+    # The graphs of the previous search are cleared until "render_graphs" sends the new ones
+    return search_results, None, store_data, search_status
+
+
 @app.callback(
-    # This part defines the output of the callback
-    # 'search-output' - This refers to an "id" of a Dash HTML component that exists in the app's 'app.layout' block
-    # 'children' - This specifies that the output of the 'update_search_output' function will update the "children" property of that HTML component
-    # The 'children' property typically holds the content displayed within a HTML element
-    
     [ # This part defines the OUTPUTS of the callback function
-        Output('search-output', 'children'), # 1. Updates the children of the "search_output" div
-        Output('aw-attribution', 'children'), # 2. Updates the Accuweather attribution
-        Output('ow-attribution', 'children'), # 3. Updates the Openweather attribution
-        Output('attributions-container', 'className'), # 4. Updates the CSS class of the attributions container
-        Output('attributions-content', 'children'), # 5. Updates the children (contents within the attribution section)of the attributions content
-        Output('attributions-content', 'style'), # 6. Updates the inline styles of the attributions content
-        Output('attributions-button', 'style'), # 7. Updates the inline styles of the button that toggles the visibility of the attributions
-        Output('attributions-visibility', 'data') # 8. Updates the stored visibility data 
+        Output('search-output', 'children'), # 1. The weather cards (and graphs, without progressive rendering)
+        Output('graph-output', 'children'), # 2. The graphs, cleared until "render_graphs" fills them in
+        Output('forecast-store', 'data'), # 3. The forecasts fetched by the search
+        Output('search-status', 'data'), # 4. What was displayed (for "reset_attributions", "update_provider_badge" and "render_graphs")
     ],
-    
-    # This part of the decorator defines the input that triggers the callback
-    # 'search-button-image' - This refers to the "id" of the "html.Img" component that represents the search button image
-    # 'n_clicks':
-    #   This is the property of the "html.Img" component. Every clickable Dash component has the "n_clicks" property
-    #   It starts at 'None', and then every time the component is clicked 'n_clicks' increases by one
-    # The first "Input" means: The callback function will run every time the search button image is clicked
-    # The second "Input" makes that text available to the callback function
-    # The second "Input" calls the "update_search_output" function whenever the user changes the selected source
-    
-    [ # This part defines the INPUTS of the callback function
-        Input('search-button-image', 'n_clicks'), # 1. Triggered when the search button is clicked
-        Input('source-select', 'value'), # 2. Triggered when the weather source is changed
-        Input('attributions-button', 'n_clicks') # 3. Triggered when attribution accordion (the button to show the image attributions) is clicked
+    # The callback function runs every time the search button image is clicked
+    Input('search-button-image', 'n_clicks'),
+    # "State" passes along the current value of a component without triggering the callback itself
+    [
+        State('source-select', 'value'), # 1. The selected weather source
+        State('search-input', 'value'), # 2. The current value of the search input
     ],
+    prevent_initial_call=True,
+    **SEARCH_CALLBACK_OPTIONS,
+)
+def search_forecast(n_clicks, source_select, search_value):
+    """
+    Displays the forecast of the selected weather source for the searched city.
 
-    # State is used to pass along the current value of a component to the callback function without triggering the callback itself
-    # While "Input" does trigger the callback whenever its value changes, but "State" provides the contextual information to the callback
-    # Usage of "State":
-    #   "State" is used when an information is needed from a particular component to perform a specific action
-    #    But the action should occur only when triggered by a change in an "Input" component's property and not because the "State" value changed
-    # Change to a "State" component's property will not trigger the callback, it will only provide the current value when the callback is triggered by an "Input"
-    
-    [ # This part defines the ADDITIONAL INPUTS (STATE) of the callback function
+    Args:
+        n_clicks (int): The number of times the search button has been clicked.
+        source_select (str): The currently selected weather source.
+        search_value (str): The text entered in the search input box.
+
+    Returns:
+        tuple: The weather cards, the graphs, the stored forecasts and the search status.
+    """
+    # Clear the results when the search box is empty
+    if not search_value:
+        return None, None, dash.no_update, None
+    return display_search(source_select, search_value)
+
+
+@app.callback(
+    [ # This part defines the OUTPUTS of the callback function (shared with "search_forecast", hence "allow_duplicate")
+        Output('search-output', 'children', allow_duplicate=True), # 1. The weather cards (and graphs, without progressive rendering)
+        Output('graph-output', 'children', allow_duplicate=True), # 2. The graphs, cleared until "render_graphs" fills them in
+        Output('forecast-store', 'data', allow_duplicate=True), # 3. The forecasts fetched for the new source
+        Output('search-status', 'data', allow_duplicate=True), # 4. What was displayed
+    ],
+    # The callback function runs every time the user changes the selected source
+    Input('source-select', 'value'),
+    [
         State('search-input', 'value'), # 1. The current value of the search input
-        State('attributions-visibility', 'data'), # 2. The current visisbility state of the attributions
+        State('search-button-image', 'n_clicks'), # 2. Whether a search was made yet
+        State('forecast-store', 'data'), # 3. The forecasts fetched by the last search
     ],
-        
+    prevent_initial_call=True,
+    **SEARCH_CALLBACK_OPTIONS,
 )
-def update_all_outputs(
-    n_clicks,
-    source_select,
-    attribution_clicks,
-    search_value,
-    visibility_data,
-):
+def switch_source(source_select, search_value, n_clicks, forecast_store):
     """
-    Updates the app's output components in response to user interactions such as searching, selecting a weather source, or toggling the visibility of the image
-    attributions section.
+    Displays the current search from the newly selected weather source.
 
     Args:
-        n_clicks (int): The number of times the search button has been clicked.
-        source_select (str): The currently selected weather source.
-        attribution_clicks (int): The number of times the attributions button (Sources and Attribution Details for Images - button) was clicked.
+        source_select (str): The newly selected weather source.
         search_value (str): The text entered in the search input box.
+        n_clicks (int): The number of times the search button has been clicked.
+        forecast_store (dict): The forecasts fetched by the last search (see "store_forecasts"), or None.
+
+    Returns:
+        tuple: The weather cards, the graphs, the stored forecasts and the search status.
+    """
+    # Nothing to display before the first search, or without a search value
+    if not (n_clicks and search_value):
+        return None, None, dash.no_update, None
+    # The other provider's forecast may already be stored - then the providers are not called at all
+    return display_search(source_select, search_value, forecast_store)
+
+
+@app.callback(
+    [ # The accordion is also toggled by "toggle_attributions", hence "allow_duplicate"
+        Output('attributions-container', 'className', allow_duplicate=True), # 1. The CSS class of the attributions container
+        Output('attributions-content', 'children', allow_duplicate=True), # 2. The attributions content
+        Output('attributions-content', 'style', allow_duplicate=True), # 3. Shows or hides the attributions content
+        Output('attributions-button', 'style', allow_duplicate=True), # 4. Shows or hides the attributions button
+        Output('attributions-visibility', 'data', allow_duplicate=True), # 5. The visibility state of the attributions
+    ],
+    Input('search-status', 'data'),
+    State('attributions-visibility', 'data'),
+    prevent_initial_call=True,
+)
+def reset_attributions(search_status, visibility_data):
+    """
+    Closes the attribution accordion after a search, and shows its button only when a forecast is displayed.
+
+    Args:
+        search_status (dict): What the search displayed (see "display_search"), or None if the results were cleared.
         visibility_data (dict): A dictionary storing the visibility state of the attributions section.
 
     Returns:
-        tuple: A tuple containing the updated values for the output components -
-                    search_results (list): Updated weather cards and graphs.
-                    aw_attribution (html.Div): Updated AccuWeather attribution.
-                    ow_attribution (html.Div): Updated OpenWeather attribution.
-                    container_class (str): CSS class for the attributions container.
-                    attribution_elements (list): A list of HTML elements for the attributions content.
-                    content_style (dict): Style for the attributions content (to show or hide).
-                    button_style (dict): Style for the attributions button (to show or hide).
-                    visibility_data (dict): Updated visibility state of the attributions.
-    """
-    # This Dash object provides information about - what caused the callback to run
-    ctx = dash.callback_context
-    # Extract the "id" of the component that triggered the callback
-    # "ctx.triggered" - It is a list of dictionaries, each describing an "Input" which triggered the callback and their "id" in a key "prop_id"
-    # "ctx.triggered[0]['prop_id']" - "ctx.triggered[0]": Accesses the first dictionary in the list and the "prop_id" (e.g., "search-button-image.n_clicks")
-    # ".split('.')" - Splits the "prop_id" string by "." creating a list (e.g., ['search-button-image', 'n_clicks'])
-    # "[0]" - Extracts the first element of the splitted list i.e., the component's ID
-    trigger_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
-
-    # Set a default value to the "visibility_data" if it is initially 'None'
-    visibility_data = visibility_data or {'is_visible': False}
-    # Extract the current visibility state of the attribution section
-    is_visible = visibility_data['is_visible']
-
-    # Initialize the "aw_attribution"
-    aw_attribution = None
-    # Initialize the "ow_attribution"
-    ow_attribution = None
-    # Initialize the attribution elements
-    attribution_elements = []
-
-    # Set the initial CSS class for the "html.Div" element with the ID "accordion-container"
-    # The class "accordion-container" (present in the "style.css" file) is responsible for the basic layout of the attribution section
-    container_class = 'accordion-container'
-    # Directly set the inline "style" property of the "html.Div" element with ID "accordion-container"
-    # "'display': 'none'" - Hides this "html.Div" element which contains the contents of the accordion (attributions for the images)
-    content_style = {'display': 'none'}
-    # Set the style for the "html.Button" element with the ID "accordion-button"
-    button_style = {
-        'display': 'none', # Initially hide the button
-        'cursor': 'pointer',
-        'textAlign': 'center',
-        'width': 'auto'
-    }
+        tuple: The updated values of the outputs - "dash.no_update" for the ones that are already right.
+    """
+    # Only change the properties of the button that depend on the search ("Patch" leaves the rest of its style as it is)
+    button_style = dash.Patch()
+    button_style['display'] = 'block' if search_status and search_status.get('source') else 'none'
+    button_style['width'] = '100%'
 
-    # Initialize the "search_results"
-    search_results = None
+    # The accordion is already closed - leave it as it is
+    if not (visibility_data and visibility_data.get('is_visible')):
+        return dash.no_update, dash.no_update, dash.no_update, button_style, dash.no_update
 
-    # This block handles the intial rendering of the app when no user interactions have occured
-    # When the app first loads, no component has triggered the callback, so "ctx.triggered" is empty
-    if not ctx.triggered:
-        # The "update_all_outputs" function has to update multiple components throughout the app
-        # Therefore it must return a value for every "Output" in the "@app.callback" decorator
-        return ( # Handles the initial load of the app
-            # Ensure that the search results are cleared even on the initial load or when the callback is triggered without a search
-            # This will provide a consistent behaviour for the loading animation
-            None, # Corresponds to "Output('search-output', 'children')" 
-            None, # Corresponds to "Output('aw-attribution', 'children')"
-            None, # Corresponds to "Output('ow-attribution', 'children')"
-            container_class, # ("accordion-container") Set the initial CSS class for the attribution container
-            [], # (An empty list) Set the initial content of the attribution content area to empty
-            content_style, # ({'display': 'none'}) - Hide the attribution content by default
-            button_style, # ('display': 'none') - Hide the button that toggles the attribution section
-            {'is_visible': False} # Set the initial state of attribution section's visibility to 'hidden' in the "dcc.Store" component ("attributions-visibility")
-        )
-    # Fetch and display the weather data based on user input
-    elif trigger_id == 'search-button-image' or (trigger_id == 'source-select' and search_value):
-        # Ensure:
-        # That the search button has been clicked at least once ("n_clicks > 0") and there is a value in the search box ("search_value")
-        # "n_clicks is not None" - Prevents error on initial load
-        if n_clicks is not None and n_clicks > 0 and search_value:
+    # Close the accordion (the "accordion-container" class alone doesn't show the expanded content)
+    content_style = dash.Patch()
+    content_style['display'] = 'none'
+    return 'accordion-container', [], content_style, button_style, {'is_visible': False}
 
-            try:
-                
-                if source_select == 'aw':
-                    # Call the "aw_data_processing" function to fetch and format the data from AccuWeather
-                    search_results = aw_data_processing(search_value)
-                    # Construct and display the AccuWeather logo
-                    aw_attribution = html.Div(
-                        [
-                            html.A(
-                                html.Img(
-                                    src='/assets/Image/AW_RGB_R.png',
-                                    alt='AccuWeather',
-                                    style={
-                                        'height': '40px'
-                                    }
-                                ),
-                                href='https://www.accuweather.com/',
-                                target='_blank'
-                            )
-                        ],
-                        style={
-                            'textAlign': 'center',
-                            'marginTop': '5px',
-                            'marginBottom': '5px'
-                        }
-                    )
-                    # Ensure only the correct weather source's attribution is displayed
-                    ow_attribution = None
-                    
-                elif source_select == 'ow':
-                    # Call the "ow_data_processing" function to fetch and format the data from OpenWeather
-                    search_results = ow_data_processing(search_value)
-                    # Construct and display the OpenWeather attribution
-                    ow_attribution = html.Div(
-                        html.P(
-                                [
-                                    'Weather data provided by ',
-                                    html.A(
-                                        'OpenWeather',
-                                        href='https://www.openweathermap.org',
-                                        target = '_blank'
-                                    ),
-                                    ' (',
-                                    html.A (
-                                        'CC BY-SA 4.0',
-                                        href='https://creativecommons.org/licenses/by-sa/4.0/',
-                                        target='_blank',
-                                    ),
-                                    ')',
-                                ],
-                                style={
-                                    'fontSize': '12px',
-                                    'color': '#333333',
-                                    'textAlign': 'center',
-                                    'marginTop': '5px',
-                                    'marginBottom': '5px'
-                                }
-                            )
-                    )
-                    # Ensure only the correct weather source's attribution is displayed
-                    aw_attribution = None
-
-                if search_results:
-                    # If the weather data is successfully retrieved
-                    # "container_class = ..." - Set up the CSS class for the attribution container
-                    container_class = 'accordion-container'
-                    # "content_style = ..." - Hide the attribution content initially
-                    content_style = {'display': 'none'}
-                    # "button_style = ..." - Display the button that allows the user to toggle the attribution's visibility
-                    button_style = {
-                        'display': 'block',
-                        'cursor': 'pointer',
-                        'textAlign': 'center',
-                        'width': '100%'
-                    }
-                else:
-                    # If there was an error fetching the weather data
-                    # "container_class = ..." - Set up the CSS class for the attribution container
-                    container_class = 'accordion-container'
-                    # "content_style = ..." - Hide the attribution content
-                    content_style = {'display': 'none'}
-                    # "button_style = ..." - Hide the attribution button
-                    button_style = {
-                        'display': 'none',
-                        'cursor': 'pointer',
-                        'textAlign': 'center',
-                        'width': '100%'
-                    }
-                # Return the updated data for all the "Output" components including the weather results, attributions, and styling for the attribution section
-                return ( # This "return" executes when the user performs a search and the data is successfully fetched
-                    search_results, # Updated weather information (weather cards) and graphs
-                    aw_attribution, # Updated AccuWeather attribution
-                    ow_attribution, # Updated OpenWeather attribution
-                    container_class, # Sets the CSS class for theh container of the attribution section
-                    attribution_elements, # List of the HTML elements containing the attribution information
-                    content_style, # Sets the CSS "style" for the content area of the attribution section (attributions-content)
-                    button_style, # Sets the CSS "style" for the button that toggles the visibility of the attribution content (attributions-button)
-                    {'is_visible': is_visible} # Updates the stored state of wheather the attribution section is currently visible or not
-                )
-            
-            except Exception as e:
-                print(f'Encountered an error during fetching data!\nDetails: {e}')
-                return ( # This "return" handles errors during data fetching
-                    None,
-                    None,
-                    container_class,
-                    attribution_elements,
-                    content_style,
-                    button_style,
-                    {'is_visible': is_visible}
-                )
-            
-            finally:
-                # This "return" always executes after the "try" or "except" block
-                # And ensures that the loading animation is hidden and that all output components are updated, even if there was an error
-                return (
-                    search_results,
-                    aw_attribution,
-                    ow_attribution,
-                    container_class,
-                    attribution_elements,
-                    content_style,
-                    button_style,
-                    {'is_visible': is_visible}
-                )
-        
-        # Handle the case when the search button has not been clicked or the search value is empty
-        else:
-            # "container_class = ..." - Set up the CSS class for the attribution container
-            container_class = 'accordion-container'
-            # "content_style = ..." - Hide the content area of the attribution section
-            content_style = {'display': 'none'}
-            # "button_style = ..." - Hide the attribution button
-            button_style = {
-                'display': 'none',
-                'cursor': 'pointer',
-                'textAlign': 'center',
-                'width': '100%'
-            }
-            # Return the default or empty states for the "Outputs" when the search button is triggered without a search value
-            # Or potentially on initial load after the first block ('first block' - the "if not ctx.triggered:" block)
-            return( # This "return" handles the case where the search button is clicked but the search value is empty
-                # Ensure that the search results are cleared even on the initial load or when the callback is triggered without a search
-                # This will provide a consistent behaviour for the loading animation
-                None, # Clear the 'search-output' - Output('search-output', 'children')
-                None, # Clear the AccuWeather attribution
-                # Tell Dash not to update the 'ow-attribution' component
-                # Likely because:
-                #   The attribution might have been set by a previous search
-                #   And clearing it is unnecessary if the search button has not been clicked or the search bar is empty
-                dash.no_update,
-                container_class, # Reset the CSS class of the attribution container
-                [], # Clear any content that might have been in the attribution content area
-                content_style, # Ensure that the attribution content remains hidden
-                button_style, # Ensure that the button to toggle the attribution remains hidden
-                {'is_visible': False} # Reset the visibility state of the attribution section in the "dcc.Store"
-            )
-        
-    # Check if the component that triggered the callback is "dcc.Dropdown" with the ID "source-select" - meaning the user has changed the selected weather source
-    # And also check ('and not search_value') if the "search-input" box is empty or not
-    # This whole condition checks if the user has changed the weather source in the "dcc.Dropdown", but the search input box is empty
-    elif trigger_id == 'source-select' and not search_value:
-        # Set the CSS class of the "html.Div" with the ID "attributions-container" to "accordion-container"
-        container_class = 'accordion-container'
-        content_style = {'display': 'none'} # Hide the attribution content
-        button_style = { # Hide the attribution button
-            'display': 'none',
-            'cursor': 'pointer',
-            'textAlign': 'center',
-            'width': '100%'
-        }
-        return( # This "return" handles the case where the source select dropdown is changed, but the search value is empty
-            None, # Clear the "search-output" div
-            None, # Clear the AccuWeather attribution
-            dash.no_update, # Tell Dash not to update the "ow-attribution"
-            container_class, # Update the CSS class of the attribution container
-            [], # Clear any content that might be present the attribution content area
-            content_style, # Hide the attribution content
-            button_style, # Hide the attribution button
-            {'is_visible': False} # Reset the visibility state of the attribution section to hidden
-        )
-    
-    # Check if the component that triggered the callback is the button with the ID "attributions-button"    
-    elif trigger_id == 'attributions-button':
-        # Toggle the value of the 'is_visible' variable.
-        # If the attribution section was hidden (i.e., 'is_visible' was set to False), set the 'is_visible' to True, and vice-versa 
-        is_visible = not is_visible
-
-        # Initialize attribution_elements (an empty list)
-        # This list will hold the Dash HTML components that display the attribution information
-        attribution_elements = []
-
-        # Handle the visibility of the attributions section (i.e., 'is_visible' is True)
-        if is_visible:
-            if source_select == 'aw':
-                # Call the "load_image_attributions" function to load the attribution data from a JSON file
-                attributions_data = load_image_attributions('aw')
-            elif source_select == 'ow':
-                # Call the "load_image_attributions" function to load the attribution data from a JSON file
-                attributions_data = load_image_attributions('ow')
-            # Ensure that the "attribution_data" is loaded successfully
-            if attributions_data:
-                # Call the "create_attribution_elements" function to generate a list of Dash HTML "html.P" and "html.A" components from the data
-                attribution_elements = create_attribution_elements(attributions_data)
-            else:
-                attribution_elements = [html.P('No attribution data is available')]
-                
-            # Update the CSS class of the attribution container to "accordion-container show" (the "show" class is used to expand the accordion)
-            container_class = 'accordion-container show'
-            content_style = {'display': 'block'} # Display the attribution content
-            button_style = { # Display the attribution button
-                'display': 'block',
-                'cursor': 'pointer',
-                'textAlign': 'center',
-                'width': '100%'
-            }
-            
-        # Reset the attribution section to its hidden state    
-        else:
-            container_class = 'accordion-container' # Set the CSS class of the attribution container to its default state, which is not to show the expanded content
-            content_style = {'display': 'none'} # Ensure that the attribution content area is hidden
-            button_style = { # Set the style of the button
-            'display': 'block',
-            'cursor': 'pointer',
-            'textAlign': 'center',
-            'width': '100%'
-        }
-    
-        # Return a tuple with the updated states for the "Output" components
-        return( # This "return" handles the toggling of the attribution section's visibility
-            dash.no_update, # Tell Dash to not update the search result
-            dash.no_update, # Tell Dash to not update the "aw-attribution"
-            dash.no_update, # Tell Dash to not update the "ow-attribution"
-            container_class, # Update the CSS class to show or hide the attribution content
-            attribution_elements, # List of the HTML elements containing the attribution information
-            content_style, # Style to show or hide the attribution content
-            button_style, # Style to show the attribution button
-            {'is_visible': is_visible} # Update the visibility state in the "dcc.Store" component
-        )
+
+@app.callback(
+    [
+        Output('aw-attribution', 'children'), # 1. The AccuWeather logo
+        Output('ow-attribution', 'children'), # 2. The OpenWeather attribution
+    ],
+    Input('search-status', 'data'),
+    prevent_initial_call=True,
+)
+def update_provider_badge(search_status):
+    """
+    Displays the attribution of the weather provider whose forecast is displayed, and removes the other one.
+
+    Args:
+        search_status (dict): What the search displayed (see "display_search"), or None if the results were cleared.
+
+    Returns:
+        tuple: The AccuWeather and OpenWeather attributions.
+    """
+    # The results were cleared - the OpenWeather attribution of an earlier search is left in the footer
+    if search_status is None:
+        return None, dash.no_update
+    source = search_status.get('source')
+    return (AW_BADGE if source == 'aw' else None), (OW_BADGE if source == 'ow' else None)
+
+
+@app.callback(
+    Output('graph-output', 'children', allow_duplicate=True), # The search callbacks clear the graphs, hence "allow_duplicate"
+    Input('search-status', 'data'),
+    State('forecast-store', 'data'),
+    prevent_initial_call=True,
+)
+def render_graphs(search_status, forecast_store):
+    """
+    Fills in the graphs of the displayed forecast, once its weather cards are on the page.
+
+    The search response only carries the weather cards, so they show up without waiting for the figures. The
+    forecast is taken from the stored forecasts, or from the caches the search has just filled - the providers are
+    never called from here (a search without a forecast has no graphs, see "display_search"). The graphs are only
+    drawn from the very forecast of the weather cards: if it was refreshed in between (or has left the caches), the
+    weather cards stay on their own.
+
+    Args:
+        search_status (dict): What the search displayed (see "display_search"), or None if the results were cleared.
+        forecast_store (dict): The forecasts fetched by the last search (see "store_forecasts"), or None.
+
+    Returns:
+        list: The graphs - "dash.no_update" if they were sent with the weather cards, or can't match them.
+    """
+    if not PROGRESSIVE_RENDERING:
+        return dash.no_update
+    source = search_status.get('source') if search_status else None
+    if source not in PROVIDER_CHAINS:
+        return None
+
+    search_value = search_status['query']
+    try:
+        fetched = stored_forecasts(forecast_store, search_value)
+        from_store = source in fetched
+        fetched_source = fetched[source] if from_store else cached_fetch(source, search_value)
+        # A background revalidation may have replaced the forecast since the weather cards were rendered
+        if fetched_source is None or fetched_source['fetched_at'] != search_status.get('fetched_at'):
+            return dash.no_update
+        return render_forecast(source, search_value, fetched_source, cache_rendering=not from_store, part='graphs')
+    except Exception as e:
+        print(f'Encountered an error during rendering the graphs!\nDetails: {e}')
+        return None
+
+
+@app.callback(
+    Input('search-button-image', 'n_clicks'),
+    Input('source-select', 'value'),
+    State('search-input', 'value'),
+    prevent_initial_call=True,
+)
+def count_search(n_clicks, source_select, search_value):
+    """
+    Counts the searches, so that popular cities can be kept warm.
+
+    This runs in the web worker, whose warmup uses the counts, even when the search itself runs as a background job.
+
+    Args:
+        n_clicks (int): The number of times the search button has been clicked.
+        source_select (str): The selected weather source.
+        search_value (str): The text entered in the search input box.
+    """
+    if n_clicks and search_value and source_select in PROVIDER_CHAINS:
+        record_search(source_select, search_value)
+
+
+# The attribution accordion is toggled by "toggle_attributions" in "assets/js/clientside.js", without calling the server
+# It reads the attributions preloaded in the "attributions-store" component
+# Searches also reset these outputs (see "reset_attributions"), hence "allow_duplicate"
+app.clientside_callback(
+    ClientsideFunction(namespace='skylite', function_name='toggle_attributions'),
+    [
+        Output('attributions-container', 'className', allow_duplicate=True), # 1. Shows or hides the attributions container
+        Output('attributions-content', 'children', allow_duplicate=True), # 2. The attributions of the selected weather source
+        Output('attributions-content', 'style', allow_duplicate=True), # 3. Shows or hides the attribution content
+        Output('attributions-button', 'style', allow_duplicate=True), # 4. Keeps the attribution button displayed
+        Output('attributions-visibility', 'data', allow_duplicate=True), # 5. The new visibility state
+    ],
+    Input('attributions-button', 'n_clicks'),
+    [
+        State('source-select', 'value'),
+        State('attributions-store', 'data'),
+        State('attributions-visibility', 'data'),
+    ],
+    prevent_initial_call=True,
+)
+
+
+# CATEGORY XI - Metrics
+
+
+@server.route('/metrics')
+def metrics():
+    """
+    Reports the runtime metrics of every subsystem (e.g. the circuit breaker states) as JSON.
+
+    Returns:
+        flask.Response: The metrics of this worker process.
+    """
+    return flask.jsonify(collect_metrics())
@@ -0,0 +1,25 @@
+// Callbacks that run in the browser (see the "ClientsideFunction" callbacks in SkyLite.py)
+// Dash loads every script in the "assets" folder, and looks these functions up by namespace and name
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+	skylite: {
+		// Shows or hides the image attributions of the selected weather source
+		// The attributions of every source are already in the "attributions-store" component, so no request is made
+		toggle_attributions: function (nClicks, source, attributions, visibility) {
+			// Toggle the stored visibility state
+			const isVisible = !(visibility && visibility.is_visible);
+			// The button stays displayed either way
+			const buttonStyle = {
+				display: 'block',
+				cursor: 'pointer',
+				textAlign: 'center',
+				width: '100%'
+			};
+			if (!isVisible) {
+				return ['accordion-container', [], {display: 'none'}, buttonStyle, {is_visible: false}];
+			}
+			const elements = (attributions && attributions[source]) || [];
+			return ['accordion-container show', elements, {display: 'block'}, buttonStyle, {is_visible: true}];
+		}
+	}
+});
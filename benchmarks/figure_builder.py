@@ -0,0 +1,151 @@
+"""
+Compares SkyLite's graph figures, built from "scatter_skeleton", to the "go.Figure" ones they replaced.
+
+It checks that both describe the same graph (times, values, titles, colours and template), then reports the size
+of the JSON sent to the browser and the time taken to build each figure.
+
+Run it from the repository root:
+
+    python benchmarks/figure_builder.py
+"""
+import base64
+import os
+import sys
+import time
+
+# SkyLite reads its configuration on import - keep this run off the network and off the shared caches
+os.environ.setdefault('ACCUWEATHER_API_KEY', 'benchmark')
+os.environ.setdefault('OPENWEATHER_API_KEY', 'benchmark')
+os.environ.setdefault('SKYLITE_CACHE_BACKEND', 'memory')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import SkyLite
+
+
+ROUNDS = 200
+
+
+def legacy_figure(times, values, title, y_title, line_color, marker_color, x_title='Time'):
+    """
+    Builds the figure the way "create_ow_graph" did before: validated graph objects fed with lists.
+
+    Args:
+        times (numpy.ndarray): The times ("datetime64" values).
+        values (numpy.ndarray): The values to plot, NaN where they are missing.
+        title (str): The title of the graph.
+        y_title (str): The title of the y-axis.
+        line_color (str): The colour of the line.
+        marker_color (str): The colour of the markers.
+        x_title (str): The title of the x-axis.
+
+    Returns:
+        plotly.graph_objects.Figure: The figure.
+    """
+    return go.Figure(
+        data=[
+            go.Scatter(
+                x=times.tolist(),
+                y=SkyLite.to_optional_list(values),
+                mode='lines+markers',
+                line=dict(color=line_color, width=2),
+                marker=dict(color=marker_color, size=6)
+            )
+        ],
+        layout=go.Layout(
+            title=title,
+            xaxis_title=x_title,
+            yaxis_title=y_title,
+            template='plotly_white',
+            xaxis=dict(showgrid=True, gridcolor='lightgray'),
+            yaxis=dict(showgrid=True, gridcolor='lightgray'),
+        ),
+    )
+
+
+def decode_typed_array(spec):
+    """
+    Decodes a typed array written by "SkyLite.typed_array".
+
+    Args:
+        spec (dict): The typed array specification ('dtype' and 'bdata').
+
+    Returns:
+        numpy.ndarray: The numbers.
+    """
+    return np.frombuffer(base64.b64decode(spec['bdata']), dtype='<' + spec['dtype'])
+
+
+def check_equivalent(legacy, built):
+    """
+    Asserts that the new figure draws the same graph as the legacy one.
+
+    Args:
+        legacy (dict): The legacy figure, as JSON-ready dictionary.
+        built (dict): The figure made from "scatter_skeleton".
+    """
+    old_trace, new_trace = legacy['data'][0], built['data'][0]
+    # The same points - the times as milliseconds, the values with their gaps
+    old_times = np.array(old_trace['x'], dtype='datetime64[ms]').astype('int64')
+    np.testing.assert_array_equal(decode_typed_array(new_trace['x']).astype('int64'), old_times)
+    old_values = np.array([np.nan if value is None else value for value in old_trace['y']], dtype=float)
+    np.testing.assert_allclose(decode_typed_array(new_trace['y']), old_values, rtol=0, atol=1e-9, equal_nan=True)
+    # The same styling
+    for key in ('mode', 'line', 'marker'):
+        assert old_trace[key] == new_trace[key], key
+    old_layout, new_layout = legacy['layout'], built['layout']
+    assert old_layout['title'] == new_layout['title']
+    assert old_layout['template'] == new_layout['template']
+    for axis in ('xaxis', 'yaxis'):
+        for key in ('title', 'showgrid', 'gridcolor'):
+            assert old_layout[axis][key] == new_layout[axis][key], (axis, key)
+
+
+def best_time(fn, rounds=ROUNDS):
+    """
+    Times a function, keeping the best of several rounds.
+
+    Args:
+        fn (callable): The function to time.
+        rounds (int): The number of rounds.
+
+    Returns:
+        float: The fastest round, in seconds.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    # An OpenWeather-sized series (nine three-hour steps) and a five-day one, both with a gap
+    start = np.datetime64('2025-10-09T06:00:00', 's')
+    for points in (9, 40):
+        times = start + np.arange(points) * np.timedelta64(3, 'h')
+        values = 60 + 5 * np.sin(np.arange(points) / 3)
+        values[points // 2] = np.nan
+        args = (times, values, 'Temperature Over Time', 'Temperature (°F)', '#e84118', '#e84118')
+
+        skeleton = SkyLite.scatter_skeleton(*args[2:])
+        legacy = legacy_figure(*args)
+        built = skeleton.figure(times, [values])
+        check_equivalent(legacy.to_plotly_json(), built)
+
+        legacy_bytes = len(pio.to_json(legacy, validate=False, engine='json'))
+        built_bytes = len(pio.json.to_json_plotly(built, engine='json'))
+        legacy_time = best_time(lambda: legacy_figure(*args))
+        built_time = best_time(lambda: skeleton.figure(times, [values]))
+
+        print(f'{points} points: figures match')
+        print(f'  payload  go.Figure {legacy_bytes:>7,} B   skeleton {built_bytes:>7,} B')
+        print(f'  build    go.Figure {legacy_time * 1000:>7.3f} ms  skeleton {built_time * 1000:>7.3f} ms  ({legacy_time / built_time:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
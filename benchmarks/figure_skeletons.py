@@ -0,0 +1,79 @@
+"""
+Measures what SkyLite's prebuilt figure skeletons save on each graph.
+
+For each graph type it times making a figure from the skeleton built at import (attaching the data arrays only)
+against building the skeleton for every figure, as was done before.
+
+Run it from the repository root:
+
+    python benchmarks/figure_skeletons.py
+"""
+import os
+import sys
+import time
+
+# SkyLite reads its configuration on import - keep this run off the network and off the shared caches
+os.environ.setdefault('ACCUWEATHER_API_KEY', 'benchmark')
+os.environ.setdefault('OPENWEATHER_API_KEY', 'benchmark')
+os.environ.setdefault('SKYLITE_CACHE_BACKEND', 'memory')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import SkyLite
+
+
+ROUNDS = 2000
+
+
+def best_time(fn, rounds=ROUNDS):
+    """
+    Times a function, keeping the best of several rounds.
+
+    Args:
+        fn (callable): The function to time.
+        rounds (int): The number of rounds.
+
+    Returns:
+        float: The fastest round, in seconds.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    steps = np.arange(9)
+    times = np.datetime64('2025-10-09T06:00:00', 's') + steps * np.timedelta64(3, 'h')
+    values = 60 + 5 * np.sin(steps / 3)
+    panels = list(SkyLite.OW_GRAPH_SERIES.values())
+
+    # Each graph type: the prebuilt skeleton, how it was built, and the series it plots
+    graphs = {
+        'OpenWeather graph': (
+            SkyLite.OW_GRAPH_SKELETONS['temp'],
+            lambda: SkyLite.scatter_skeleton(*SkyLite.OW_GRAPH_SERIES['temp'][:2], '#e84118', '#e84118'),
+            [values],
+        ),
+        'AccuWeather graph': (
+            SkyLite.AW_TEMPERATURE_SKELETON,
+            lambda: SkyLite.scatter_skeleton('Temperature Over Time', 'Temperature (°F)', '#2e38f3', '#fc0349'),
+            [values],
+        ),
+        'Combined graph': (
+            SkyLite.OW_PANELS_SKELETON,
+            lambda: SkyLite.panels_skeleton(panels),
+            [values] * len(panels),
+        ),
+    }
+    for name, (skeleton, build_skeleton, series) in graphs.items():
+        rebuilt = best_time(lambda: build_skeleton().figure(times, series))
+        prebuilt = best_time(lambda: skeleton.figure(times, series))
+        print(f'{name:<18} rebuilt {rebuilt * 1e6:>6.1f} us  prebuilt {prebuilt * 1e6:>6.1f} us  (saves {(rebuilt - prebuilt) * 1e6:.1f} us per figure)')
+
+
+if __name__ == '__main__':
+    main()
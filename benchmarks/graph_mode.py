@@ -0,0 +1,79 @@
+"""
+Compares SkyLite's two ways of displaying the OpenWeather graphs ("SKYLITE_GRAPH_MODE").
+
+For one displayed forecast it reports, in each mode, the number of figures the browser has to draw, the size of
+their JSON in the callback response, and the time taken to build them.
+
+Run it from the repository root:
+
+    python benchmarks/graph_mode.py
+"""
+import os
+import sys
+import time
+
+# SkyLite reads its configuration on import - keep this run off the network and off the shared caches
+os.environ.setdefault('ACCUWEATHER_API_KEY', 'benchmark')
+os.environ.setdefault('OPENWEATHER_API_KEY', 'benchmark')
+os.environ.setdefault('SKYLITE_CACHE_BACKEND', 'memory')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import plotly.io as pio
+
+import SkyLite
+
+
+ROUNDS = 200
+
+
+def plotting_data(points=9):
+    """
+    Creates OpenWeather plotting data like "extract_ow_plotting_data" returns.
+
+    Args:
+        points (int): The number of 3-hour entries.
+
+    Returns:
+        dict: The times and the series of every graph.
+    """
+    steps = np.arange(points)
+    return {
+        'times': np.datetime64('2025-10-09T06:00:00', 's') + steps * np.timedelta64(3, 'h'),
+        'temp': 60 + 5 * np.sin(steps / 3),
+        'humidity': 70 - 10 * np.cos(steps / 3),
+        'dew_points': 50 + 2 * np.sin(steps / 3),
+        'wind_speed': 4 + np.cos(steps / 2),
+    }
+
+
+def build(mode, data):
+    """
+    Builds the graphs the way "ow_data_processing" does in one graph mode.
+
+    Args:
+        mode (str): The graph mode ('separate' or 'combined').
+        data (dict): The plotting data.
+
+    Returns:
+        list: The Dash graph components.
+    """
+    SkyLite.GRAPH_MODE = mode
+    return SkyLite.create_ow_graphs(data)
+
+
+def main():
+    data = plotting_data()
+    for mode in ('separate', 'combined'):
+        graphs = build(mode, data)
+        payload = len(pio.json.to_json_plotly(graphs))
+        best = float('inf')
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            build(mode, data)
+            best = min(best, time.perf_counter() - start)
+        print(f'{mode:<9} {len(graphs)} figure(s)  {payload:>7,} B  {best * 1000:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+"""
+Shared setup of SkyLite's tests.
+
+SkyLite reads its configuration on import, so the environment is set before any test module imports it: dummy API
+keys, per-process caches in a temporary directory, and no warmup or background searches - nothing leaves the process.
+"""
+import os
+import sys
+import tempfile
+
+os.environ['ACCUWEATHER_API_KEY'] = 'test'
+os.environ['OPENWEATHER_API_KEY'] = 'test'
+os.environ['SKYLITE_CACHE_BACKEND'] = 'memory'
+os.environ['SKYLITE_CACHE_DIR'] = tempfile.mkdtemp(prefix='skylite-tests-')
+os.environ['SKYLITE_WARMUP_ENABLED'] = '0'
+os.environ['SKYLITE_BACKGROUND_SEARCHES'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
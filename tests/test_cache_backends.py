@@ -0,0 +1,91 @@
+"""
+Tests of the cache backends: expiry, and the worker's local copies in front of a shared backend.
+"""
+import time
+
+import pytest
+
+import SkyLite
+
+
+class UnknownExpiryBackend(SkyLite.CacheBackend):
+    """
+    A shared backend that can't tell when its entries expire (the default of "get_with_expiry").
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key, SkyLite.CACHE_MISS)
+
+    def set(self, key, value, ttl):
+        self.entries[key] = value
+
+    def delete(self, key):
+        self.entries.pop(key, None)
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def shared_backend(request, tmp_path):
+    """
+    A shared backend of each kind that keeps its entries' expiry.
+    """
+    if request.param == 'sqlite':
+        return SkyLite.SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'))
+    return SkyLite.MemoryCacheBackend()
+
+
+def local_expiry(tiered, key):
+    """
+    Returns the number of seconds the tiered backend's local copy of a key has left.
+    """
+    return tiered.local.get_with_expiry(key)[1] - time.time()
+
+
+def test_incomplete_backend_cannot_be_created():
+    class Incomplete(SkyLite.CacheBackend):
+        def get(self, key):
+            return SkyLite.CACHE_MISS
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_entries_expire(shared_backend):
+    shared_backend.set('key', {'value': 1}, 0.05)
+    assert shared_backend.get('key') == {'value': 1}
+    time.sleep(0.1)
+    assert shared_backend.get('key') is SkyLite.CACHE_MISS
+
+
+def test_local_copy_never_outlives_the_shared_entry(shared_backend):
+    tiered = SkyLite.TieredCacheBackend(shared_backend, local_ttl=30)
+    shared_backend.set('key', 'value', 0.2)
+    assert tiered.get('key') == 'value'
+    assert local_expiry(tiered, 'key') <= 0.2
+    time.sleep(0.25)
+    assert tiered.get('key') is SkyLite.CACHE_MISS
+
+
+def test_local_copy_is_capped_by_the_local_ttl(shared_backend):
+    tiered = SkyLite.TieredCacheBackend(shared_backend, local_ttl=5)
+    shared_backend.set('key', 'value', 3600)
+    assert tiered.get('key') == 'value'
+    assert 4 < local_expiry(tiered, 'key') <= 5
+
+
+def test_local_copy_uses_the_local_ttl_when_the_expiry_is_unknown():
+    tiered = SkyLite.TieredCacheBackend(UnknownExpiryBackend(), local_ttl=5)
+    tiered.shared.set('key', 'value', 3600)
+    assert tiered.get('key') == 'value'
+    assert 4 < local_expiry(tiered, 'key') <= 5
+
+
+def test_writes_go_to_both_tiers(shared_backend):
+    tiered = SkyLite.TieredCacheBackend(shared_backend, local_ttl=30)
+    tiered.set('key', 'value', 0.2)
+    assert shared_backend.get('key') == 'value'
+    assert local_expiry(tiered, 'key') <= 0.2
+    tiered.delete('key')
+    assert tiered.get('key') is SkyLite.CACHE_MISS
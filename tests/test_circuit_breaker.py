@@ -0,0 +1,87 @@
+"""
+Tests of "CircuitBreaker": tripping on failed or slow calls, and probing while half-open.
+"""
+import time
+
+import SkyLite
+
+
+OPEN_SECONDS = 0.05
+
+
+def tripped_breaker(**options):
+    """
+    Creates a breaker and trips it with failed calls.
+
+    Returns:
+        CircuitBreaker: The open breaker.
+    """
+    breaker = SkyLite.CircuitBreaker('test.endpoint', min_calls=4, open_seconds=OPEN_SECONDS, half_open_probes=2, **options)
+    for _ in range(4):
+        assert breaker.allow()
+        breaker.record(True, 0.1)
+    return breaker
+
+
+def test_stays_closed_below_the_minimum_number_of_calls():
+    breaker = SkyLite.CircuitBreaker('test.endpoint', min_calls=4)
+    for _ in range(3):
+        breaker.record(True, 0.1)
+    assert breaker.allow()
+    assert breaker.snapshot()['state'] == SkyLite.CircuitBreaker.CLOSED
+
+
+def test_stays_closed_below_the_error_rate():
+    breaker = SkyLite.CircuitBreaker('test.endpoint', min_calls=4, error_rate=0.5)
+    for failed in (False, False, False, True):
+        breaker.record(failed, 0.1)
+    assert breaker.snapshot()['state'] == SkyLite.CircuitBreaker.CLOSED
+
+
+def test_trips_on_failures_and_rejects_calls():
+    breaker = tripped_breaker()
+    assert not breaker.allow()
+    snapshot = breaker.snapshot()
+    assert snapshot['state'] == SkyLite.CircuitBreaker.OPEN
+    assert snapshot['trips'] == 1
+    assert snapshot['rejected'] == 1
+
+
+def test_trips_on_slow_calls():
+    breaker = SkyLite.CircuitBreaker('test.endpoint', min_calls=4, slow_call_seconds=1.0, slow_call_rate=0.75)
+    for latency in (2.0, 2.0, 2.0, 0.1):
+        breaker.record(False, latency)
+    assert not breaker.allow()
+
+
+def test_half_open_lets_a_limited_number_of_probes_through():
+    breaker = tripped_breaker()
+    time.sleep(OPEN_SECONDS * 1.5)
+    assert breaker.allow()
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert breaker.snapshot()['state'] == SkyLite.CircuitBreaker.HALF_OPEN
+
+
+def test_closes_when_every_probe_succeeds():
+    breaker = tripped_breaker()
+    time.sleep(OPEN_SECONDS * 1.5)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record(False, 0.1)
+    snapshot = breaker.snapshot()
+    assert snapshot['state'] == SkyLite.CircuitBreaker.CLOSED
+    # The window starts over
+    assert snapshot['calls'] == 0
+    assert breaker.allow()
+
+
+def test_reopens_when_a_probe_fails():
+    breaker = tripped_breaker()
+    time.sleep(OPEN_SECONDS * 1.5)
+    assert breaker.allow()
+    breaker.record(True, 0.1)
+    snapshot = breaker.snapshot()
+    assert snapshot['state'] == SkyLite.CircuitBreaker.OPEN
+    assert snapshot['trips'] == 2
+    assert not breaker.allow()
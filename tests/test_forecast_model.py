@@ -0,0 +1,79 @@
+"""
+Tests of the normalized "Forecast" model: its dictionary form, used by the caches and the forecast store.
+"""
+import json
+
+import numpy as np
+import pytest
+
+import SkyLite
+
+
+def sample_forecast():
+    """
+    Creates a forecast with every kind of column, including missing values.
+
+    Returns:
+        Forecast: The forecast.
+    """
+    meta = SkyLite.ForecastMeta('ow', 'metric', temperature_unit='C', latitude=51.5073, longitude=-0.1277,
+                                utc_offset=3600, sunrise=1760000000, sunset=1760040000, city_name='London')
+    return SkyLite.Forecast(
+        meta,
+        time=[1760000000, 1760010800, 1760021600],
+        utc_offset=[3600, 3600, 3600],
+        temp=[12.5, None, 14.25],
+        feels_like=[11.0, 12.0, 13.0],
+        humidity=[80, 75, None],
+        dew_point=[9.1, float('nan'), 7.3],
+        has_precipitation=[True, False, None],
+        is_daylight=[False, True, True],
+        icon=['01n', '02d', None],
+        description=['clear sky', 'few clouds', 'broken clouds'],
+    )
+
+
+def assert_same_forecast(actual, expected):
+    """
+    Asserts that two forecasts hold the same metadata and columns (NaN equal to NaN).
+    """
+    assert actual.meta.to_dict() == expected.meta.to_dict()
+    for name, dtype in SkyLite.Forecast.COLUMNS.items():
+        actual_values, expected_values = getattr(actual, name), getattr(expected, name)
+        assert actual_values.dtype.kind == expected_values.dtype.kind, name
+        if dtype == 'float64':
+            np.testing.assert_array_equal(actual_values, expected_values, err_msg=name)
+        else:
+            assert actual_values.tolist() == expected_values.tolist(), name
+
+
+def test_round_trip_through_json():
+    forecast = sample_forecast()
+    data = json.loads(json.dumps(forecast.to_dict()))
+    assert_same_forecast(SkyLite.Forecast.from_dict(data), forecast)
+
+
+def test_missing_numbers_become_none():
+    data = sample_forecast().to_dict()
+    assert data['columns']['temp'] == [12.5, None, 14.25]
+    assert data['columns']['dew_point'][1] is None
+
+
+def test_round_trip_keeps_the_entry_digests():
+    forecast = sample_forecast()
+    restored = SkyLite.Forecast.from_dict(json.loads(json.dumps(forecast.to_dict())))
+    assert [restored.entry_digest(i) for i in range(len(restored))] == [forecast.entry_digest(i) for i in range(len(forecast))]
+
+
+def test_round_trip_of_an_empty_forecast():
+    forecast = SkyLite.Forecast(SkyLite.ForecastMeta('aw'), time=[])
+    restored = SkyLite.Forecast.from_dict(forecast.to_dict())
+    assert len(restored) == 0
+    assert_same_forecast(restored, forecast)
+
+
+def test_other_model_versions_are_rejected():
+    data = sample_forecast().to_dict()
+    data['version'] = SkyLite.FORECAST_MODEL_VERSION + 1
+    with pytest.raises(ValueError):
+        SkyLite.Forecast.from_dict(data)
@@ -0,0 +1,120 @@
+"""
+Tests of "provider_request": retries, "Retry-After" handling, the deadline and the number of attempts.
+"""
+import pytest
+import requests
+
+import SkyLite
+
+
+class FakeResponse:
+    """
+    A response with a status code and headers, raising like "requests.Response.raise_for_status" does.
+    """
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f'{self.status_code} error', response=self)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """
+    Replaces the HTTP client with a script of responses, and records the requests and the waits.
+
+    Returns:
+        dict: The 'responses' to send in order (an exception is raised instead of returned), the 'calls' made and
+              the 'sleeps' taken.
+    """
+    script = {'responses': [], 'calls': [], 'sleeps': []}
+
+    def get(provider, url, params=None, timeout=None):
+        script['calls'].append(timeout)
+        response = script['responses'].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(SkyLite.http_client, 'get', get)
+    monkeypatch.setattr(SkyLite.time, 'sleep', script['sleeps'].append)
+    # Every test gets fresh circuit breakers, which never trip on these few calls
+    monkeypatch.setattr(SkyLite, 'get_circuit_breaker', lambda provider, endpoint: SkyLite.CircuitBreaker(f'{provider}.{endpoint}', min_calls=100))
+    return script
+
+
+def test_returns_the_first_successful_response(upstream):
+    ok = FakeResponse(200)
+    upstream['responses'] = [ok]
+    assert SkyLite.provider_request('ow', 'test', 'https://example.com') is ok
+    assert len(upstream['calls']) == 1
+
+
+def test_retries_timeouts_until_success(upstream):
+    ok = FakeResponse(200)
+    upstream['responses'] = [requests.exceptions.Timeout('slow'), requests.exceptions.ConnectionError('down'), ok]
+    assert SkyLite.provider_request('ow', 'test', 'https://example.com', retry_delay=0.01) is ok
+    assert len(upstream['calls']) == 3
+    assert len(upstream['sleeps']) == 2
+
+
+def test_waits_as_long_as_retry_after_asks(upstream):
+    ok = FakeResponse(200)
+    upstream['responses'] = [FakeResponse(503, {'Retry-After': '1.5'}), ok]
+    assert SkyLite.provider_request('ow', 'test', 'https://example.com', deadline=10) is ok
+    assert upstream['sleeps'] == [1.5]
+
+
+def test_gives_up_when_retry_after_exceeds_the_deadline(upstream):
+    upstream['responses'] = [FakeResponse(429, {'Retry-After': '30'}), FakeResponse(200)]
+    with pytest.raises(requests.exceptions.HTTPError):
+        SkyLite.provider_request('ow', 'test', 'https://example.com', deadline=5)
+    # No wait past the deadline, and no second attempt
+    assert upstream['sleeps'] == []
+    assert len(upstream['calls']) == 1
+
+
+def test_attempt_timeouts_are_capped_by_the_deadline(upstream):
+    upstream['responses'] = [FakeResponse(200)]
+    SkyLite.provider_request('ow', 'test', 'https://example.com', deadline=0.5)
+    assert upstream['calls'][0] <= 0.5
+
+
+def test_expired_deadline_sends_nothing(upstream):
+    with pytest.raises(requests.exceptions.Timeout):
+        SkyLite.provider_request('ow', 'test', 'https://example.com', deadline=0)
+    assert upstream['calls'] == []
+
+
+def test_does_not_retry_client_errors(upstream):
+    upstream['responses'] = [FakeResponse(404), FakeResponse(200)]
+    with pytest.raises(requests.exceptions.HTTPError):
+        SkyLite.provider_request('ow', 'test', 'https://example.com')
+    assert len(upstream['calls']) == 1
+
+
+def test_raises_the_last_error_once_the_retries_run_out(upstream):
+    upstream['responses'] = [FakeResponse(503)] * 3
+    with pytest.raises(requests.exceptions.HTTPError):
+        SkyLite.provider_request('ow', 'test', 'https://example.com', max_retries=3, retry_delay=0.01)
+    assert len(upstream['calls']) == 3
+
+
+@pytest.mark.parametrize('max_retries', [0, -1])
+def test_always_makes_at_least_one_attempt(upstream, max_retries):
+    upstream['responses'] = [FakeResponse(503)]
+    with pytest.raises(requests.exceptions.HTTPError):
+        SkyLite.provider_request('ow', 'test', 'https://example.com', max_retries=max_retries)
+    assert len(upstream['calls']) == 1
+
+
+def test_open_circuit_breaker_sends_nothing(upstream, monkeypatch):
+    breaker = SkyLite.CircuitBreaker('ow.test', min_calls=1, open_seconds=60)
+    breaker.record(True, 0.1)
+    monkeypatch.setattr(SkyLite, 'get_circuit_breaker', lambda provider, endpoint: breaker)
+    with pytest.raises(SkyLite.CircuitOpenError):
+        SkyLite.provider_request('ow', 'test', 'https://example.com')
+    assert upstream['calls'] == []